@@ -1,11 +1,18 @@
 
+from operator import itemgetter
+
 import numpy as np
 
 import month
 import enum
+import payment_schedule
 
 CompoundType = enum.Enum(["MONTHLY", "DAILY"])
 
+# Balances this close to zero are treated as paid off, so floating point noise
+# doesn't produce an extra payment against a fraction of a cent.
+PAYOFF_TOLERANCE = 1e-6
+
 class Payment(object):
     def __init__(self, loan, payment_month, payment_amount):
         super().__init__()
@@ -15,7 +22,9 @@ class Payment(object):
 
         self.interest_amount = loan.compounder.interest_amount(self.month)
         self.principle_amount = max(self.payment_amount - self.interest_amount, 0)
-        self.new_balance = max(self.previous_balance - self.principle_amount, 0)
+        self.new_balance = self.previous_balance - self.principle_amount
+        if self.new_balance <= PAYOFF_TOLERANCE:
+            self.new_balance = 0
 
     def __str__(self):
         return self.__repr__()
@@ -30,13 +39,27 @@ class Payment(object):
         )
 
 class Compunder(object):
+    # whether balance_after() and payoff_payment_count() are available
+    has_closed_form = False
+
     def __init__(self, amortized_loan):
         super().__init__()
         self.loan = amortized_loan
-    def minimum_payment(self):
+    def minimum_payment(self, apr=None, balance=None, term_in_months=None):
+        """ Payment that pays off `balance` (default: the purchase amount) in
+        `term_in_months` (default: the full term) at `apr` (default: the loan's apr)
+        """
         pass
     def interest_amount(self, payment_date):
         pass
+    def interest_rates(self, first_payment_month, payment_count, last_payment_month=None):
+        """ Returns an array of the rates applied to the remaining balance for
+        `payment_count` consecutive monthly payments starting at `first_payment_month`.
+        `interest_rates(...)[k] * balance` is what `interest_amount` would return for
+        the k-th of those payments. The aprs come from the loan's `apr_path`; for a
+        batch of loans the result has one row per loan.
+        """
+        pass
 
 class MonthlyCompounder(Compunder):
     def __init__(self, amortized_loan):
@@ -51,15 +74,43 @@ class MonthlyCompounder(Compunder):
         return self.loan.term_in_years * 12
 
     
-    def minimum_payment(self):
-        return -np.pmt(self.monthly_rate, self.term_in_months, self.loan.purchase_amount)
+    def minimum_payment(self, apr=None, balance=None, term_in_months=None):
+        monthly_rate = self.monthly_rate if apr is None else apr / 12
+        term_in_months = self.term_in_months if term_in_months is None else term_in_months
+        balance = self.loan.purchase_amount if balance is None else balance
+        return -np.pmt(monthly_rate, term_in_months, balance)
     def interest_amount(self, payment_date):
         return self.monthly_rate * self.loan.remaining_balance
+    def interest_rates(self, first_payment_month, payment_count, last_payment_month=None):
+        return self.loan.apr_path(first_payment_month, payment_count) / 12
+
+    has_closed_form = True
+
+    def balance_after(self, payment_count, payment_amount):
+        """ Annuity formula for the balance left on the purchase amount after
+        `payment_count` payments of `payment_amount`, before clipping at zero.
+        """
+        rate = self.monthly_rate
+        if rate == 0:
+            return self.loan.purchase_amount - payment_amount * payment_count
+        growth = (1 + rate) ** payment_count
+        return self.loan.purchase_amount * growth - payment_amount * (growth - 1) / rate
+
+    def payoff_payment_count(self, payment_amount):
+        """ Number of payments of `payment_amount` needed to pay off the purchase amount """
+        rate = self.monthly_rate
+        if rate == 0:
+            nper = self.loan.purchase_amount / payment_amount
+        else:
+            nper = -np.log(1 - rate * self.loan.purchase_amount / payment_amount) / np.log(1 + rate)
+        # the minimum payment pays off in exactly term_in_months; don't let rounding add one
+        return int(np.ceil(nper - 1e-6))
         
 class DailyCompounder(Compunder):
     def __init__(self, amortized_loan):
         super().__init__(amortized_loan)
         self.days_in_month = 365.25 / 12
+        self._term_day_gaps = None
     @property
     def daily_rate(self):
         return self.loan.apr / 365.25
@@ -67,10 +118,39 @@ class DailyCompounder(Compunder):
     def term_in_days(self):
         return self.loan.term_in_years * 365.25
 
-    def minimum_payment(self):
-        return -self.days_in_month * np.pmt(self.daily_rate, self.term_in_days, self.loan.purchase_amount)
+    def minimum_payment(self, apr=None, balance=None, term_in_months=None):
+        daily_rate = self.daily_rate if apr is None else apr / 365.25
+        term_in_days = self.term_in_days if term_in_months is None else term_in_months * self.days_in_month
+        balance = self.loan.purchase_amount if balance is None else balance
+        return -self.days_in_month * np.pmt(daily_rate, term_in_days, balance)
     def interest_amount(self, payment_month):
         return (self.daily_rate * self.loan.days_since_last_payment(payment_month)) * self.loan.remaining_balance
+    def interest_rates(self, first_payment_month, payment_count, last_payment_month=None):
+        day_gaps = self.day_gaps(first_payment_month, payment_count, last_payment_month)
+        return self.loan.apr_path(first_payment_month, payment_count) / 365.25 * day_gaps
+
+    @property
+    def term_day_gaps(self):
+        """ Days accrued by each monthly payment over the loan's term, starting with the
+        first payment, which accrues none. Computed once.
+        """
+        if self._term_day_gaps is None:
+            term_in_months = int(np.ceil(np.max(self.loan.term_in_years) * 12)) + 1
+            self._term_day_gaps = month.MonthRange(self.loan.start_month, term_in_months).day_gaps()
+        return self._term_day_gaps
+
+    def day_gaps(self, first_payment_month, payment_count, last_payment_month=None):
+        """ Days accrued by each of `payment_count` monthly payments starting at
+        `first_payment_month`, the first counted from `last_payment_month`
+        """
+        offset = first_payment_month.ordinal - self.loan.start_month.ordinal
+        if last_payment_month is None:
+            cached = offset == 0
+        else:
+            cached = offset > 0 and last_payment_month.monthadd(1) == first_payment_month
+        if cached and offset + payment_count <= len(self.term_day_gaps):
+            return self.term_day_gaps[offset:offset + payment_count]
+        return month.MonthRange(first_payment_month, payment_count).day_gaps(last_payment_month)
 
 class CompunderFactory(object):
     def __init__(self, amortized_loan):
@@ -83,15 +163,427 @@ class CompunderFactory(object):
         elif self.compound_type == CompoundType.DAILY:
             return DailyCompounder(self.loan)
 
+class RatePath(object):
+    """ An apr that changes over the life of a loan, given as (start Month, apr)
+    resets. Each apr applies from its start month until the next reset; months
+    before the first reset use the first apr.
+    """
+    def __init__(self, resets):
+        super().__init__()
+        resets = sorted(resets, key=itemgetter(0))
+        self.start_ordinals = np.array([m.ordinal for m, _ in resets], dtype=int)
+        self.aprs = np.array([apr for _, apr in resets], dtype=float)
+
+    @classmethod
+    def from_monthly_aprs(cls, first_month, aprs):
+        """ One apr per month, starting at `first_month`; the last one carries on """
+        aprs = np.asarray(aprs, dtype=float)
+        changes = np.flatnonzero(np.diff(aprs, prepend=np.nan))
+        return cls([(first_month.monthadd(int(i)), aprs[i]) for i in changes])
+
+    def __repr__(self):
+        return "{cls}({resets})".format(cls=self.__class__.__name__,
+                                        resets=[(month.Month.fromordinal(int(o)), apr)
+                                                for o, apr in zip(self.start_ordinals, self.aprs)])
+
+    def apr_at(self, payment_month):
+        return self.aprs_for(payment_month, 1)[0]
+
+    def aprs_for(self, first_month, month_count):
+        """ The apr for each of `month_count` months starting at `first_month` """
+        ordinals = month.MonthRange(first_month, month_count).ordinals
+        index = np.searchsorted(self.start_ordinals, ordinals, side='right') - 1
+        return self.aprs[np.maximum(index, 0)]
+
+    def is_reset(self, payment_month):
+        return payment_month.ordinal in self.start_ordinals
+
+    def has_reset_between(self, after_month, through_month):
+        """ Whether a reset falls after `after_month` and on or before `through_month` """
+        return bool(((self.start_ordinals > after_month.ordinal) &
+                     (self.start_ordinals <= through_month.ordinal)).any())
+
+    def months_until_next_reset(self, payment_month):
+        """ Months from `payment_month` to the first reset after it, or None """
+        index = np.searchsorted(self.start_ordinals, payment_month.ordinal, side='right')
+        if index == len(self.start_ordinals):
+            return None
+        return int(self.start_ordinals[index]) - payment_month.ordinal
+
+class AmortizationEngine(object):
+    """ Computes the remaining amortization table of a loan in batched numpy
+    operations instead of one `Payment` per month.
+
+    With a fixed payment P and per-payment rates g_k, the balance follows
+        B_k = B_{k-1} * (1 + g_k) - P
+    which has the closed form
+        B_k = G_k * (B_0 - P * sum_{j<=k} 1 / G_j),   G_k = prod_{i<=k} (1 + g_i)
+    so the whole table is a cumprod and a cumsum.
+    """
+    max_term_in_months = 100 * 12
+
+    def __init__(self, amortized_loan):
+        super().__init__()
+        self.loan = amortized_loan
+
+    def calculate(self, payment_amount=None):
+        """ Returns a `PaymentSchedule` of every payment needed to pay off the loan
+        from its current state. The loan itself is left untouched.
+        """
+        # With a rate path and no fixed payment, the minimum payment is recast at each
+        # reset, so the table is computed one segment between resets at a time.
+        recast = payment_amount is None and self.loan.rate_path is not None
+        if payment_amount is None:
+            payment_amount = self.loan.minimum_payment
+
+        first_payment_month = self.loan.get_default_payment_month()
+        last_payment_month = self.loan.last_payment_month
+        balance = starting_balance = self.loan.remaining_balance
+        chunk_size = max(int(round(self.loan.term_in_years * 12)), 12)
+
+        payment_chunks, interest_chunks, principle_chunks, balance_chunks = [], [], [], []
+        payment_count = 0
+        while balance > 0:
+            if payment_count >= self.max_term_in_months:
+                raise ValueError("{} is not paid off within {} months at {:.2f} per month".format(
+                                 self.loan, self.max_term_in_months, payment_amount))
+            chunk_first_month = first_payment_month.monthadd(payment_count)
+            chunk_length = chunk_size
+            if recast:
+                if self.loan.rate_path.is_reset(chunk_first_month) and chunk_first_month != self.loan.start_month:
+                    payment_amount = self.loan.recast_minimum_payment(chunk_first_month, balance)
+                months_until_reset = self.loan.rate_path.months_until_next_reset(chunk_first_month)
+                if months_until_reset is not None:
+                    chunk_length = min(chunk_length, months_until_reset)
+            rates = self.loan.compounder.interest_rates(chunk_first_month,
+                                                        chunk_length,
+                                                        last_payment_month)
+            interest, principle, new_balance = self.amortize(balance, payment_amount, rates)
+            payment_chunks.append(np.full(len(new_balance), payment_amount))
+            interest_chunks.append(interest)
+            principle_chunks.append(principle)
+            balance_chunks.append(new_balance)
+
+            payment_count += len(new_balance)
+            last_payment_month = first_payment_month.monthadd(payment_count - 1)
+            balance = new_balance[-1]
+            chunk_size *= 2
+
+        if not payment_count:
+            return payment_schedule.PaymentSchedule()
+        new_balance = np.concatenate(balance_chunks)
+        return payment_schedule.PaymentSchedule.from_arrays(
+            month.MonthRange(first_payment_month, payment_count).ordinals,
+            np.concatenate(payment_chunks),
+            np.concatenate(([starting_balance], new_balance[:-1])),
+            np.concatenate(interest_chunks),
+            np.concatenate(principle_chunks),
+            new_balance)
+
+    def amortize(self, balance, payment_amount, rates):
+        """ Applies `payment_amount` against `balance` once per entry of `rates`.
+        Returns (interest, principle, new_balance) arrays, truncated at the payoff
+        payment if the loan is paid off within `rates`.
+        """
+        interest, principle, new_balance, payment_counts = self.amortize_rows(
+            np.array([balance]), np.array([payment_amount]), rates[np.newaxis, :])
+        payment_count = payment_counts[0]
+        return interest[0, :payment_count], principle[0, :payment_count], new_balance[0, :payment_count]
+
+    @classmethod
+    def amortize_rows(cls, balances, payment_amounts, rates):
+        """ Row-wise version of `amortize` for many loans at once. `rates` has one row
+        per loan. Returns 2-D (interest, principle, new_balance) arrays, zero-padded
+        after each loan's payoff, and the number of payments made on each loan.
+        """
+        balances = balances[:, np.newaxis]
+        payment_amounts = payment_amounts[:, np.newaxis]
+
+        growth = np.cumprod(1 + rates, axis=1)
+        unclipped_balance = growth * (balances - payment_amounts * np.cumsum(1 / growth, axis=1))
+        previous_balance = np.concatenate((balances, unclipped_balance[:, :-1]), axis=1)
+        interest = rates * previous_balance
+
+        paid_off = unclipped_balance <= PAYOFF_TOLERANCE
+        payment_counts = np.where(paid_off.any(axis=1), paid_off.argmax(axis=1) + 1, rates.shape[1])
+        payment_counts[balances[:, 0] <= 0] = 0
+        made = np.arange(rates.shape[1]) < payment_counts[:, np.newaxis]
+
+        interest = np.where(made, interest, 0.0)
+        principle = np.where(made, payment_amounts - interest, 0.0)
+        new_balance = np.where(made & ~paid_off, unclipped_balance, 0.0)
+
+        # payments stop reducing the balance; the closed form no longer applies
+        for row in np.flatnonzero((interest > payment_amounts).any(axis=1)):
+            row_interest, row_principle, row_balance = cls._amortize_iteratively(
+                balances[row, 0], payment_amounts[row, 0], rates[row])
+            payment_counts[row] = count = len(row_balance)
+            interest[row], principle[row], new_balance[row] = 0.0, 0.0, 0.0
+            interest[row, :count] = row_interest
+            principle[row, :count] = row_principle
+            new_balance[row, :count] = row_balance
+
+        return interest, principle, new_balance, payment_counts
+
+    @staticmethod
+    def payments_to_pay_off(balances, rates, payment_counts):
+        """ Smallest fixed payments that pay off each row's balance in exactly
+        `payment_counts` payments. B_n = 0 in the closed form gives
+            P = B_0 / sum_{j<=n} 1 / G_j
+        for any rates, so daily accrual needs no root finding.
+        Returns a (rows x len(payment_counts)) array.
+        """
+        payment_counts = np.asarray(payment_counts)
+        if (payment_counts < 1).any():
+            raise ValueError("target months must not be before the next payment")
+        growth = np.cumprod(1 + rates, axis=1)
+        discount_sums = np.cumsum(1 / growth, axis=1)
+        return balances[:, np.newaxis] / discount_sums[:, payment_counts - 1]
+
+    @classmethod
+    def amortize_to_payoff(cls, balances, payment_amounts, interest_rates, first_payment_month, month_count):
+        """ Runs `amortize_rows` over `month_count` months, doubling the horizon until
+        every row is paid off. `interest_rates(count)` returns the rate rows for the
+        first `count` payments. Returns a `BatchSchedule`.
+        """
+        while True:
+            interest, principle, new_balance, payment_counts = cls.amortize_rows(
+                balances, payment_amounts, interest_rates(month_count))
+            last_balance = new_balance[np.arange(len(balances)), np.maximum(payment_counts - 1, 0)]
+            paid_off = (last_balance == 0) | (balances <= 0)
+            if paid_off.all() or month_count >= cls.max_term_in_months:
+                break
+            month_count = min(2 * month_count, cls.max_term_in_months)
+        if not paid_off.all():
+            raise ValueError("{} loans are not paid off within {} months".format(
+                             np.count_nonzero(~paid_off), month_count))
+
+        # trim the padding no loan used
+        month_count = payment_counts.max(initial=0)
+        made = np.arange(month_count) < payment_counts[:, np.newaxis]
+        return BatchSchedule(first_payment_month,
+                             np.where(made, payment_amounts[:, np.newaxis], 0.0),
+                             interest[:, :month_count],
+                             principle[:, :month_count],
+                             new_balance[:, :month_count],
+                             payment_counts)
+
+    @staticmethod
+    def _amortize_iteratively(balance, payment_amount, rates):
+        interest = np.zeros(len(rates))
+        principle = np.zeros(len(rates))
+        new_balance = np.zeros(len(rates))
+        for k, rate in enumerate(rates):
+            interest[k] = rate * balance
+            principle[k] = max(payment_amount - interest[k], 0)
+            balance = balance - principle[k]
+            if balance <= PAYOFF_TOLERANCE:
+                balance = 0.0
+            new_balance[k] = balance
+            if balance == 0:
+                return interest[:k + 1], principle[:k + 1], new_balance[:k + 1]
+        return interest, principle, new_balance
+
+class BatchSchedule(object):
+    """ Amortization tables for many loans, as 2-D (loans x months) arrays padded
+    with zeros after each loan is paid off. Column k is the k-th payment, made in
+    month `start_month.monthadd(k)`.
+    """
+    def __init__(self, start_month, payment_amounts, interest_amounts, principle_amounts, new_balances, payment_counts):
+        super().__init__()
+        self.start_month = start_month
+        self.payment_amounts = payment_amounts
+        self.interest_amounts = interest_amounts
+        self.principle_amounts = principle_amounts
+        self.new_balances = new_balances
+        self.payment_counts = payment_counts
+
+    def __len__(self):
+        return len(self.payment_counts)
+
+    @property
+    def payoff_month_ordinals(self):
+        return self.start_month.ordinal + self.payment_counts - 1
+
+    @property
+    def payoff_months(self):
+        return [month.Month.fromordinal(int(o)) for o in self.payoff_month_ordinals]
+
+    @property
+    def total_interest_paid(self):
+        return self.interest_amounts.sum(axis=1)
+
+    @property
+    def payment_months(self):
+        """ `MonthRange` of the columns """
+        return month.MonthRange(self.start_month, self.interest_amounts.shape[1])
+
+    @property
+    def years(self):
+        """ The calendar years spanned by the columns """
+        years, _ = self.payment_months.year_starts()
+        return years
+
+    def interest_by_year(self):
+        """ Returns a (loans x years) array of interest paid in each of `years` """
+        if not self.interest_amounts.shape[1]:
+            return np.zeros((len(self), 0))
+        _, year_starts = self.payment_months.year_starts()
+        return np.add.reduceat(self.interest_amounts, year_starts, axis=1)
+
+class PaymentSweep(BatchSchedule):
+    """ `BatchSchedule` with one row per payment amount tried on the same loan,
+    plus the loan's total interest at its minimum payment for comparison.
+    """
+    def __init__(self, batch_schedule, minimum_payment_total_interest):
+        super().__init__(batch_schedule.start_month,
+                         batch_schedule.payment_amounts,
+                         batch_schedule.interest_amounts,
+                         batch_schedule.principle_amounts,
+                         batch_schedule.new_balances,
+                         batch_schedule.payment_counts)
+        self.minimum_payment_total_interest = minimum_payment_total_interest
+
+    @property
+    def interest_saved(self):
+        return self.minimum_payment_total_interest - self.total_interest_paid
+
+class LoanBatch(object):
+    """ Many loans with the same compound type and start month, described by arrays
+    of purchase amounts, terms and aprs. Uses the same compounders as `AmortizedLoan`,
+    which broadcast over the arrays.
+    """
+    def __init__(self, purchase_amounts, terms_in_years, aprs, start_month, compound_type):
+        super().__init__()
+        self.purchase_amount = np.asarray(purchase_amounts, dtype=float)
+        self.term_in_years = np.broadcast_to(terms_in_years, self.purchase_amount.shape).astype(float)
+        self.apr = np.broadcast_to(aprs, self.purchase_amount.shape).astype(float)
+        self.start_month = start_month
+        self.compound_type = compound_type
+
+        self.compounder = CompunderFactory(self).get_compounder()
+        self.minimum_payment = self.compounder.minimum_payment()
+
+    def __len__(self):
+        return len(self.purchase_amount)
+
+    def apr_path(self, first_payment_month, payment_count):
+        return np.multiply.outer(self.apr, np.ones(payment_count))
+
+    def payment_to_pay_off_by(self, target_months):
+        """ Returns a (loans x target months) array of the smallest fixed payment that
+        pays off each loan, from its start, with its last payment in each target month.
+        """
+        payment_counts = np.array([m.ordinal for m in target_months]) - self.start_month.ordinal + 1
+        rates = self.compounder.interest_rates(self.start_month, max(payment_counts.max(initial=1), 1))
+        return AmortizationEngine.payments_to_pay_off(self.purchase_amount, rates, payment_counts)
+
+    def calculate_amortization_table(self, regular_payment_amounts=None):
+        """ Pays off every loan in the batch from its start, with `regular_payment_amounts`
+        (a scalar or one amount per loan) or each loan's minimum payment.
+        Returns a `BatchSchedule`.
+        """
+        if regular_payment_amounts is None:
+            regular_payment_amounts = self.minimum_payment
+        payment_amounts = np.broadcast_to(regular_payment_amounts, self.purchase_amount.shape).astype(float)
+
+        month_count = max(int(np.ceil(self.term_in_years.max(initial=1) * 12)) + 1, 12)
+        return AmortizationEngine.amortize_to_payoff(
+            self.purchase_amount,
+            payment_amounts,
+            lambda count: self.compounder.interest_rates(self.start_month, count),
+            self.start_month,
+            month_count)
+
+class LoanPortfolio(object):
+    """ Loans that may differ in purchase amount, term, apr and compound type,
+    amortized together: one `LoanBatch` per compound type.
+    """
+    def __init__(self, purchase_amounts, terms_in_years, aprs, start_month, compound_types):
+        super().__init__()
+        self.purchase_amounts = np.asarray(purchase_amounts, dtype=float)
+        shape = self.purchase_amounts.shape
+        self.terms_in_years = np.broadcast_to(terms_in_years, shape)
+        self.aprs = np.broadcast_to(aprs, shape)
+        self.compound_types = np.broadcast_to(np.asarray(compound_types, dtype=object), shape)
+        self.start_month = start_month
+
+    def __len__(self):
+        return len(self.purchase_amounts)
+
+    def batches(self):
+        """ Returns [(loan indexes, LoanBatch)], one per compound type present """
+        batches = []
+        for compound_type in sorted(set(self.compound_types)):
+            index = np.flatnonzero(self.compound_types == compound_type)
+            batches.append((index, LoanBatch(self.purchase_amounts[index],
+                                             self.terms_in_years[index],
+                                             self.aprs[index],
+                                             self.start_month,
+                                             compound_type)))
+        return batches
+
+    @property
+    def minimum_payment(self):
+        minimum_payment = np.zeros(len(self))
+        for index, batch in self.batches():
+            minimum_payment[index] = batch.minimum_payment
+        return minimum_payment
+
+    def payment_to_pay_off_by(self, target_months):
+        """ Returns a (loans x target months) array, see `LoanBatch.payment_to_pay_off_by` """
+        payments = np.zeros((len(self), len(target_months)))
+        for index, batch in self.batches():
+            payments[index] = batch.payment_to_pay_off_by(target_months)
+        return payments
+
+    def calculate_amortization_table(self, regular_payment_amounts=None):
+        """ Returns a `BatchSchedule` with one row per loan, in input order """
+        payment_amounts = None
+        if regular_payment_amounts is not None:
+            payment_amounts = np.broadcast_to(regular_payment_amounts, self.purchase_amounts.shape)
+
+        schedules = []
+        for index, batch in self.batches():
+            batch_payments = None if payment_amounts is None else payment_amounts[index]
+            schedules.append((index, batch.calculate_amortization_table(batch_payments)))
+
+        month_count = max([s.interest_amounts.shape[1] for _, s in schedules] or [0])
+        columns = [np.zeros((len(self), month_count)) for _ in range(4)]
+        payment_counts = np.zeros(len(self), dtype=int)
+        for index, schedule in schedules:
+            width = schedule.interest_amounts.shape[1]
+            for column, values in zip(columns, (schedule.payment_amounts,
+                                                schedule.interest_amounts,
+                                                schedule.principle_amounts,
+                                                schedule.new_balances)):
+                column[index, :width] = values
+            payment_counts[index] = schedule.payment_counts
+        return BatchSchedule(self.start_month, *columns, payment_counts=payment_counts)
+
 class AmortizedLoan(object):
-    """docstring for AmortizedLoan"""
-    def __init__(self, purchase_amount, term_in_years, apr, start_month, compound_type):
+    """ A loan paid off over `term_in_years` from `start_month`.
+
+    `apr` is the current rate. With a `rate_path` it follows the path's resets and
+    may be None; if given, it must equal the path's apr at `start_month`, and a
+    ValueError is raised otherwise. Without a `rate_path` it is required.
+    """
+    def __init__(self, purchase_amount, term_in_years, apr, start_month, compound_type, rate_path=None):
         super().__init__()
         self.purchase_amount = purchase_amount
         self.term_in_years = term_in_years
-        self.apr = apr
         self.compound_type = compound_type
 
+        self.rate_path = rate_path
+        if rate_path is None:
+            if apr is None:
+                raise ValueError("An apr is required without a rate path")
+            self.apr = apr
+        else:
+            self.apr = rate_path.apr_at(start_month)
+            if apr is not None and not np.isclose(apr, self.apr):
+                raise ValueError("apr {} does not match the rate path's {} at {}".format(apr, self.apr, start_month))
+
         self.compounder = CompunderFactory(self).get_compounder()
 
         self.minimum_payment = self.compounder.minimum_payment()
@@ -99,23 +591,84 @@ class AmortizedLoan(object):
         self.remaining_balance = self.purchase_amount
         self.start_month = start_month
         self.last_payment_month = None
-        self.payments = []
+        self.payments = payment_schedule.PaymentSchedule()
+
+        # True while every payment so far was the minimum, in consecutive months
+        self.on_minimum_payment_schedule = True
+        self._projected_schedule = None
 
     def __str__(self):
         return "AmortizedLoan: {amt} for {term} years at {apr}%".format(amt=self.purchase_amount,
                                                                         term=self.term_in_years,
                                                                         apr=self.apr)
 
+    def version(self, year=None):
+        """ Changes whenever a payment in `year` (or any year, if None) is recorded """
+        return self.payments.version(year)
+
     def total_interest_paid(self, year=None):
         """ Return total interest paid for the given year. If `year` is None, return total
         interest paid for all years.
         """
-        if not self.payments:
-            return 0
-        if year is not None:
-            return sum((p.interest_amount for p in self.payments if p.month.year == year))
-        else:
-            return sum((p.interest_amount for p in self.payments))
+        return self.payments.totals(year).interest_amount
+
+    # Point-in-time queries. These cover the whole life of the loan: payments already
+    # made, then minimum payments from the current state until the loan is paid off.
+    def balance_at(self, payment_month):
+        """ Balance left after the payment in `payment_month` """
+        if self._uses_closed_form():
+            return self._closed_form_balance(self._minimum_payment_count_through(payment_month))
+        schedule = self.projected_schedule()
+        row = self._projected_row_through(payment_month)
+        return schedule.new_balances[row] if row >= 0 else self.purchase_amount
+
+    def cumulative_interest_between(self, first_month, last_month):
+        """ Interest in the payments from `first_month` through `last_month`, inclusive """
+        return (self._cumulative_interest_through(last_month) -
+                self._cumulative_interest_through(first_month.monthadd(-1)))
+
+    def interest_in_year(self, year):
+        return self.cumulative_interest_between(month.Month(year, 1), month.Month(year, 12))
+
+    def projected_schedule(self):
+        """ The payments made so far followed by minimum payments until payoff, as one
+        `PaymentSchedule`. Cached until the next payment.
+        """
+        if self._projected_schedule is None or self._projected_payment_count != len(self.payments):
+            schedule = self.payments[:]
+            schedule.extend_schedule(AmortizationEngine(self).calculate())
+            self._projected_schedule = schedule
+            self._projected_payment_count = len(self.payments)
+            self._projected_cumulative_interest = np.cumsum(schedule.interest_amounts)
+        return self._projected_schedule
+
+    def _uses_closed_form(self):
+        return (self.compounder.has_closed_form and
+                self.rate_path is None and
+                self.on_minimum_payment_schedule)
+
+    def _minimum_payment_count_through(self, payment_month):
+        payment_count = payment_month.ordinal - self.start_month.ordinal + 1
+        payoff_payment_count = self.compounder.payoff_payment_count(self.minimum_payment)
+        return min(max(payment_count, 0), payoff_payment_count)
+
+    def _closed_form_balance(self, payment_count):
+        balance = self.compounder.balance_after(payment_count, self.minimum_payment)
+        return 0 if balance <= PAYOFF_TOLERANCE else balance
+
+    def _projected_row_through(self, payment_month):
+        schedule = self.projected_schedule()
+        return np.searchsorted(schedule.month_ordinals, payment_month.ordinal, side='right') - 1
+
+    def _cumulative_interest_through(self, payment_month):
+        if self._uses_closed_form():
+            # every payment is the minimum, so interest = payments - principle repaid
+            payment_count = self._minimum_payment_count_through(payment_month)
+            balance = self.compounder.balance_after(payment_count, self.minimum_payment)
+            return self.minimum_payment * payment_count - (self.purchase_amount - balance)
+        self.projected_schedule()
+        row = self._projected_row_through(payment_month)
+        return self._projected_cumulative_interest[row] if row >= 0 else 0
 
     def days_since_last_payment(self, this_month):
         if self.last_payment_month is None:
@@ -136,17 +689,114 @@ class AmortizedLoan(object):
 
         if payment_month is None:
             payment_month = self.get_default_payment_month()
+        self._apply_rate_reset(payment_month)
         if payment_amount is None:
             payment_amount = self.minimum_payment
-
+        if payment_amount != self.minimum_payment or payment_month != self.get_default_payment_month():
+            self.on_minimum_payment_schedule = False
 
         payment = Payment(self, payment_month, payment_amount)
-        self.payments.append(payment)
-        self.last_payment_month = payment_month
+        self.last_payment_month = payment.month
         self.remaining_balance = payment.new_balance
-        return payment
+        return self.payments.append(payment.month,
+                                    payment.payment_amount,
+                                    payment.previous_balance,
+                                    payment.interest_amount,
+                                    payment.principle_amount,
+                                    payment.new_balance)
+
+    def payment_to_pay_off_by(self, target_month):
+        """ Smallest fixed payment that pays off the loan, from its current state, with
+        the last payment in `target_month`. Accepts a `Month` or a list of them.
+        """
+        target_months = [target_month] if isinstance(target_month, month.Month) else target_month
+        first_payment_month = self.get_default_payment_month()
+        payment_counts = np.array([m.ordinal for m in target_months]) - first_payment_month.ordinal + 1
+        rates = self.compounder.interest_rates(first_payment_month,
+                                               max(payment_counts.max(initial=1), 1),
+                                               self.last_payment_month)
+        payments = AmortizationEngine.payments_to_pay_off(np.array([float(self.remaining_balance)]),
+                                                          rates[np.newaxis, :],
+                                                          payment_counts)[0]
+        return payments[0] if isinstance(target_month, month.Month) else payments
+
+    def payment_sweep(self, regular_payment_amounts=None, extra_payment_amounts=0):
+        """ Pays off the loan from its current state once for every amount in
+        `regular_payment_amounts` (default: the minimum payment) plus
+        `extra_payment_amounts`, all in one batch. The loan itself is left untouched.
+        Returns a `PaymentSweep` with one row per amount.
+
+        Interest saved is measured against the loan's minimum payment schedule,
+        which with a `rate_path` is recast at each reset. No fixed amount follows
+        that schedule, so a loan with a rate path needs `regular_payment_amounts`.
+        """
+        if regular_payment_amounts is None:
+            if self.rate_path is not None:
+                raise ValueError("the minimum payment of {} is recast at each rate reset; "
+                                 "give regular_payment_amounts".format(self))
+            regular_payment_amounts = self.minimum_payment
+        payment_amounts = np.atleast_1d(np.add(regular_payment_amounts, extra_payment_amounts)).astype(float)
+        sweep_count = len(payment_amounts)
+        if self.rate_path is None:
+            # the last row is the minimum payment, for the interest saved
+            payment_amounts = np.append(payment_amounts, self.minimum_payment)
+
+        first_payment_month = self.get_default_payment_month()
+        rates = lambda count: np.broadcast_to(
+            self.compounder.interest_rates(first_payment_month, count, self.last_payment_month),
+            (len(payment_amounts), count))
+        schedule = AmortizationEngine.amortize_to_payoff(
+            np.full(len(payment_amounts), float(self.remaining_balance)),
+            payment_amounts,
+            rates,
+            first_payment_month,
+            max(int(round(self.term_in_years * 12)), 12))
+
+        if self.rate_path is None:
+            minimum_payment_total_interest = schedule.total_interest_paid[-1]
+        else:
+            minimum_payment_total_interest = AmortizationEngine(self).calculate().interest_amounts.sum()
+        month_count = schedule.payment_counts[:sweep_count].max(initial=0)
+        return PaymentSweep(BatchSchedule(first_payment_month,
+                                          schedule.payment_amounts[:sweep_count, :month_count],
+                                          schedule.interest_amounts[:sweep_count, :month_count],
+                                          schedule.principle_amounts[:sweep_count, :month_count],
+                                          schedule.new_balances[:sweep_count, :month_count],
+                                          schedule.payment_counts[:sweep_count]),
+                            minimum_payment_total_interest)
 
     def calculate_amortization_table(self, regular_payment_amount=None):
-        while self.remaining_balance > 0:
-            self.make_payment(regular_payment_amount)
-        return self.payments
\ No newline at end of file
+        if regular_payment_amount is not None and regular_payment_amount != self.minimum_payment:
+            self.on_minimum_payment_schedule = False
+        schedule = AmortizationEngine(self).calculate(regular_payment_amount)
+        if schedule:
+            self.payments.extend_schedule(schedule)
+            self.last_payment_month = month.Month.fromordinal(int(schedule.month_ordinals[-1]))
+            self.remaining_balance = float(schedule.new_balances[-1])
+            if self.rate_path is not None:
+                self.apr = self.rate_path.apr_at(self.last_payment_month)
+                if regular_payment_amount is None:
+                    self.minimum_payment = schedule.payment_amounts[-1]
+        return self.payments
+
+    def apr_path(self, first_payment_month, payment_count):
+        """ The apr for each of `payment_count` payments starting at `first_payment_month` """
+        if self.rate_path is None:
+            return np.full(payment_count, self.apr)
+        return self.rate_path.aprs_for(first_payment_month, payment_count)
+
+    def recast_minimum_payment(self, payment_month, balance):
+        """ Minimum payment that pays off `balance` over the rest of the term, at the
+        apr in effect in `payment_month`
+        """
+        months_left = int(round(self.term_in_years * 12)) - (payment_month.ordinal - self.start_month.ordinal)
+        return self.compounder.minimum_payment(self.rate_path.apr_at(payment_month), balance, max(months_left, 1))
+
+    def _apply_rate_reset(self, payment_month):
+        if self.rate_path is None:
+            return
+        previous_month = self.last_payment_month or self.start_month
+        if not self.rate_path.has_reset_between(previous_month, payment_month):
+            return
+        self.minimum_payment = self.recast_minimum_payment(payment_month, self.remaining_balance)
+        self.apr = self.rate_path.apr_at(payment_month)
\ No newline at end of file
@@ -7,16 +7,17 @@ class Mortgage(object):
                  purchase_amount=None,
                  down_payment_percent=None,
                  apr=None,
-                 term_in_years=None):
+                 term_in_years=None,
+                 rate_path=None):
         super().__init__()
         self.purchase_month = purchase_month
         self.purchase_amount = purchase_amount
         self.down_payment_percent = down_payment_percent
         self.apr = apr
         self.term_in_years = term_in_years
+        self.rate_path = rate_path
 
         self._mortgage_loan = None
-        self._payments = []
 
     @property
     def down_payment_amount(self):
@@ -33,7 +34,8 @@ class Mortgage(object):
                                                                self.term_in_years,
                                                                self.apr,
                                                                self.purchase_month,
-                                                               amortized_loan.CompoundType.MONTHLY)
+                                                               amortized_loan.CompoundType.MONTHLY,
+                                                               self.rate_path)
         return self._mortgage_loan
 
     @property
@@ -51,19 +53,32 @@ class Mortgage(object):
     def total_interest_paid(self, year=None):
         return self.mortgage_loan.total_interest_paid(year)
 
+    def version(self, year=None):
+        if self._mortgage_loan is None:
+            return 0
+        return self.mortgage_loan.version(year)
+
+    def balance_at(self, payment_month):
+        return self.mortgage_loan.balance_at(payment_month)
+
+    def interest_in_year(self, year):
+        return self.mortgage_loan.interest_in_year(year)
+
     @property
     def payments(self):
-        return self._payments
+        return self.mortgage_loan.payments
 
     def make_payment(self, payment_month=None):
-        loan_payment = self.mortgage_loan.make_payment(self.minimum_payment, payment_month)
-        self.payments.append(loan_payment)
-        return loan_payment
+        return self.mortgage_loan.make_payment(None, payment_month)
 
     def calculate_amortization_table(self, regular_payment_amount=None):
-        while self.mortgage_loan.remaining_balance > 0:
-            self.make_payment()
-        return self.payments
+        return self.mortgage_loan.calculate_amortization_table()
+
+    def payment_sweep(self, regular_payment_amounts=None, extra_payment_amounts=0):
+        return self.mortgage_loan.payment_sweep(regular_payment_amounts, extra_payment_amounts)
+
+    def payment_to_pay_off_by(self, target_month):
+        return self.mortgage_loan.payment_to_pay_off_by(target_month)
 
 
 class StudentLoan(object):
@@ -71,12 +86,14 @@ class StudentLoan(object):
                  start_month=None,
                  start_amount=None,
                  apr=None,
-                 term_in_years=10):
+                 term_in_years=10,
+                 rate_path=None):
         super().__init__()
         self.start_month = start_month
         self.start_amount = start_amount
         self.apr = apr
         self.term_in_years = term_in_years
+        self.rate_path = rate_path
 
         self._student_loan = None
 
@@ -87,7 +104,8 @@ class StudentLoan(object):
                                                               self.term_in_years,
                                                               self.apr,
                                                               self.start_month,
-                                                              amortized_loan.CompoundType.DAILY)
+                                                              amortized_loan.CompoundType.DAILY,
+                                                              self.rate_path)
         return self._student_loan
 
     @property
@@ -105,6 +123,17 @@ class StudentLoan(object):
     def total_interest_paid(self, year=None):
         return self.student_loan.total_interest_paid(year)
 
+    def version(self, year=None):
+        if self._student_loan is None:
+            return 0
+        return self.student_loan.version(year)
+
+    def balance_at(self, payment_month):
+        return self.student_loan.balance_at(payment_month)
+
+    def interest_in_year(self, year):
+        return self.student_loan.interest_in_year(year)
+
     @property
     def payments(self):
         return self.student_loan.payments
@@ -113,4 +142,10 @@ class StudentLoan(object):
         return self.student_loan.make_payment(payment_amount, payment_month)
 
     def calculate_amortization_table(self, regular_payment_amount=None):
-        return self.student_loan.calculate_amortization_table(regular_payment_amount)
\ No newline at end of file
+        return self.student_loan.calculate_amortization_table(regular_payment_amount)
+
+    def payment_sweep(self, regular_payment_amounts=None, extra_payment_amounts=0):
+        return self.student_loan.payment_sweep(regular_payment_amounts, extra_payment_amounts)
+
+    def payment_to_pay_off_by(self, target_month):
+        return self.student_loan.payment_to_pay_off_by(target_month)
@@ -1,4 +1,11 @@
+from collections import OrderedDict
+import hashlib
+import json
+
+import numpy as np
+
 import enum
+import tax_brackets
 
 FilingStatus = enum.Enum(["SINGLE", "MARRIED_JOINT"])
 
@@ -104,6 +111,25 @@ property_tax_data = {
     },
 }
 
+class _ReadOnly(object):
+    """ Attributes can be set until `_freeze`, after which setting or deleting one
+    raises AttributeError
+    """
+    _frozen = False
+
+    def _freeze(self):
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError("{} is read-only".format(type(self).__name__))
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self._frozen:
+            raise AttributeError("{} is read-only".format(type(self).__name__))
+        super().__delattr__(name)
+
 class PropertyTaxDao(object):
     def __init__(self, state, year):
         super().__init__()
@@ -112,7 +138,7 @@ class PropertyTaxDao(object):
     def get_data(self):
         return property_tax_data[self.state][self.year]
 
-class PropertyTaxData(object):
+class PropertyTaxData(_ReadOnly):
     def __init__(self, state, year, tax_dao=None):
         super().__init__()
         self.year = year
@@ -123,6 +149,7 @@ class PropertyTaxData(object):
 
         self.mill_rate = _tax_data['mill_rate']
         self.valuation_rate = _tax_data['valuation_rate']
+        self._freeze()
 
     @property
     def tax_dao(self):
@@ -143,7 +170,7 @@ class FederalTaxDao(object):
         return federal_tax_data[self.year][self.filing_status]
     
 
-class FederalTaxData(object):
+class FederalTaxData(_ReadOnly):
     """docstring for FederalTaxData"""
     def __init__(self, year, filing_status, tax_dao=None):
         super().__init__()
@@ -152,7 +179,7 @@ class FederalTaxData(object):
         self._tax_dao = tax_dao
 
         _tax_data = self.tax_dao.get_data()
-        self.tax_brackets = _tax_data['tax_brackets']
+        self.tax_brackets = tuple(tuple(bracket) for bracket in _tax_data['tax_brackets'])
         self.medicare_tax_rate = _tax_data['medicare_tax_rate']
         self.social_security_tax_rate = _tax_data['social_security_tax_rate']
         self.social_security_tax_wage_base_limit = _tax_data['social_security_tax_wage_base_limit']
@@ -161,6 +188,8 @@ class FederalTaxData(object):
         self.student_loan_max_deduction = _tax_data['student_loan_max_deduction'] 
         self.student_loan_phaseout_denominator = _tax_data['student_loan_phaseout_denominator'] 
         self.student_loan_phaseout_numerator_reduction = _tax_data['student_loan_phaseout_numerator_reduction'] 
+        self.bracket_schedule = tax_brackets.TaxBracketSchedule(self.tax_brackets)
+        self._freeze()
 
     @property
     def tax_dao(self):
@@ -181,7 +210,7 @@ class StateTaxDao(object):
     def get_data(self):
         return state_tax_data[self.state][self.year][self.filing_status]
 
-class StateTaxData(object):
+class StateTaxData(_ReadOnly):
     """docstring for StateTaxData"""
     def __init__(self, state, year, filing_status, tax_dao=None):
         super().__init__()
@@ -191,9 +220,11 @@ class StateTaxData(object):
         self._tax_dao = tax_dao
 
         _tax_data = self.tax_dao.get_data()
-        self.tax_brackets = _tax_data['tax_brackets']
+        self.tax_brackets = tuple(tuple(bracket) for bracket in _tax_data['tax_brackets'])
         self.standard_deduction_amount = _tax_data['standard_deduction_amount']
         self.exemption_amount_per_person = _tax_data['exemption_amount_per_person']
+        self.bracket_schedule = tax_brackets.TaxBracketSchedule(self.tax_brackets)
+        self._freeze()
 
     @property
     def tax_dao(self):
@@ -202,4 +233,101 @@ class StateTaxData(object):
         return self._tax_dao
     @tax_dao.setter
     def tax_dao(self, value):
-        self._tax_dao = value
\ No newline at end of file
+        self._tax_dao = value
+
+
+class TaxDataRegistry(object):
+    """ Compiles tax data once per (year, filing status[, state]) and hands out the
+    same instance on every request. The instances are immutable: their attributes
+    cannot be set once built, and their bracket arrays are not writeable.
+
+    With no `store` the data comes from the dicts in this module; otherwise `store`
+    supplies DAOs through `federal_tax_dao`, `state_tax_dao` and `property_tax_dao`
+    (see `tax_data_store.TaxDataStore`).
+
+    At most `cache_size` compiled instances are kept, least recently used dropped
+    first; by default the store's own `cache_size`, or no limit without a store.
+    """
+    def __init__(self, store=None, cache_size=None):
+        super().__init__()
+        self.store = store
+        if cache_size is None and store is not None:
+            cache_size = store.cache_size
+        self.cache_size = cache_size
+        self._compiled = OrderedDict()
+
+    def _cached(self, key, compile_):
+        if key in self._compiled:
+            self._compiled.move_to_end(key)
+            return self._compiled[key]
+        tax_data = compile_()
+        self._compiled[key] = tax_data
+        if self.cache_size is not None and len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+        return tax_data
+
+    def federal_tax_data(self, year, filing_status):
+        def compile_():
+            tax_dao = self.store.federal_tax_dao(year, filing_status) if self.store is not None else None
+            return FederalTaxData(year, filing_status, tax_dao)
+        return self._cached(('federal', year, filing_status), compile_)
+
+    def state_tax_data(self, state, year, filing_status):
+        def compile_():
+            tax_dao = self.store.state_tax_dao(state, year, filing_status) if self.store is not None else None
+            return StateTaxData(state, year, filing_status, tax_dao)
+        return self._cached(('state', state, year, filing_status), compile_)
+
+    def property_tax_data(self, state, year):
+        def compile_():
+            tax_dao = self.store.property_tax_dao(state, year) if self.store is not None else None
+            return PropertyTaxData(state, year, tax_dao)
+        return self._cached(('property', state, year), compile_)
+
+    @staticmethod
+    def _by_year(years, tax_data_for_year, name):
+        years = np.asarray(years, dtype=int)
+        distinct, inverse = np.unique(years, return_inverse=True)
+        values = np.array([getattr(tax_data_for_year(int(year)), name) for year in distinct], dtype=float)
+        return values[inverse].reshape(years.shape)
+
+    def federal_parameter(self, name, years, filing_status):
+        """ Returns the named FederalTaxData value for each entry of an array of years """
+        return self._by_year(years, lambda year: self.federal_tax_data(year, filing_status), name)
+
+    def state_parameter(self, name, state, years, filing_status):
+        """ Returns the named StateTaxData value for each entry of an array of years """
+        return self._by_year(years, lambda year: self.state_tax_data(state, year, filing_status), name)
+
+    def property_parameter(self, name, state, years):
+        """ Returns the named PropertyTaxData value for each entry of an array of years """
+        return self._by_year(years, lambda year: self.property_tax_data(state, year), name)
+
+    def federal_years(self):
+        """ Returns the sorted years with federal data, from the store or this module's dicts """
+        if self.store is not None:
+            return self.store.federal_years()
+        return sorted(federal_tax_data)
+
+    def latest_tax_years(self, years):
+        """ Returns, for each entry of an array of years, the latest year on or before
+        it that has federal data; raises ValueError if a year has none
+        """
+        years = np.asarray(years, dtype=int)
+        known = np.array(self.federal_years(), dtype=int)
+        positions = np.searchsorted(known, years, side='right') - 1
+        if (positions < 0).any():
+            raise ValueError("No tax data for {} or any earlier year".format(int(years[positions < 0].min())))
+        return known[positions]
+
+    def version(self):
+        """ Hex hash of the tax data this registry reads: the store's, or this module's dicts """
+        if self.store is not None:
+            return self.store.version()
+        text = json.dumps([federal_tax_data, state_tax_data, property_tax_data], sort_keys=True)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def clear(self):
+        self._compiled.clear()
+
+registry = TaxDataRegistry()
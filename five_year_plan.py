@@ -1,10 +1,14 @@
 import datetime
 import copy
 
+import numpy as np
+
 import people
 import home
 import tax_calculators
+import household_taxes
 import common_loans
+import data
 from data import FilingStatus
 
 
@@ -84,6 +88,93 @@ class YearSummary(object):
                    net=int(round(self.net_income)),
                    eff_rate=self.fed_taxes/self.gross_income)
 
+class PlanProjection(object):
+    """ A family's finances over a range of years, as a years x metrics array.
+
+    Every year is one row of a `HouseholdTable`, so the whole range costs one
+    batched tax computation. Tax parameters come from each row's entry in
+    `tax_years`, by default the latest year on or before it that has tax data
+    (`data.TaxDataRegistry.latest_tax_years`), so years past the data keep the
+    latest known law; ValueError is raised for years before the data. Loan figures are read from the schedules already on the
+    family's home and student loan, sliced by year.
+    """
+    metrics = ('gross_income',
+               'retirement_contribution',
+               'healthcare_contribution',
+               'itemized_deductions',
+               'mortgage_interest',
+               'student_loan_interest',
+               'federal_agi',
+               'state_agi',
+               'student_loan_interest_deduction',
+               'federal_taxes',
+               'fica_taxes',
+               'state_taxes',
+               'property_taxes',
+               'total_taxes',
+               'net_income',
+               'pmi',
+               'mortgage_balance',
+               'student_loan_balance')
+
+    def __init__(self, family, years, tax_years=None, engine=None):
+        super().__init__()
+        self.family = family
+        self.years = np.asarray(years, dtype=int)
+        if tax_years is None:
+            self.tax_years = data.registry.latest_tax_years(self.years)
+        else:
+            self.tax_years = np.broadcast_to(np.asarray(tax_years, dtype=int), self.years.shape)
+        self._engine = engine
+        self.values = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = household_taxes.HouseholdTaxEngine(None)
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+
+    def calculate(self):
+        """ Returns the (years, metrics) array, one column per name in `metrics` """
+        table = household_taxes.HouseholdTable.from_families([self.family] * len(self.years), self.years)
+        taxes = self.engine.calculate(table, self.tax_years)
+
+        no_loan = np.zeros(len(self.years))
+        home_ = self.family.home
+        student_loan = self.family.student_loan
+        columns = {
+            'gross_income': table.gross_income,
+            'retirement_contribution': table.retirement_contribution,
+            'healthcare_contribution': table.healthcare_contribution,
+            'itemized_deductions': table.itemized_deductions,
+            'mortgage_interest': table.mortgage_interest,
+            'student_loan_interest': table.student_loan_interest,
+            'federal_agi': taxes.federal_agi,
+            'state_agi': taxes.state_agi,
+            'student_loan_interest_deduction': taxes.student_loan_interest_deduction,
+            'federal_taxes': taxes.federal,
+            'fica_taxes': taxes.fica,
+            'state_taxes': taxes.state,
+            'property_taxes': taxes.property,
+            'total_taxes': taxes.total,
+            'net_income': taxes.net_income,
+            'pmi': np.array([home_.pmi_paid(year) for year in self.years.tolist()]) if home_ is not None else np.zeros(len(self.years)),
+            'mortgage_balance': home_.payments.year_end_balances(self.years) if home_ is not None else no_loan,
+            'student_loan_balance': student_loan.payments.year_end_balances(self.years) if student_loan is not None else no_loan,
+        }
+        self.values = np.column_stack([columns[name] for name in self.metrics]) if len(self.years) else np.zeros((0, len(self.metrics)))
+        return self.values
+
+    def metric(self, name):
+        """ Returns one metric's column, one entry per year """
+        if self.values is None:
+            self.calculate()
+        return self.values[:, self.metrics.index(name)]
+
 def main():
     year = 2013
 
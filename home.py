@@ -1,33 +1,12 @@
-import common_loans
-
-class HomePayment(object):
-    def __init__(self, mortgage_payment, pmi_payment_amount):
-        super().__init__()
+import numpy as np
 
-        self.mortgage_payment = mortgage_payment
-        self.month = mortgage_payment.month
-        self.mortgage_payment_amount = mortgage_payment.payment_amount
-        self.principle_amount = mortgage_payment.principle_amount
-        self.interest_amount = mortgage_payment.interest_amount
-        self.new_balance = mortgage_payment.new_balance
-        self.pmi_amount = pmi_payment_amount
-        self.total_payment_amount = mortgage_payment.payment_amount + pmi_payment_amount
-
-    def __str__(self):
-        return self.__repr__()
-
-    def __repr__(self):
-        return "Payment {month} {amt:>8.2f} ({princ:>8.2f} P, {int:>8.2f} I, {pmi:>8.2f} PMI {rem:>10.2f} R)".format(
-            month=self.month,
-            amt=self.total_payment_amount,
-            princ=self.principle_amount,
-            int=self.interest_amount,
-            pmi=self.pmi_amount,
-            rem=self.new_balance
-        )
+import common_loans
 
 class PMI(object):
     """docstring for PMI"""
+    # PMI is charged while the home has less than this much equity
+    equity_threshold = 0.20
+
     def __init__(self, home, rate=None):
         super().__init__()
         self.home = home
@@ -37,13 +16,24 @@ class PMI(object):
     def standard_monthly_pmi_payment(self):
         return self.rate * self.home.financed_amount / 12
     
+    @property
+    def threshold_balance(self):
+        """ PMI is charged on payments made while the balance is above this """
+        return (1 - self.equity_threshold) * self.home.current_value
+
     @property
     def pmi_payment(self):
-        if self.home.current_percent_equity < 0.20:
+        if self.home.current_percent_equity < self.equity_threshold:
             return self.standard_monthly_pmi_payment
         else:
             return 0
 
+    def payments_with_pmi(self, previous_balances):
+        """ Number of leading payments charged PMI, given the balance before each payment.
+        Balances only go down, so this is a searchsorted for the threshold.
+        """
+        return np.searchsorted(-previous_balances, -self.threshold_balance, side='left')
+
 class Home(object):
     def __init__(self,
                  purchase_month=None,
@@ -51,19 +41,20 @@ class Home(object):
                  down_payment_percent=None,
                  apr=None,
                  term_in_years=None,
-                 pmi_rate=None):
+                 pmi_rate=None,
+                 rate_path=None):
         super().__init__()
         self.purchase_month = purchase_month
         self.purchase_amount = purchase_amount
         self.down_payment_percent = down_payment_percent
         self.apr = apr
         self.term_in_years = term_in_years
+        self.rate_path = rate_path
         self._mortgage = None
 
         self.pmi_rate = pmi_rate
         self._pmi = None
-
-        self.payments = []
+        self._pmi_cancellation_month = None
 
     @property
     def current_value(self):
@@ -85,7 +76,8 @@ class Home(object):
                                                    self.purchase_amount,
                                                    self.down_payment_percent,
                                                    self.apr,
-                                                   self.term_in_years)
+                                                   self.term_in_years,
+                                                   self.rate_path)
         return self._mortgage
 
     @property
@@ -104,9 +96,22 @@ class Home(object):
     def last_payment_month(self):
         return self.mortgage.last_payment_month
 
+    @property
+    def payments(self):
+        """ The mortgage's `PaymentSchedule`, with the PMI column filled in """
+        return self.mortgage.payments
+
     def total_interest_paid(self, year=None):
         return self.mortgage.total_interest_paid(year)
 
+    def version(self, year=None):
+        if self._mortgage is None:
+            return 0
+        return self.mortgage.version(year)
+
+    def balance_at(self, payment_month):
+        return self.mortgage.balance_at(payment_month)
+
     # PMI pass-throughs
     @property
     def pmi(self):
@@ -120,18 +125,34 @@ class Home(object):
 
     @property
     def total_pmi_paid(self):
-        if not self.payments:
-            return 0
-        return sum(p.pmi_amount for p in self.payments)
+        return self.payments.totals().pmi_amount
+
+    def pmi_paid(self, year):
+        return self.payments.totals(year).pmi_amount
+
+    @property
+    def pmi_cancellation_month(self):
+        """ First payment month without PMI, assuming minimum payments from here on """
+        if self._pmi_cancellation_month is None:
+            schedule = self.mortgage.mortgage_loan.projected_schedule()
+            payment_count = self.pmi.payments_with_pmi(schedule.previous_balances)
+            if payment_count < len(schedule):
+                self._pmi_cancellation_month = schedule[payment_count].month
+            else:
+                self._pmi_cancellation_month = self.mortgage.mortgage_loan.get_default_payment_month()
+        return self._pmi_cancellation_month
 
     def make_monthly_payment(self, payment_month=None):
         pmi_payment = self.pmi.pmi_payment
-        mortgage_payment = self.mortgage.make_payment(payment_month)
-        home_payment = HomePayment(mortgage_payment, pmi_payment)
-        self.payments.append(home_payment)
+        home_payment = self.mortgage.make_payment(payment_month)
+        self.payments.set_pmi_amount(home_payment.index, pmi_payment)
+        self._pmi_cancellation_month = None
         return home_payment
 
     def calculate_amortization_table(self):
-        while self.remaining_balance > 0:
-            self.make_monthly_payment()
-        return self.payments
\ No newline at end of file
+        first_row = len(self.payments)
+        payments = self.mortgage.calculate_amortization_table()
+        new_rows = slice(first_row, len(payments))
+        payment_count = self.pmi.payments_with_pmi(payments.previous_balances[new_rows])
+        payments.set_pmi_amounts(slice(first_row, first_row + payment_count), self.pmi.standard_monthly_pmi_payment)
+        return payments
\ No newline at end of file
@@ -0,0 +1,206 @@
+from collections import namedtuple
+
+import numpy as np
+
+import data
+import tax_graph
+
+
+HouseholdTaxes = namedtuple('HouseholdTaxes', [
+    'federal_agi',
+    'state_agi',
+    'student_loan_interest_deduction',
+    'federal',
+    'fica',
+    'state',
+    'property',
+    'total',
+    'net_income',
+])
+
+# tax_graph quantity for each HouseholdTaxes field
+_GRAPH_TARGETS = ('fed_agi', 'state_agi', 'student_loan_deduction', 'fed_tax', 'fica', 'state_tax', 'property_tax', 'total_tax', 'net_income')
+
+class HouseholdTable(object):
+    """ Tax inputs for many households in one year, stored column-wise.
+
+    Per-member columns are (household count, max member count) arrays, padded with
+    zeros past each household's `member_counts`. Per-household columns are 1-d.
+    """
+    column_names = ('gross_incomes',
+                    'filing_statuses',
+                    'states',
+                    'retirement_contribution_rates',
+                    'healthcare_contributions',
+                    'member_counts',
+                    'mortgage_interest',
+                    'additional_deductions',
+                    'student_loan_interest',
+                    'home_values')
+
+    def __init__(self,
+                 gross_incomes,
+                 filing_statuses,
+                 states,
+                 retirement_contribution_rates=None,
+                 healthcare_contributions=None,
+                 member_counts=None,
+                 mortgage_interest=None,
+                 additional_deductions=None,
+                 student_loan_interest=None,
+                 home_values=None):
+        super().__init__()
+        self.gross_incomes = np.atleast_2d(np.asarray(gross_incomes, dtype=float))
+        household_count, max_member_count = self.gross_incomes.shape
+
+        def member_column(values):
+            if values is None:
+                return np.zeros((household_count, max_member_count))
+            return np.broadcast_to(np.asarray(values, dtype=float), (household_count, max_member_count))
+
+        def household_column(values):
+            if values is None:
+                return np.zeros(household_count)
+            return np.broadcast_to(np.asarray(values, dtype=float), (household_count,))
+
+        self.retirement_contribution_rates = member_column(retirement_contribution_rates)
+        self.healthcare_contributions = member_column(healthcare_contributions)
+        if member_counts is None:
+            member_counts = max_member_count
+        self.member_counts = np.broadcast_to(np.asarray(member_counts, dtype=int), (household_count,))
+        self.filing_statuses = np.broadcast_to(np.asarray(filing_statuses, dtype=str), (household_count,))
+        self.states = np.broadcast_to(np.asarray(states, dtype=str), (household_count,))
+        self.mortgage_interest = household_column(mortgage_interest)
+        self.additional_deductions = household_column(additional_deductions)
+        self.student_loan_interest = household_column(student_loan_interest)
+        self.home_values = household_column(home_values)
+
+    @classmethod
+    def from_families(cls, families, year):
+        """ Snapshot of each `people.Family`'s inputs for `year`, or for the matching
+        entry of a sequence of years
+        """
+        years = np.broadcast_to(np.asarray(year, dtype=int), (len(families),))
+        max_member_count = max((family.member_count for family in families), default=0)
+        shape = (len(families), max_member_count)
+        gross_incomes = np.zeros(shape)
+        retirement_contribution_rates = np.zeros(shape)
+        healthcare_contributions = np.zeros(shape)
+        for row, (family, year) in enumerate(zip(families, years.tolist())):
+            for column, person in enumerate(family.members):
+                gross_incomes[row, column] = person.gross_income(year)
+                retirement_contribution_rates[row, column] = person.retirement_contribution_rate(year)
+                healthcare_contributions[row, column] = person.healthcare_contribution(year)
+
+        years = years.tolist()
+        mortgage_interest = [family.mortgage_interest_payments(year) for family, year in zip(families, years)]
+        return cls(gross_incomes,
+                   [family.filing_status for family in families],
+                   [family.state_of_residence for family in families],
+                   retirement_contribution_rates=retirement_contribution_rates,
+                   healthcare_contributions=healthcare_contributions,
+                   member_counts=[family.member_count for family in families],
+                   mortgage_interest=mortgage_interest,
+                   additional_deductions=[family.itemized_deductions(year) - interest
+                                          for family, year, interest in zip(families, years, mortgage_interest)],
+                   student_loan_interest=[family.student_loan_interest_payments(year) for family, year in zip(families, years)],
+                   home_values=[family.home_value for family in families])
+
+    def __len__(self):
+        return len(self.gross_incomes)
+
+    def take(self, rows):
+        """ Returns a table of just the households in `rows` (an index array or slice) """
+        return self.replace(rows)
+
+    def with_gross_incomes(self, gross_incomes, rows=slice(None)):
+        return self.replace(rows, gross_incomes=gross_incomes)
+
+    def replace(self, rows=slice(None), **columns):
+        """ Returns a table of the households in `rows`, with any `columns` given by
+        name replacing that column's values
+        """
+        values = dict((name, getattr(self, name)[rows]) for name in self.column_names)
+        values.update(columns)
+        return HouseholdTable(**values)
+
+    @property
+    def gross_income(self):
+        return self.gross_incomes.sum(axis=1)
+
+    @property
+    def retirement_contribution(self):
+        return (self.retirement_contribution_rates * self.gross_incomes).sum(axis=1)
+
+    @property
+    def healthcare_contribution(self):
+        return self.healthcare_contributions.sum(axis=1)
+
+    @property
+    def itemized_deductions(self):
+        return self.mortgage_interest + self.additional_deductions
+
+class HouseholdTaxEngine(object):
+    """ Vectorized counterpart of `tax_calculators.TaxCalculator` over a `HouseholdTable`.
+    Households are grouped by state and filing status, and `tax_graph` is evaluated
+    once per group with that group's `data.py` parameters and input columns.
+    `year` picks the parameters unless `calculate` is given a year for each row.
+    """
+    def __init__(self, year):
+        super().__init__()
+        self.year = year
+
+    def get_federal_tax_data(self, filing_status, year=None):
+        return data.registry.federal_tax_data(self.year if year is None else year, filing_status)
+
+    def get_state_tax_data(self, state, filing_status, year=None):
+        return data.registry.state_tax_data(state, self.year if year is None else year, filing_status)
+
+    def get_property_tax_data(self, state, year=None):
+        return data.registry.property_tax_data(state, self.year if year is None else year)
+
+    @staticmethod
+    def _groups(*keys):
+        """ Yields (key, rows) for each distinct combination of the key columns. `rows`
+        is a slice over the whole table when every household shares one key.
+        """
+        codes = np.zeros(len(keys[0]), dtype=int)
+        for key in keys:
+            distinct, inverse = np.unique(key, return_inverse=True)
+            codes = codes * len(distinct) + inverse.reshape(-1)
+        distinct_codes = np.unique(codes)
+        if len(distinct_codes) == 1:
+            yield tuple(key[0].item() for key in keys), slice(None)
+            return
+        for code in distinct_codes:
+            rows = np.flatnonzero(codes == code)
+            yield tuple(key[rows[0]].item() for key in keys), rows
+
+    def calculate(self, table, years=None):
+        """ Returns `HouseholdTaxes`, one array entry per household in `table`. `years`
+        gives the tax year for each household; by default every one uses `year`.
+        """
+        years = np.broadcast_to(np.asarray(self.year if years is None else years, dtype=int), (len(table),))
+        gross_income = table.gross_income
+        retirement = table.retirement_contribution
+        healthcare = table.healthcare_contribution
+        itemized = table.itemized_deductions
+
+        results = {name: np.zeros(len(table)) for name in _GRAPH_TARGETS}
+        for (year, state, filing_status), rows in self._groups(years, table.states, table.filing_statuses):
+            sources = {
+                'gross_income': gross_income[rows],
+                'member_gross_incomes': table.gross_incomes[rows],
+                'member_count': table.member_counts[rows],
+                'retirement_contribution': retirement[rows],
+                'healthcare_contribution': healthcare[rows],
+                'itemized_deductions': itemized[rows],
+                'student_loan_interest': table.student_loan_interest[rows],
+                'home_value': table.home_values[rows],
+                'federal_tax_data': self.get_federal_tax_data(filing_status, year),
+                'state_tax_data': self.get_state_tax_data(state, filing_status, year),
+                'property_tax_data': self.get_property_tax_data(state, year),
+            }
+            for name, values in tax_graph.tax_graph.evaluate(sources, _GRAPH_TARGETS).items():
+                results[name][rows] = values
+        return HouseholdTaxes(*(results[name] for name in _GRAPH_TARGETS))
@@ -0,0 +1,105 @@
+import numpy as np
+
+import household_taxes
+
+
+class IncomeSolver(object):
+    """ Finds the income that gives a target net income.
+
+    Each household's member incomes are multiplied by a common scale, and the
+    solver finds the scale whose net income (gross less retirement, healthcare and
+    all taxes) meets the target. Net income is piecewise linear and increasing in
+    the scale, so the solver alternates linear interpolation with bisection over
+    every household at once. Interpolation is exact as soon as both ends of a
+    household's interval lie on the same linear piece, which takes only a few rounds.
+    """
+    def __init__(self, year, engine=None, tolerance=1e-6, max_iterations=200):
+        super().__init__()
+        self.year = year
+        self._engine = engine
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = household_taxes.HouseholdTaxEngine(self.year)
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+
+    def net_incomes(self, table, scales, rows=slice(None)):
+        """ Net income of the households in `rows` with incomes multiplied by `scales` """
+        gross_incomes = table.gross_incomes[rows] * np.asarray(scales, dtype=float)[:, np.newaxis]
+        return self.engine.calculate(table.with_gross_incomes(gross_incomes, rows)).net_income
+
+    def income_scales(self, table, target_net_incomes):
+        """ Returns the income scale reaching each household's target net income.
+        The scale is 0 when even no income meets the target, and nan when no
+        scale can (the household has no income to scale).
+        """
+        household_count = len(table)
+        targets = np.broadcast_to(np.asarray(target_net_incomes, dtype=float), (household_count,))
+        scales = np.full(household_count, np.nan)
+
+        lower = np.zeros(household_count)
+        lower_net = self.net_incomes(table, lower)
+        upper = np.ones(household_count)
+        upper_net = self.net_incomes(table, upper)
+
+        has_income = table.gross_income > 0
+        scales[has_income & (targets <= lower_net)] = 0.0
+        rows = np.flatnonzero(has_income & (targets > lower_net))
+
+        # widen the upper bound until it reaches the target
+        while len(rows):
+            short = rows[upper_net[rows] < targets[rows]]
+            if not len(short):
+                break
+            lower[short], lower_net[short] = upper[short], upper_net[short]
+            upper[short] *= 2
+            upper_net[short] = self.net_incomes(table, upper[short], short)
+            overflow = short[~np.isfinite(upper[short]) | (upper[short] > 1e12)]
+            rows = np.setdiff1d(rows, overflow)
+
+        for iteration in range(self.max_iterations):
+            if not len(rows):
+                break
+            low, high = lower[rows], upper[rows]
+            low_net, high_net = lower_net[rows], upper_net[rows]
+            midpoint = (low + high) / 2
+            if iteration % 2 == 0:
+                span = np.where(high_net > low_net, high_net - low_net, 1.0)
+                candidate = low + (targets[rows] - low_net) * (high - low) / span
+                candidate = np.where((candidate > low) & (candidate < high), candidate, midpoint)
+            else:
+                candidate = midpoint
+            candidate_net = self.net_incomes(table, candidate, rows)
+
+            solved = (np.abs(candidate_net - targets[rows]) <= self.tolerance) | (high - low <= 1e-15 * high)
+            scales[rows[solved]] = candidate[solved]
+
+            below = candidate_net < targets[rows]
+            lower[rows[below]], lower_net[rows[below]] = candidate[below], candidate_net[below]
+            upper[rows[~below]], upper_net[rows[~below]] = candidate[~below], candidate_net[~below]
+            rows = rows[~solved]
+
+        if len(rows):
+            # out of iterations: best interpolated estimate
+            span = np.where(upper_net[rows] > lower_net[rows], upper_net[rows] - lower_net[rows], 1.0)
+            scales[rows] = lower[rows] + (targets[rows] - lower_net[rows]) * (upper[rows] - lower[rows]) / span
+        return scales
+
+    def gross_incomes(self, table, target_net_incomes):
+        """ Returns the total household gross income reaching each target net income """
+        return table.gross_income * self.income_scales(table, target_net_incomes)
+
+    def family_income_scale(self, family, target_net_income):
+        """ Returns the scale on every member's income that gives `family` the target net income """
+        table = household_taxes.HouseholdTable.from_families([family], self.year)
+        return float(self.income_scales(table, [target_net_income])[0])
+
+    def family_gross_income(self, family, target_net_income):
+        return family.gross_income(self.year) * self.family_income_scale(family, target_net_income)
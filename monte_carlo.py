@@ -0,0 +1,246 @@
+from collections import OrderedDict
+
+import numpy as np
+
+import amortized_loan
+import data
+import household_taxes
+from month import Month
+
+
+# metrics with (paths, years) arrays in `MonteCarloResults`
+PATH_METRICS = ('gross_income',
+                'mortgage_interest',
+                'total_taxes',
+                'net_income',
+                'pmi',
+                'home_value',
+                'mortgage_balance',
+                'equity')
+
+# metrics summarized by `MonteCarloResults.bands`
+BAND_METRICS = ('net_income', 'total_taxes', 'equity', 'pmi')
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+class MonteCarloModel(object):
+    """ Draws random paths of a family's finances over a range of years.
+
+    Each path draws a yearly household income growth rate, the mortgage apr at
+    purchase, and a yearly home appreciation rate, all normally distributed.
+    The family's first year is the template: member incomes grow from their
+    first-year values along each path, while contribution rates, healthcare
+    contributions, other deductions and student loan interest are read from the
+    family as usual. The family's home supplies the purchase terms; its own apr
+    is the mean of the drawn aprs. A home with a `rate_path` keeps the path's
+    resets on every path, shifted to start at the drawn apr, and its minimum
+    payment is recast at each reset as in `amortized_loan.AmortizedLoan`.
+    Like `five_year_plan.PlanProjection`, the home counts as owned in every year:
+    before the purchase it is held at its purchase price with the whole financed
+    amount outstanding, and `tax_years` defaults the same way.
+
+    Paths never become `people.Family` objects: every path's mortgage is one row
+    of a `amortized_loan.LoanBatch`, and every (path, year) is one row of a
+    single `household_taxes.HouseholdTable`. The same `seed` gives the same paths.
+    """
+    # drawn aprs below this are raised to it
+    minimum_apr = 0.001
+
+    def __init__(self,
+                 family,
+                 years,
+                 path_count=1000,
+                 seed=None,
+                 income_growth_mean=0.03,
+                 income_growth_sd=0.02,
+                 apr_sd=0.005,
+                 appreciation_mean=0.03,
+                 appreciation_sd=0.05,
+                 tax_years=None,
+                 engine=None):
+        super().__init__()
+        self.family = family
+        self.years = np.asarray(years, dtype=int)
+        self.path_count = path_count
+        self.seed = seed
+        self.income_growth_mean = income_growth_mean
+        self.income_growth_sd = income_growth_sd
+        self.apr_sd = apr_sd
+        self.appreciation_mean = appreciation_mean
+        self.appreciation_sd = appreciation_sd
+        if tax_years is None:
+            self.tax_years = data.registry.latest_tax_years(self.years)
+        else:
+            self.tax_years = np.broadcast_to(np.asarray(tax_years, dtype=int), self.years.shape)
+        self._engine = engine
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = household_taxes.HouseholdTaxEngine(None)
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+
+    def draw(self):
+        """ Returns (income_growth, aprs, appreciation): (paths, years - 1), (paths,)
+        and (paths, years) arrays drawn from a generator seeded with `seed`
+        """
+        rng = np.random.default_rng(self.seed)
+        year_count = len(self.years)
+        income_growth = rng.normal(self.income_growth_mean, self.income_growth_sd, (self.path_count, max(year_count - 1, 0)))
+        apr_mean = 0.0
+        home_ = self.family.home
+        if home_ is not None:
+            apr_mean = home_.apr if home_.rate_path is None else home_.rate_path.apr_at(home_.purchase_month)
+        aprs = np.maximum(rng.normal(apr_mean, self.apr_sd, self.path_count), self.minimum_apr)
+        appreciation = rng.normal(self.appreciation_mean, self.appreciation_sd, (self.path_count, year_count))
+        return income_growth, aprs, appreciation
+
+    def run(self):
+        """ Returns `MonteCarloResults` for `path_count` paths """
+        income_growth, aprs, appreciation = self.draw()
+        path_count, year_count = self.path_count, len(self.years)
+        shape = (path_count, year_count)
+
+        base = household_taxes.HouseholdTable.from_families([self.family] * year_count, self.years)
+        growth = np.cumprod(np.column_stack([np.ones(path_count), 1 + income_growth]), axis=1)
+        gross_incomes = base.gross_incomes[0] * growth[:, :, np.newaxis]
+
+        mortgage = self.mortgage_paths(aprs, appreciation)
+        rows = np.tile(np.arange(year_count), path_count)
+        table = base.replace(rows,
+                             gross_incomes=gross_incomes.reshape(path_count * year_count, -1),
+                             mortgage_interest=mortgage['mortgage_interest'].ravel(),
+                             home_values=mortgage['assessed_value'].ravel())
+        taxes = self.engine.calculate(table, np.tile(self.tax_years, path_count))
+
+        paths = OrderedDict()
+        paths['gross_income'] = table.gross_income.reshape(shape)
+        paths['mortgage_interest'] = mortgage['mortgage_interest']
+        paths['total_taxes'] = taxes.total.reshape(shape)
+        paths['net_income'] = taxes.net_income.reshape(shape)
+        paths['pmi'] = mortgage['pmi']
+        paths['home_value'] = mortgage['home_value']
+        paths['mortgage_balance'] = mortgage['mortgage_balance']
+        paths['equity'] = mortgage['home_value'] - mortgage['mortgage_balance']
+        return MonteCarloResults(self.years, paths)
+
+    def mortgage_paths(self, aprs, appreciation):
+        """ Returns a dict of (paths, years) arrays: the mortgage interest and PMI paid
+        each year, the home's value at the start of the year (`assessed_value`, for
+        property tax) and at its end (`home_value`), and the year-end balance.
+        """
+        shape = (self.path_count, len(self.years))
+        home_ = self.family.home
+        if home_ is None:
+            return dict((name, np.zeros(shape)) for name in
+                        ('mortgage_interest', 'pmi', 'assessed_value', 'home_value', 'mortgage_balance'))
+
+        purchase_month = home_.purchase_month
+        # appreciation compounds from the purchase year on
+        yearly_growth = np.where(self.years >= purchase_month.year, 1 + appreciation, 1.0)
+        home_value = home_.purchase_amount * np.cumprod(yearly_growth, axis=1)
+        assessed_value = home_value / yearly_growth
+
+        financed_amounts = np.full(self.path_count, home_.purchase_amount * (1 - home_.down_payment_percent))
+        schedule = self.amortize(financed_amounts, aprs)
+
+        # PMI is charged on payments made while the balance is above the home's threshold
+        previous_balances = np.column_stack([financed_amounts, schedule.new_balances[:, :-1]])
+        made = np.arange(schedule.new_balances.shape[1]) < schedule.payment_counts[:, np.newaxis]
+        charged = made & (previous_balances > home_.pmi.threshold_balance)
+        pmi_amounts = np.where(charged, home_.pmi.standard_monthly_pmi_payment, 0.0)
+
+        year_end_columns = np.array([Month(year, 12).ordinal for year in self.years.tolist()]) - purchase_month.ordinal
+        column_count = schedule.new_balances.shape[1]
+        year_end_balances = schedule.new_balances[:, np.clip(year_end_columns, 0, max(column_count - 1, 0))]
+        # nothing is paid before the purchase, and nothing is owed after the last column
+        mortgage_balance = np.where(year_end_columns < 0, financed_amounts[:, np.newaxis],
+                                    np.where(year_end_columns < column_count, year_end_balances, 0.0))
+
+        return {
+            'mortgage_interest': self._by_year(schedule, schedule.interest_amounts),
+            'pmi': self._by_year(schedule, pmi_amounts),
+            'assessed_value': assessed_value,
+            'home_value': home_value,
+            'mortgage_balance': mortgage_balance,
+        }
+
+    def amortize(self, financed_amounts, aprs):
+        """ Returns a `amortized_loan.BatchSchedule` of each path's mortgage, paid off
+        with minimum payments from the purchase month
+        """
+        home_ = self.family.home
+        if home_.rate_path is None:
+            batch = amortized_loan.LoanBatch(financed_amounts,
+                                             home_.term_in_years,
+                                             aprs,
+                                             home_.purchase_month,
+                                             amortized_loan.CompoundType.MONTHLY)
+            return batch.calculate_amortization_table()
+
+        term_in_months = int(round(home_.term_in_years * 12))
+        path_aprs = home_.rate_path.aprs_for(home_.purchase_month, term_in_months)
+        shifted_aprs = path_aprs + (aprs - path_aprs[0])[:, np.newaxis]
+        rates = np.maximum(shifted_aprs, self.minimum_apr) / 12
+
+        # one fixed payment per stretch between resets, recast to pay off the balance by
+        # the end of the term if the apr stayed as it is
+        reset_columns = np.flatnonzero(np.diff(path_aprs, prepend=np.nan)).tolist() + [term_in_months]
+        balances = financed_amounts
+        columns = {'payment_amounts': [], 'interest_amounts': [], 'principle_amounts': [], 'new_balances': []}
+        payment_counts = np.zeros(self.path_count, dtype=int)
+        for start, end in zip(reset_columns[:-1], reset_columns[1:]):
+            current_rates = np.repeat(rates[:, start:start + 1], term_in_months - start, axis=1)
+            payment_amounts = amortized_loan.AmortizationEngine.payments_to_pay_off(
+                balances, current_rates, [term_in_months - start])[:, 0]
+            interest, principle, new_balances, counts = amortized_loan.AmortizationEngine.amortize_rows(
+                balances, payment_amounts, rates[:, start:end])
+            made = np.arange(end - start) < counts[:, np.newaxis]
+            columns['payment_amounts'].append(np.where(made, payment_amounts[:, np.newaxis], 0.0))
+            columns['interest_amounts'].append(interest)
+            columns['principle_amounts'].append(principle)
+            columns['new_balances'].append(new_balances)
+            payment_counts += counts
+            balances = new_balances[:, -1]
+
+        return amortized_loan.BatchSchedule(home_.purchase_month,
+                                            payment_counts=payment_counts,
+                                            **dict((name, np.concatenate(values, axis=1))
+                                                   for name, values in columns.items()))
+
+    def _by_year(self, schedule, monthly_amounts):
+        """ Sums (paths, schedule columns) amounts into (paths, years), 0 for years outside the schedule """
+        totals = np.zeros((self.path_count, len(self.years)))
+        if not monthly_amounts.shape[1]:
+            return totals
+        schedule_years, year_starts = schedule.payment_months.year_starts()
+        yearly = np.add.reduceat(monthly_amounts, year_starts, axis=1)
+        columns = self.years - schedule_years[0]
+        in_schedule = (columns >= 0) & (columns < len(schedule_years))
+        totals[:, in_schedule] = yearly[:, columns[in_schedule]]
+        return totals
+
+class MonteCarloResults(object):
+    """ Per-path outcomes: a (paths, years) array for each name in `PATH_METRICS` """
+    def __init__(self, years, paths):
+        super().__init__()
+        self.years = years
+        self.paths = paths
+
+    def __len__(self):
+        return len(next(iter(self.paths.values())))
+
+    def __getitem__(self, metric):
+        return self.paths[metric]
+
+    def percentiles(self, metric, percentiles=DEFAULT_PERCENTILES):
+        """ Returns a (percentiles, years) array of `metric` across paths """
+        return np.percentile(self.paths[metric], percentiles, axis=0)
+
+    def bands(self, percentiles=DEFAULT_PERCENTILES, metrics=BAND_METRICS):
+        """ Returns an OrderedDict of metric -> (percentiles, years) band array """
+        return OrderedDict((metric, self.percentiles(metric, percentiles)) for metric in metrics)
@@ -1,30 +1,59 @@
-from datetime import datetime, date
-from dateutil.relativedelta import relativedelta
+from datetime import datetime
+
+import numpy as np
 
 import enum
 
 DatePart = enum.Enum(('YEAR', 'MONTH', 'DAY'))
 
+# Days before the first of each month in a common year
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+def _is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def _first_day_ordinal(ordinal):
+    """ `date.toordinal()` of the first day of the month with the given month ordinal """
+    year, month_index = divmod(ordinal, 12)
+    previous_year = year - 1
+    days = 365 * previous_year + previous_year // 4 - previous_year // 100 + previous_year // 400
+    days += _DAYS_BEFORE_MONTH[month_index]
+    if month_index > 1 and _is_leap_year(year):
+        days += 1
+    return days + 1
+
 class Month(object):
+    """ A calendar month, stored as a single month ordinal (year * 12 + month - 1) """
+    __slots__ = ('_ordinal',)
+
     def __init__(self, year, month):
         super().__init__()
-        self._date = date(year, month, 1)
+        if not 1 <= month <= 12:
+            raise ValueError("month must be in 1..12")
+        self._ordinal = year * 12 + month - 1
 
     @classmethod
     def fromdate(cls, date_):
         return cls(date_.year, date_.month)
 
+    @classmethod
+    def fromordinal(cls, ordinal):
+        """ Inverse of `Month.ordinal` """
+        month_ = object.__new__(cls)
+        month_._ordinal = ordinal
+        return month_
+
     def __repr__(self):
-        return self.__class__.__name__ + '(' + repr(self._date.year) + ', ' + repr(self._date.month) + ')'
+        return self.__class__.__name__ + '(' + repr(self.year) + ', ' + repr(self.month) + ')'
     def __str__(self):
-        return self._date.strftime('%Y-%b')
+        return self.as_datetime().strftime('%Y-%b')
 
     def __hash__(self):
-        return self._date.__hash__()
- 
+        return hash(self._ordinal)
+
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._ordinal == other._ordinal
         return False
 
     def __ne__(self, other):
@@ -32,42 +61,157 @@ class Month(object):
 
     def __gt__(self, other):
         if type(other) is type(self):
-            return self._date > other._date
+            return self._ordinal > other._ordinal
         return False
 
     def __lt__(self, other):
         if type(other) is type(self):
-            return self._date < other._date
+            return self._ordinal < other._ordinal
         return False
 
     def __ge__(self, other):
-        return self.__gt__(other) or self.__eq__(other)
+        if type(other) is type(self):
+            return self._ordinal >= other._ordinal
+        return False
 
     def __le__(self, other):
-        return self.__lt__(other) or self.__eq__(other)
+        if type(other) is type(self):
+            return self._ordinal <= other._ordinal
+        return False
 
     @property
     def year(self):
-        return self._date.year
+        return self._ordinal // 12
 
     @property
     def month(self):
-        return self._date.month
+        return self._ordinal % 12 + 1
+
+    @property
+    def ordinal(self):
+        """ Number of months since year 0; consecutive months have consecutive ordinals """
+        return self._ordinal
 
     def as_datetime(self):
-        return datetime.combine(self._date, datetime.min.time())
+        return datetime(self.year, self.month, 1)
+
+    def as_datetime64(self):
+        return np.datetime64(self._ordinal - _DATETIME64_EPOCH_ORDINAL, 'M')
+
+    @classmethod
+    def fromdatetime64(cls, value):
+        return cls.fromordinal(int(value.astype('datetime64[M]').astype(int)) + _DATETIME64_EPOCH_ORDINAL)
 
     def monthadd(self, month_count):
-        month_delta = relativedelta(months=month_count)
-        return Month.fromdate((self.as_datetime() + month_delta).date())
+        return Month.fromordinal(self._ordinal + month_count)
 
     def datediff(self, date_part, other):
-        diff = relativedelta(other.as_datetime(), self.as_datetime())
+        months = other._ordinal - self._ordinal
         if date_part == DatePart.DAY:
-            return (other._date - self._date).days
+            return _first_day_ordinal(other._ordinal) - _first_day_ordinal(self._ordinal)
         elif date_part == DatePart.MONTH:
-            return diff.months + (diff.years * 12)
+            return months
         elif date_part == DatePart.YEAR:
-            return diff.years
+            # whole years, truncated toward zero
+            return months // 12 if months >= 0 else -(-months // 12)
         else:
-            return None
\ No newline at end of file
+            return None
+
+
+# numpy datetime64[M] counts months from 1970-01
+_DATETIME64_EPOCH_ORDINAL = 1970 * 12
+
+class MonthArray(object):
+    """ An array of months backed by numpy datetime64[M], for vectorized work over a
+    time axis. Indexing with an integer gives a `Month`, with a slice another array.
+    """
+    def __init__(self, values):
+        super().__init__()
+        self.values = np.asarray(values, dtype='datetime64[M]')
+
+    @classmethod
+    def from_months(cls, months):
+        return cls.from_ordinals([m.ordinal for m in months])
+
+    @classmethod
+    def from_ordinals(cls, ordinals):
+        return cls(np.asarray(ordinals, dtype=int) - _DATETIME64_EPOCH_ORDINAL)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for ordinal in self.ordinals:
+            yield Month.fromordinal(int(ordinal))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MonthArray(self.values[index])
+        return Month.fromdatetime64(self.values[index])
+
+    def __eq__(self, other):
+        if isinstance(other, MonthArray):
+            return np.array_equal(self.values, other.values)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return "{cls}({values})".format(cls=self.__class__.__name__, values=self.values)
+
+    @property
+    def ordinals(self):
+        return self.values.astype(int) + _DATETIME64_EPOCH_ORDINAL
+
+    @property
+    def years(self):
+        return self.ordinals // 12
+
+    @property
+    def first_days(self):
+        """ datetime64[D] of the first day of each month """
+        return self.values.astype('datetime64[D]')
+
+    def to_months(self):
+        return list(self)
+
+    def day_gaps(self, previous_month=None):
+        """ Days from the first of each month to the first of the next one in the array.
+        The first gap is counted from `previous_month`, or is 0 if it is None.
+        """
+        first_days = self.first_days
+        if not len(first_days):
+            return np.zeros(0, dtype=int)
+        if previous_month is None:
+            previous_day = first_days[0]
+        else:
+            previous_day = previous_month.as_datetime64().astype('datetime64[D]')
+        return np.diff(first_days, prepend=previous_day).astype(int)
+
+    def year_starts(self):
+        """ Returns (years, starts): each distinct year, in order of first appearance,
+        and the index where its run of months starts. Suits `np.add.reduceat` when
+        the months are in order.
+        """
+        years = self.years
+        starts = np.flatnonzero(np.diff(years, prepend=years[:1] - 1)) if len(years) else np.zeros(0, dtype=int)
+        return years[starts], starts
+
+    def year_groups(self):
+        """ Returns [(year, slice)], one per run of months in the same year """
+        years, starts = self.year_starts()
+        stops = np.append(starts[1:], len(self))
+        return [(int(year), slice(int(start), int(stop))) for year, start, stop in zip(years, starts, stops)]
+
+class MonthRange(MonthArray):
+    """ `month_count` consecutive months starting at `first_month` """
+    def __init__(self, first_month, month_count):
+        start = first_month.as_datetime64()
+        super().__init__(np.arange(start, start + month_count))
+        self.first_month = first_month
+
+    @classmethod
+    def between(cls, first_month, last_month):
+        """ Months from `first_month` through `last_month`, inclusive """
+        return cls(first_month, max(last_month.ordinal - first_month.ordinal + 1, 0))
@@ -0,0 +1,281 @@
+from collections import namedtuple
+
+import numpy as np
+
+import month
+import versions
+
+
+PaymentTotals = namedtuple('PaymentTotals', ['interest_amount', 'principle_amount', 'payment_amount', 'pmi_amount'])
+
+
+class PaymentView(object):
+    """ Read-only view of one row of a `PaymentSchedule`, with the same attributes
+    as `amortized_loan.Payment`. It holds no data of its own.
+    """
+    __slots__ = ('schedule', 'index')
+
+    def __init__(self, schedule, index):
+        self.schedule = schedule
+        self.index = index
+
+    @property
+    def month(self):
+        return month.Month.fromordinal(int(self.schedule.month_ordinals[self.index]))
+
+    @property
+    def payment_amount(self):
+        return self.schedule.payment_amounts[self.index]
+
+    @property
+    def previous_balance(self):
+        return self.schedule.previous_balances[self.index]
+
+    @property
+    def interest_amount(self):
+        return self.schedule.interest_amounts[self.index]
+
+    @property
+    def principle_amount(self):
+        return self.schedule.principle_amounts[self.index]
+
+    @property
+    def new_balance(self):
+        return self.schedule.new_balances[self.index]
+
+    @property
+    def pmi_amount(self):
+        return self.schedule.pmi_amounts[self.index]
+
+    @property
+    def mortgage_payment_amount(self):
+        return self.payment_amount
+
+    @property
+    def total_payment_amount(self):
+        return self.payment_amount + self.pmi_amount
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        return "Payment {month} {amt:>8.2f} ({princ:>8.2f} P, {int:>8.2f} I, {pmi:>8.2f} PMI {rem:>10.2f} R)".format(
+            month=self.month,
+            amt=self.total_payment_amount,
+            princ=self.principle_amount,
+            int=self.interest_amount,
+            pmi=self.pmi_amount,
+            rem=self.new_balance
+        )
+
+
+class PaymentSchedule(object):
+    """ Struct-of-arrays table of loan payments, one row per payment.
+
+    Each column is a numpy array; indexing or iterating yields `PaymentView`s for
+    code that wants `Payment`-like objects.
+    """
+    columns = ('month_ordinals',
+               'payment_amounts',
+               'previous_balances',
+               'interest_amounts',
+               'principle_amounts',
+               'new_balances',
+               'pmi_amounts')
+
+    def __init__(self, capacity=0):
+        super().__init__()
+        self._length = 0
+        self._month_ordinals = np.zeros(capacity, dtype=int)
+        self._payment_amounts = np.zeros(capacity)
+        self._previous_balances = np.zeros(capacity)
+        self._interest_amounts = np.zeros(capacity)
+        self._principle_amounts = np.zeros(capacity)
+        self._new_balances = np.zeros(capacity)
+        self._pmi_amounts = np.zeros(capacity)
+
+        # year -> [interest, principle, payment, pmi] totals, kept in step with the rows
+        self._yearly_totals = {}
+        self._totals = [0.0, 0.0, 0.0, 0.0]
+
+        # version stamps, bumped whenever rows in a year are added or changed
+        self._created_version = versions.next_version()
+        self._yearly_versions = {}
+
+    @classmethod
+    def from_arrays(cls, month_ordinals, payment_amounts, previous_balances, interest_amounts,
+                    principle_amounts, new_balances, pmi_amounts=None):
+        schedule = cls()
+        schedule.extend(month_ordinals, payment_amounts, previous_balances, interest_amounts,
+                        principle_amounts, new_balances, pmi_amounts)
+        return schedule
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield PaymentView(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PaymentSchedule.from_arrays(*(getattr(self, c)[index] for c in self.columns))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("payment index out of range")
+        return PaymentView(self, index)
+
+    def __repr__(self):
+        return "{cls}({count} payments)".format(cls=self.__class__.__name__, count=self._length)
+
+    # Columns, trimmed to the rows in use
+    @property
+    def month_ordinals(self):
+        return self._month_ordinals[:self._length]
+
+    @property
+    def payment_amounts(self):
+        return self._payment_amounts[:self._length]
+
+    @property
+    def previous_balances(self):
+        return self._previous_balances[:self._length]
+
+    @property
+    def interest_amounts(self):
+        return self._interest_amounts[:self._length]
+
+    @property
+    def principle_amounts(self):
+        return self._principle_amounts[:self._length]
+
+    @property
+    def new_balances(self):
+        return self._new_balances[:self._length]
+
+    @property
+    def pmi_amounts(self):
+        return self._pmi_amounts[:self._length]
+
+    @property
+    def years(self):
+        return self.month_ordinals // 12
+
+    @property
+    def months(self):
+        return [month.Month.fromordinal(int(o)) for o in self.month_ordinals]
+
+    @property
+    def month_array(self):
+        """ The payment months as a `month.MonthArray` """
+        return month.MonthArray.from_ordinals(self.month_ordinals)
+
+    def totals(self, year=None):
+        """ Returns the `PaymentTotals` for the given year, or for all payments
+        if `year` is None, without scanning the rows.
+        """
+        if year is None:
+            return PaymentTotals(*self._totals)
+        return PaymentTotals(*self._yearly_totals.get(year, (0.0, 0.0, 0.0, 0.0)))
+
+    def year_end_balances(self, years):
+        """ Balance after the last payment made in or before each of `years`. Years
+        before the first payment get the balance that payment started from; with no
+        payments at all the balance is unknown (nan).
+        """
+        years = np.asarray(years, dtype=int)
+        if not self._length:
+            return np.full(years.shape, np.nan)
+        index = np.searchsorted(self.month_ordinals, (years + 1) * 12) - 1
+        return np.where(index >= 0, self.new_balances[np.maximum(index, 0)], self.previous_balances[0])
+
+    def version(self, year=None):
+        """ Stamp that changes whenever the rows for `year`, or any rows if `year` is None, change """
+        if year is None:
+            return max(self._yearly_versions.values(), default=self._created_version)
+        return self._yearly_versions.get(year, self._created_version)
+
+    def _add_to_totals(self, year, interest_amount=0, principle_amount=0, payment_amount=0, pmi_amount=0):
+        self._yearly_versions[year] = versions.next_version()
+        year_totals = self._yearly_totals.setdefault(year, [0.0, 0.0, 0.0, 0.0])
+        for totals in (year_totals, self._totals):
+            totals[0] += interest_amount
+            totals[1] += principle_amount
+            totals[2] += payment_amount
+            totals[3] += pmi_amount
+
+    def _add_rows_to_totals(self, rows, columns):
+        """ Adds the sums of `columns` over `rows` to the totals; `columns` maps
+        `_add_to_totals` argument names to arrays aligned with `rows`.
+        """
+        years, year_index = np.unique(self._month_ordinals[rows] // 12, return_inverse=True)
+        sums = dict((name, np.bincount(year_index, weights=column, minlength=len(years)))
+                    for name, column in columns.items())
+        for i, year in enumerate(years):
+            self._add_to_totals(int(year), **dict((name, total[i]) for name, total in sums.items()))
+
+    def _reserve(self, row_count):
+        capacity = len(self._month_ordinals)
+        if row_count <= capacity:
+            return
+        capacity = max(row_count, 2 * capacity)
+        for column in self.columns:
+            old = getattr(self, '_' + column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._length] = old[:self._length]
+            setattr(self, '_' + column, new)
+
+    def append(self, payment_month, payment_amount, previous_balance, interest_amount,
+               principle_amount, new_balance, pmi_amount=0):
+        self._reserve(self._length + 1)
+        row = self._length
+        self._month_ordinals[row] = payment_month.ordinal
+        self._payment_amounts[row] = payment_amount
+        self._previous_balances[row] = previous_balance
+        self._interest_amounts[row] = interest_amount
+        self._principle_amounts[row] = principle_amount
+        self._new_balances[row] = new_balance
+        self._pmi_amounts[row] = pmi_amount
+        self._length += 1
+        self._add_to_totals(payment_month.year, interest_amount, principle_amount, payment_amount, pmi_amount)
+        return PaymentView(self, row)
+
+    def extend(self, month_ordinals, payment_amounts, previous_balances, interest_amounts,
+               principle_amounts, new_balances, pmi_amounts=None):
+        count = len(month_ordinals)
+        self._reserve(self._length + count)
+        rows = slice(self._length, self._length + count)
+        self._month_ordinals[rows] = month_ordinals
+        self._payment_amounts[rows] = payment_amounts
+        self._previous_balances[rows] = previous_balances
+        self._interest_amounts[rows] = interest_amounts
+        self._principle_amounts[rows] = principle_amounts
+        self._new_balances[rows] = new_balances
+        self._pmi_amounts[rows] = 0 if pmi_amounts is None else pmi_amounts
+        self._length += count
+
+        if count:
+            self._add_rows_to_totals(rows, {'interest_amount': self._interest_amounts[rows],
+                                            'principle_amount': self._principle_amounts[rows],
+                                            'payment_amount': self._payment_amounts[rows],
+                                            'pmi_amount': self._pmi_amounts[rows]})
+
+    def extend_schedule(self, other):
+        self.extend(*(getattr(other, c) for c in self.columns))
+
+    def set_pmi_amount(self, index, pmi_amount):
+        self.set_pmi_amounts(slice(index, index + 1 or None), pmi_amount)
+
+    def set_pmi_amounts(self, rows, pmi_amounts):
+        """ Sets the PMI column for `rows` (a slice), keeping the totals in step """
+        rows = slice(*rows.indices(self._length))
+        pmi_amounts = np.broadcast_to(pmi_amounts, self._pmi_amounts[rows].shape)
+        if not len(pmi_amounts):
+            return
+        change = pmi_amounts - self._pmi_amounts[rows]
+        self._pmi_amounts[rows] = pmi_amounts
+        self._add_rows_to_totals(rows, {'pmi_amount': change})
@@ -1,3 +1,4 @@
+import versions
 
 class Deduction(object):
     def __init__(self, name, amount):
@@ -13,6 +14,18 @@ class Person(object):
         self._healthcare_contribution = {}
         self._retirement_contribution_rate = {}
 
+        # (field, year) -> version stamp of the last change
+        self._versions = {}
+
+    def version(self, field, year):
+        """ Stamp of the last change to `field` ('gross_income', 'healthcare_contribution'
+        or 'retirement_contribution_rate') for `year`; 0 if it was never set
+        """
+        return self._versions.get((field, year), 0)
+
+    def _touch(self, field, year):
+        self._versions[(field, year)] = versions.next_version()
+
     def gross_income(self, year):
         if year in self._gross_income:
             return float(self._gross_income[year])
@@ -21,6 +34,7 @@ class Person(object):
 
     def set_gross_income(self, year, gross_income):
         self._gross_income[year] = gross_income
+        self._touch('gross_income', year)
 
     def healthcare_contribution(self, year):
         if year in self._healthcare_contribution:
@@ -30,9 +44,11 @@ class Person(object):
     
     def set_healthcare_contribution(self, year, healthcare_contribution):
         self._healthcare_contribution[year] = healthcare_contribution
+        self._touch('healthcare_contribution', year)
 
     def set_retirement_contribution_rate(self, year, retirement_contribution_rate):
         self._retirement_contribution_rate[year]  = retirement_contribution_rate
+        self._touch('retirement_contribution_rate', year)
 
     def retirement_contribution_rate(self, year):
         if year in self._retirement_contribution_rate:
@@ -48,8 +64,25 @@ class Person(object):
 
 class Family(object):
     """docstring for Family"""
+
+    # input fields read by each per-year quantity, for change tracking
+    value_inputs = {
+        'gross_income': ('members', 'gross_income'),
+        'healthcare_contribution': ('members', 'healthcare_contribution'),
+        'retirement_contribution': ('members', 'gross_income', 'retirement_contribution_rate'),
+        'student_loan_interest_payments': ('student_loan',),
+        'mortgage_interest_payments': ('home',),
+        'itemized_deductions': ('home', 'deductions'),
+    }
+    member_fields = ('gross_income', 'healthcare_contribution', 'retirement_contribution_rate')
+    loan_fields = ('home', 'student_loan')
+
     def __init__(self, members, filing_status, state_of_residence=None):
         super(Family, self).__init__()
+        # (field, year) -> version stamp of the last change; year is None for
+        # fields that are not per-year
+        self._versions = {}
+
         self.members = members
         self.filing_status = filing_status
         self.state_of_residence = state_of_residence
@@ -58,6 +91,53 @@ class Family(object):
         self.home = None
         self.student_loan = None
 
+    @property
+    def members(self):
+        return self._members
+
+    @members.setter
+    def members(self, value):
+        # a tuple, so members change only through this setter, which is tracked
+        self._members = tuple(value)
+        self._touch('members')
+
+    @property
+    def home(self):
+        return self._home
+
+    @home.setter
+    def home(self, value):
+        self._home = value
+        self._touch('home')
+
+    @property
+    def student_loan(self):
+        return self._student_loan
+
+    @student_loan.setter
+    def student_loan(self, value):
+        self._student_loan = value
+        self._touch('student_loan')
+
+    def _touch(self, field, year=None):
+        self._versions[(field, year)] = versions.next_version()
+
+    def version(self, field, year):
+        """ Stamp that changes whenever `field` changes in a way that matters for `year`.
+        `field` is one of `member_fields`, `loan_fields`, 'members' or 'deductions'.
+        """
+        if field in self.member_fields:
+            return max((p.version(field, year) for p in self.members), default=0)
+        if field in self.loan_fields:
+            version = self._versions.get((field, None), 0)
+            loan = getattr(self, field)
+            if loan is not None and hasattr(loan, 'version'):
+                version = max(version, loan.version(year))
+            return version
+        if field == 'members':
+            return self._versions.get((field, None), 0)
+        return self._versions.get((field, year), 0)
+
     def __str__(self):
         return "Family({})".format(
             ", ".join(str(p) for p in self.members)
@@ -91,6 +171,7 @@ class Family(object):
             self._additional_deductions[year].append(deduction)
         else:
             self._additional_deductions[year] = [deduction]
+        self._touch('deductions', year)
 
     def _additional_deductions_for_year(self, year):
         deductions = 0
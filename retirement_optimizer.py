@@ -0,0 +1,162 @@
+from collections import namedtuple
+
+import numpy as np
+
+import household_taxes
+
+
+Breakpoint = namedtuple('Breakpoint', ['rate', 'kind', 'level'])
+Breakpoint.__doc__ = """ Contribution rate at which `kind` of threshold is crossed at income `level` """
+
+FEDERAL_BRACKET = 'federal_bracket'
+STATE_BRACKET = 'state_bracket'
+STUDENT_LOAN_PHASEOUT = 'student_loan_phaseout'
+
+class RetirementOptimizer(object):
+    """ Evaluates every combination of per-member retirement contribution rates on a
+    grid as one batched tax computation.
+
+    A combination is worth its net income plus `retirement_value` per dollar
+    contributed; with the default of 1.0 a contributed dollar counts the same as
+    a dollar taken home. Combinations that put any member over
+    `contribution_limit` dollars are left out.
+    """
+    def __init__(self, year, rates=None, retirement_value=1.0, contribution_limit=None, engine=None):
+        super().__init__()
+        self.year = year
+        # ascending, which `RetirementGrid` relies on
+        self.rates = np.linspace(0.0, 0.15, 16) if rates is None else np.sort(np.asarray(rates, dtype=float))
+        self.retirement_value = retirement_value
+        self.contribution_limit = contribution_limit
+        self._engine = engine
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = household_taxes.HouseholdTaxEngine(self.year)
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+
+    def rate_grid(self, member_count):
+        """ Returns a (len(rates) ** member_count, member_count) array of every rate combination """
+        indices = np.indices((len(self.rates),) * member_count).reshape(member_count, -1).T
+        return self.rates[indices]
+
+    def evaluate(self, family):
+        """ Returns a `RetirementGrid` of `family`'s outcome for every rate combination """
+        base = household_taxes.HouseholdTable.from_families([family], self.year)
+        member_count = family.member_count
+        rates = self.rate_grid(member_count)
+        table = base.replace(np.zeros(len(rates), dtype=int), retirement_contribution_rates=rates)
+        taxes = self.engine.calculate(table)
+
+        contributions = rates * table.gross_incomes
+        retirement_contributions = contributions.sum(axis=1)
+        objective = taxes.net_income + self.retirement_value * retirement_contributions
+        if self.contribution_limit is not None:
+            feasible = (contributions <= self.contribution_limit).all(axis=1)
+            objective = np.where(feasible, objective, -np.inf)
+
+        return RetirementGrid(self.rates,
+                              member_count,
+                              table.gross_incomes[0],
+                              taxes,
+                              retirement_contributions,
+                              objective,
+                              self.engine.get_federal_tax_data(family.filing_status),
+                              self.engine.get_state_tax_data(family.state_of_residence, family.filing_status),
+                              table.student_loan_interest[0] > 0)
+
+    def optimize(self, family):
+        """ Returns the best rate for each member """
+        return self.evaluate(family).best_rates
+
+class RetirementGrid(object):
+    """ Outcome of every rate combination. Arrays are flat over combinations, in the
+    order of `RetirementOptimizer.rate_grid`; `member_axis_index` picks out the
+    combinations that vary one member's rate while the others stay fixed.
+    `rates` must be in ascending order.
+    """
+    def __init__(self, rates, member_count, gross_incomes, taxes, retirement_contributions, objective,
+                 federal_tax_data, state_tax_data, has_student_loan_interest):
+        super().__init__()
+        if (np.diff(rates) < 0).any():
+            raise ValueError("rates must be in ascending order")
+        self.rates = rates
+        self.member_count = member_count
+        self.gross_incomes = gross_incomes
+        self.taxes = taxes
+        self.retirement_contributions = retirement_contributions
+        self.objective = objective
+        self.federal_tax_data = federal_tax_data
+        self.state_tax_data = state_tax_data
+        self.has_student_loan_interest = has_student_loan_interest
+
+    @property
+    def shape(self):
+        return (len(self.rates),) * self.member_count
+
+    @property
+    def best_index(self):
+        return int(np.argmax(self.objective))
+
+    @property
+    def best_rates(self):
+        return self.rates[list(np.unravel_index(self.best_index, self.shape))]
+
+    @property
+    def best_objective(self):
+        return self.objective[self.best_index]
+
+    def member_axis_index(self, member, fixed_rates=None):
+        """ Flat indexes of the combinations that step `member`'s rate through the grid,
+        with every other member at `fixed_rates` (default: the best rates)
+        """
+        if fixed_rates is None:
+            fixed_rates = self.best_rates
+        position = [int(np.argmin(np.abs(self.rates - rate))) for rate in fixed_rates]
+        position[member] = slice(None)
+        return np.arange(len(self.objective)).reshape(self.shape)[tuple(position)]
+
+    def marginal_benefit(self, member, fixed_rates=None):
+        """ Returns (rates, benefit): the value gained per extra dollar `member`
+        contributes, for each step between grid rates, at the midpoint rates
+        """
+        index = self.member_axis_index(member, fixed_rates)
+        contributions = self.retirement_contributions[index]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            benefit = np.diff(self.objective[index]) / np.diff(contributions)
+        midpoints = (self.rates[1:] + self.rates[:-1]) / 2
+        return midpoints, np.where(np.isfinite(benefit), benefit, np.nan)
+
+    def breakpoints(self, member, fixed_rates=None):
+        """ Returns the `Breakpoint`s, in rate order, where stepping `member`'s rate
+        moves taxable income across a bracket level or student loan phaseout limit
+        """
+        index = self.member_axis_index(member, fixed_rates)
+        federal_agi = self.taxes.federal_agi[index]
+        magi = federal_agi + self.taxes.student_loan_interest_deduction[index]
+        state_agi = self.taxes.state_agi[index]
+
+        thresholds = [
+            (FEDERAL_BRACKET, federal_agi, self.federal_tax_data.bracket_schedule.income_levels[1:]),
+            (STATE_BRACKET, state_agi, self.state_tax_data.bracket_schedule.income_levels[1:]),
+        ]
+        if self.has_student_loan_interest:
+            phaseout_start = self.federal_tax_data.student_loan_phaseout_numerator_reduction
+            phaseout_end = phaseout_start + self.federal_tax_data.student_loan_phaseout_denominator
+            thresholds.append((STUDENT_LOAN_PHASEOUT, magi, np.array([phaseout_start, phaseout_end])))
+
+        breakpoints = []
+        for kind, income, levels in thresholds:
+            for i in range(len(income) - 1):
+                high, low = income[i], income[i + 1]
+                for level in levels[(levels <= high) & (levels > low)]:
+                    # income is linear in the rate between neighbouring grid points unless another threshold lies between them
+                    fraction = (high - level) / (high - low)
+                    rate = self.rates[i] + fraction * (self.rates[i + 1] - self.rates[i])
+                    breakpoints.append(Breakpoint(float(rate), kind, float(level)))
+        return sorted(breakpoints)
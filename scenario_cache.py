@@ -0,0 +1,169 @@
+import hashlib
+import json
+import sqlite3
+import types
+
+import numpy as np
+
+import amortized_loan
+import data
+from month import Month
+
+
+def _canonical(value):
+    if isinstance(value, Month):
+        return value.ordinal
+    if isinstance(value, amortized_loan.RatePath):
+        return [value.start_ordinals.tolist(), value.aprs.tolist()]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("{!r} has no canonical form".format(value))
+
+def canonical_hash(value):
+    """ Hex SHA-256 of `value` as sorted, compact JSON. Months, rate paths and numpy
+    values are written as plain numbers and lists, so equal inputs hash equally.
+    """
+    text = json.dumps(value, sort_keys=True, separators=(',', ':'), default=_canonical)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _is_plain(value):
+    """ Whether `value` is an immutable constant that `canonical_hash` writes the
+    same way in every process
+    """
+    if value is None or isinstance(value, (bool, int, float, str, Month, np.generic)):
+        return True
+    if isinstance(value, tuple):
+        return all(_is_plain(item) for item in value)
+    return False
+
+def _code_parts(code):
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            consts.append(_code_parts(const))
+        elif isinstance(const, frozenset):
+            consts.append(sorted(repr(item) for item in const))
+        else:
+            consts.append(repr(const))
+    return [code.co_code.hex(), consts, list(code.co_names)]
+
+def function_fingerprint(function, _seen=None):
+    """ Hex SHA-256 of what `function` computes: its bytecode and constants, its
+    defaults, the constant module globals it reads, and the same for the
+    functions of its own module that it calls. Editing any of those changes the
+    fingerprint; code in other modules is not covered.
+    """
+    seen = set() if _seen is None else _seen
+    seen.add(function)
+    code = function.__code__
+    parts = {
+        'code': _code_parts(code),
+        'defaults': repr(function.__defaults__),
+        'kwdefaults': repr(sorted((function.__kwdefaults__ or {}).items())),
+        'globals': {},
+        'functions': {},
+    }
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(const.co_names)
+    for name in sorted(names):
+        if name not in function.__globals__:
+            continue
+        value = function.__globals__[name]
+        if isinstance(value, types.FunctionType):
+            if value.__module__ == function.__module__ and value not in seen:
+                parts['functions'][name] = function_fingerprint(value, seen)
+        elif _is_plain(value):
+            parts['globals'][name] = value
+    return canonical_hash(parts)
+
+class ScenarioCache(object):
+    """ Scenario results kept in a local SQLite database under content hashes of
+    their inputs, so a repeated or overlapping sweep reads them back instead of
+    recomputing. Every key also covers the tax data version, so results computed
+    under other tax data are never returned.
+
+    At most `max_entries` results are kept; storing past that evicts the least
+    recently used. The database can be shared by several processes, each opening
+    its own connection.
+    """
+    def __init__(self, path, max_entries=100000, registry=None):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.registry = registry
+        self._tax_data_version = None
+        self._connection = None
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # connections stay with the process that opened them
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    " key TEXT PRIMARY KEY,"
+                    " data TEXT NOT NULL,"
+                    " last_used INTEGER NOT NULL)")
+                self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def tax_data_version(self):
+        if self._tax_data_version is None:
+            self._tax_data_version = (self.registry or data.registry).version()
+        return self._tax_data_version
+
+    def key(self, *parts):
+        """ Returns the cache key for a result that depends on `parts` and the tax data """
+        return canonical_hash([self.tax_data_version, parts])
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key):
+        return self.connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key):
+        """ Returns the stored result, marking it most recently used, or None """
+        with self.connection:
+            row = self.connection.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE results SET last_used = (SELECT MAX(last_used) + 1 FROM results) WHERE key = ?", (key,))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """ Stores a JSON-serializable result, then evicts down to `max_entries` """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, data, last_used)"
+                " VALUES (?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM results))",
+                (key, json.dumps(result, default=_canonical)))
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
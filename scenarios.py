@@ -0,0 +1,175 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import math
+import os
+
+import numpy as np
+
+import five_year_plan
+import scenario_cache
+
+
+# YearSummary attributes collected for each scenario
+SUMMARY_METRICS = ('gross_income',
+                   'retirement',
+                   'healthcare',
+                   'mortgage_interest',
+                   'itemized_deductions',
+                   'std_deduction',
+                   'student_loan_deduction',
+                   'fed_agi',
+                   'state_agi',
+                   'fed_taxes',
+                   'fica',
+                   'state',
+                   'property',
+                   'total_taxes',
+                   'net_income')
+
+class ScenarioGrid(object):
+    """ Every combination of values along named parameter axes, in a fixed order:
+    the last axis varies fastest, like nested for loops over the axes as given.
+    """
+    def __init__(self, axes):
+        super().__init__()
+        self.axes = OrderedDict(axes)
+
+    @property
+    def names(self):
+        return list(self.axes)
+
+    @property
+    def shape(self):
+        return tuple(len(values) for values in self.axes.values())
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype=int))
+
+    def __iter__(self):
+        for values in itertools.product(*self.axes.values()):
+            yield OrderedDict(zip(self.axes, values))
+
+    def __getitem__(self, index):
+        position = np.unravel_index(index, self.shape)
+        return OrderedDict((name, values[i]) for (name, values), i in zip(self.axes.items(), position))
+
+def summarize_scenario(build_family, year, parameters):
+    """ Builds the scenario's family with `build_family(**parameters)` and returns
+    its `YearSummary` for `year` as a tuple in `SUMMARY_METRICS` order
+    """
+    summary = five_year_plan.YearSummary(build_family(**parameters), year)
+    summary.calculate_summary()
+    return tuple(float(getattr(summary, name)) for name in SUMMARY_METRICS)
+
+def _summarize_chunk(build_family, year, chunk):
+    return [summarize_scenario(build_family, year, parameters) for parameters in chunk]
+
+class ScenarioRunner(object):
+    """ Runs `build_family` for every scenario in a `ScenarioGrid` and summarizes
+    each family's year.
+
+    `build_family` takes the grid's axis names as keyword arguments and returns a
+    new `people.Family`; scenarios never share a family. With more than one
+    worker the scenarios are split into chunks of `chunk_size` and run in a
+    `ProcessPoolExecutor`, so `build_family` must be picklable (a module-level
+    function). Results come back in grid order whatever the worker count.
+
+    With a `scenario_cache.ScenarioCache`, scenarios are looked up before any
+    family is built, keyed by the scenario's parameters, the year, the tax data
+    and `scenario_cache.function_fingerprint(build_family)`, so editing
+    `build_family`, the module constants it reads or the same-module helpers it
+    calls misses the old results. Only the misses are built and summarized.
+    Bump `version` when `build_family` depends on anything else that changed.
+    """
+    def __init__(self, build_family, year, max_workers=None, chunk_size=None, cache=None, version=None):
+        super().__init__()
+        self.build_family = build_family
+        self.year = year
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.version = version
+        self._build_fingerprint = None
+
+    @property
+    def build_fingerprint(self):
+        if self._build_fingerprint is None:
+            self._build_fingerprint = scenario_cache.function_fingerprint(self.build_family)
+        return self._build_fingerprint
+
+    def cache_key(self, parameters):
+        return self.cache.key(self.build_family.__module__,
+                              self.build_family.__qualname__,
+                              self.build_fingerprint,
+                              self.version,
+                              dict(parameters),
+                              self.year,
+                              SUMMARY_METRICS)
+
+    def chunks(self, grid):
+        scenarios = list(grid)
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(scenarios) / (4 * max(self.max_workers, 1))))
+        return [scenarios[start:start + chunk_size] for start in range(0, len(scenarios), chunk_size)]
+
+    def summarize(self, scenarios):
+        """ Returns the summary row of each scenario, in order """
+        chunks = self.chunks(scenarios)
+        if self.max_workers <= 1 or len(chunks) <= 1:
+            chunk_results = [_summarize_chunk(self.build_family, self.year, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                # map yields in submission order, which keeps the grid order
+                chunk_results = list(executor.map(_summarize_chunk,
+                                                  itertools.repeat(self.build_family),
+                                                  itertools.repeat(self.year),
+                                                  chunks))
+        return [row for chunk in chunk_results for row in chunk]
+
+    def run(self, grid):
+        """ Returns `ScenarioResults` for every scenario in `grid` """
+        scenarios = list(grid)
+        if self.cache is None:
+            return ScenarioResults(grid, self.summarize(scenarios))
+
+        keys = [self.cache_key(parameters) for parameters in scenarios]
+        rows = [self.cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        for i, row in zip(missing, self.summarize([scenarios[i] for i in missing])):
+            self.cache.put(keys[i], row)
+            rows[i] = row
+        return ScenarioResults(grid, [tuple(row) for row in rows])
+
+class ScenarioResults(object):
+    """ Columnar scenario results: one array per grid axis and per summary metric,
+    with row i holding scenario `grid[i]`
+    """
+    def __init__(self, grid, rows):
+        super().__init__()
+        self.grid = grid
+        self.columns = OrderedDict()
+        scenarios = list(grid)
+        for name in grid.names:
+            self.columns[name] = np.array([scenario[name] for scenario in scenarios])
+        values = np.array(rows, dtype=float).reshape(len(rows), len(SUMMARY_METRICS))
+        for i, name in enumerate(SUMMARY_METRICS):
+            self.columns[name] = values[:, i]
+
+    def __len__(self):
+        return len(self.grid)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def row(self, index):
+        return OrderedDict((name, column[index]) for name, column in self.columns.items())
+
+    def best(self, metric):
+        """ Returns the row with the largest `metric` """
+        return self.row(int(np.argmax(self.columns[metric])))
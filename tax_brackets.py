@@ -0,0 +1,43 @@
+import numpy as np
+
+
+class TaxBracketSchedule(object):
+    """ Compiled form of a list of tax brackets
+        [(income_level_x, rate_above_x), (income_level_y, rate_above_y), ...]
+    in increasing order. Holds the bracket levels and rates as arrays, plus the
+    total tax owed at each level, so the tax on any income is one lookup:
+        tax = tax_at_level[i] + rate[i] * (income - level[i])
+    for the highest level i at or below the income.
+    """
+    def __init__(self, tax_brackets):
+        super().__init__()
+        self.tax_brackets = tax_brackets
+        self.income_levels = np.array([level for level, _ in tax_brackets], dtype=float)
+        self.rates = np.array([rate for _, rate in tax_brackets], dtype=float)
+        self.tax_at_levels = np.concatenate(([0.0], np.cumsum(self.rates[:-1] * np.diff(self.income_levels))))
+        for array in (self.income_levels, self.rates, self.tax_at_levels):
+            array.setflags(write=False)
+
+    def __len__(self):
+        return len(self.income_levels)
+
+    def bracket_index(self, taxable_income):
+        """ Index of the bracket the next dollar of income falls in; 0 below the first level """
+        index = np.searchsorted(self.income_levels, taxable_income, side='right') - 1
+        return np.maximum(index, 0)
+
+    def marginal_rate(self, taxable_income):
+        return self.rates[self.bracket_index(taxable_income)]
+
+    def income_tax(self, taxable_income):
+        """ Tax on a taxable income, or on each of an array of them """
+        taxable_income = np.asarray(taxable_income, dtype=float)
+        index = self.bracket_index(taxable_income)
+        tax = self.tax_at_levels[index] + self.rates[index] * (taxable_income - self.income_levels[index])
+        tax = np.where(taxable_income > self.income_levels[0], tax, 0.0)
+        return tax if tax.ndim else float(tax)
+
+    def evaluate(self, taxable_income):
+        """ Returns (tax, marginal rate, bracket index) for a taxable income or array of them """
+        index = self.bracket_index(taxable_income)
+        return self.income_tax(taxable_income), self.rates[index], index
@@ -1,14 +1,103 @@
+import numpy as np
+
 import people
 import data
+import tax_graph
+import versions
+
 
+class EvaluationContext(object):
+    """ Values already computed for one family and tax year. Calculators that share a
+    context compute each quantity once.
+
+    Each value remembers the version of every family input field it read (see
+    `people.Family.version`), directly or through other values. A value is
+    recomputed only when one of those fields has changed for this year, so an edit
+    to one input leaves unrelated values, and other years' contexts, cached.
+    `invalidate()` drops everything.
+    """
+    def __init__(self, family, year):
+        super().__init__()
+        self.family = family
+        self.year = year
+        # key -> (value, {field: version})
+        self._values = {}
+        # versions.latest_version() when every value was last known to be current
+        self._checked_version = None
+        # {field: version} read by each value being computed, innermost last
+        self._frames = []
+
+    def __contains__(self, key):
+        return key in self._values and self._is_current(self._values[key][1])
+
+    def _is_current(self, dependencies):
+        if self._checked_version == versions.latest_version():
+            return True
+        return all(self.family.version(field, self.year) == version
+                   for field, version in dependencies.items())
+
+    def _drop_stale_values(self):
+        """ Keeps only the values whose inputs are unchanged, once per change anywhere """
+        latest_version = versions.latest_version()
+        if self._checked_version != latest_version:
+            self._values = dict((key, entry) for key, entry in self._values.items()
+                                if self._is_current(entry[1]))
+            self._checked_version = latest_version
+
+    def _record(self, dependencies):
+        if self._frames:
+            self._frames[-1].update(dependencies)
+
+    def depends_on(self, *fields):
+        """ Records that the value being computed reads these family input fields """
+        if hasattr(self.family, 'version'):
+            self._record(dict((field, self.family.version(field, self.year)) for field in fields))
+
+    def get(self, key, compute):
+        """ Returns the value stored under `key`, calling `compute()` the first time
+        and again whenever an input it read has changed
+        """
+        self._drop_stale_values()
+        if key in self._values:
+            value, dependencies = self._values[key]
+            self._record(dependencies)
+            return value
+
+        self._frames.append({})
+        try:
+            value = compute()
+        finally:
+            dependencies = self._frames.pop()
+        self._values[key] = (value, dependencies)
+        self._record(dependencies)
+        return value
+
+    def family_value(self, name):
+        """ Returns `family.<name>(year)`, e.g. 'gross_income' or 'itemized_deductions' """
+        def compute():
+            self.depends_on(*getattr(self.family, 'value_inputs', {}).get(name, ()))
+            return getattr(self.family, name)(self.year)
+        return self.get(('family', name), compute)
+
+    def invalidate(self):
+        self._values.clear()
+        self._checked_version = None
+
+def _compute(name, **inputs):
+    """ Evaluates one `tax_graph` formula for a single family """
+    return float(tax_graph.tax_graph.compute(name, **inputs))
 
 class Calculator(object):
-    """Tax-related calculator. Abstract class. Always needs a family and a tax year"""
-    def __init__(self, family, year, tax_data=None):
+    """Tax-related calculator. Abstract class. Always needs a family and a tax year.
+    The formulas themselves live in `tax_graph`; calculators gather their inputs
+    and cache the results.
+    """
+    def __init__(self, family, year, tax_data=None, context=None):
         super().__init__()
         self.family = family
         self.year = year
         self._tax_data = tax_data
+        self._context = context
 
     @property
     def tax_data(self):
@@ -20,87 +109,102 @@ class Calculator(object):
     def tax_data(self, value):
         self._tax_data = value
 
+    @property
+    def context(self):
+        if self._context is None:
+            self._context = EvaluationContext(self.family, self.year)
+        return self._context
+
+    @context.setter
+    def context(self, value):
+        self._context = value
+
     def get_new_tax_data(self):
         pass
 
-    def calculate(self):
+    def memoize(self, name, compute):
+        """ Returns `compute()`, evaluated once per context for this kind of calculator and tax data """
+        return self.context.get((type(self), self.tax_data, name), compute)
+
+    def invalidate(self):
+        self.context.invalidate()
+
+    def compute(self):
         pass
 
+    def calculate(self):
+        return self.memoize('calculate', self.compute)
+
 class FederalCalculator(Calculator):
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
     def get_new_tax_data(self):
-        return data.FederalTaxData(self.year, self.family.filing_status)
+        return data.registry.federal_tax_data(self.year, self.family.filing_status)
 
 class StateCalculator(Calculator):
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
     def get_new_tax_data(self):
-        return data.StateTaxData(self.family.state_of_residence, self.year, self.family.filing_status)
+        return data.registry.state_tax_data(self.family.state_of_residence, self.year, self.family.filing_status)
 
 class PropertyCalculator(Calculator):
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
     def get_new_tax_data(self):
-        return data.PropertyTaxData(self.family.state_of_residence, self.year)
+        return data.registry.property_tax_data(self.family.state_of_residence, self.year)
 
 class MagiCalculator(FederalCalculator):
     """Calculates MAGI"""
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
-
-    def calculate(self):
-        magi = (
-            self.family.gross_income(self.year)
-            - self.family.member_count * self.tax_data.exemption_amount_per_person
-            - max(self.tax_data.standard_deduction_amount, self.family.itemized_deductions(self.year))
-            - self.family.retirement_contribution(self.year)
-            - self.family.healthcare_contribution(self.year)
-        )
-        return max(magi, 0.0)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
+
+    def compute(self):
+        self.context.depends_on('members')
+        return _compute('magi',
+                        gross_income=self.context.family_value('gross_income'),
+                        member_count=self.family.member_count,
+                        itemized_deductions=self.context.family_value('itemized_deductions'),
+                        retirement_contribution=self.context.family_value('retirement_contribution'),
+                        healthcare_contribution=self.context.family_value('healthcare_contribution'),
+                        federal_tax_data=self.tax_data)
 
 class StudentLoanInterestDeductionCalculator(FederalCalculator):
     """Calculates student loan interest deduction"""
-    def __init__(self, family, year, tax_data=None, magi_calculator=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, magi_calculator=None, context=None):
+        super().__init__(family, year, tax_data, context)
         self._magi_calculator = magi_calculator
 
     @property
     def magi_calculator(self):
         if self._magi_calculator is None:
-            self._magi_calculator = MagiCalculator(self.family, self.year, self.tax_data)
+            self._magi_calculator = MagiCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._magi_calculator
 
     @magi_calculator.setter
     def magi_calculator(self, value):
         self._magi_calculator = value
 
-    def calculate(self):
+    def compute(self):
         """ Returns the amount of money you can deduct from your taxes,
             given modified adjusted gross income and total interest paid.
             See http://www.irs.gov/publications/p970/ch04.html
         """
-        max_deduction = self.tax_data.student_loan_max_deduction
-        phaseout_denominator = self.tax_data.student_loan_phaseout_denominator
-        phaseout_numerator_reduction = self.tax_data.student_loan_phaseout_numerator_reduction
-        magi = self.magi_calculator.calculate()
-
-        total_interest_paid = min(self.family.student_loan_interest_payments(self.year), max_deduction)
-        phaseout_multiplier = (magi - phaseout_numerator_reduction) / float(phaseout_denominator)
-        deduction_due_to_phaseout = max(total_interest_paid * phaseout_multiplier, 0.0)
-        return max(total_interest_paid - deduction_due_to_phaseout, 0.0)
+        return _compute('student_loan_deduction',
+                        magi=self.magi_calculator.calculate(),
+                        student_loan_interest=self.context.family_value('student_loan_interest_payments'),
+                        federal_tax_data=self.tax_data)
 
 class FederalAgiCalculator(FederalCalculator):
     """docstring for FederalAgiCalculator"""
-    def __init__(self, family, year, tax_data=None, magi_calculator=None, student_loan_interest_deduction_calculator=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, magi_calculator=None, student_loan_interest_deduction_calculator=None, context=None):
+        super().__init__(family, year, tax_data, context)
         self._magi_calculator = magi_calculator
         self._student_loan_interest_deduction_calculator = student_loan_interest_deduction_calculator
 
     @property
     def magi_calculator(self):
         if self._magi_calculator is None:
-            self._magi_calculator = MagiCalculator(self.family, self.year, self.tax_data)
+            self._magi_calculator = MagiCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._magi_calculator
 
     @magi_calculator.setter
@@ -110,7 +214,7 @@ class FederalAgiCalculator(FederalCalculator):
     @property
     def student_loan_interest_deduction_calculator(self):
         if self._student_loan_interest_deduction_calculator is None:
-            self._student_loan_interest_deduction_calculator = StudentLoanInterestDeductionCalculator(self.family, self.year, self.tax_data, self.magi_calculator)
+            self._student_loan_interest_deduction_calculator = StudentLoanInterestDeductionCalculator(self.family, self.year, self.tax_data, self.magi_calculator, context=self.context)
         return self._student_loan_interest_deduction_calculator
     
     @student_loan_interest_deduction_calculator.setter
@@ -121,55 +225,35 @@ class FederalAgiCalculator(FederalCalculator):
     def student_loan_interest_deduction(self):
         return self.student_loan_interest_deduction_calculator.calculate()
 
-    def calculate(self):
-        magi = self.magi_calculator.calculate()
-        student_loan_interest_deduction = self.student_loan_interest_deduction_calculator.calculate()
-        return magi - student_loan_interest_deduction
+    def compute(self):
+        return _compute('fed_agi',
+                        magi=self.magi_calculator.calculate(),
+                        student_loan_deduction=self.student_loan_interest_deduction_calculator.calculate())
 
 class TaxBracketCalculator(Calculator):
-    def __init__(self, family, year, tax_data, agi_calculator):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data, agi_calculator, context=None):
+        super().__init__(family, year, tax_data, context)
         self.agi_calculator = agi_calculator
 
-    def _income_tax(self,
-                    income,
-                    tax_brackets,
-                    bracket_index=-1,
-                    taxes_so_far=0):
-        """ Recursive helper function.
-        Returns the amount of federal taxes, in dollars, given a (taxable) income
-        and set of tax brackets. Assumes the brackets are of the form
-            [(income_level_x, rate_above_x), (income_level_y, rate_above_y), ...]
-        in increasing order.
-        """
-        if income > 0:
-            income_level, rate = tax_brackets[bracket_index]
-            taxes_so_far += (
-                     rate * max(income - income_level, 0) +
-                     self._income_tax(min(income, income_level),
-                                      tax_brackets,
-                                      bracket_index - 1,
-                                      taxes_so_far)
-                    )
-        return taxes_so_far
+    def marginal_rate(self):
+        return self.memoize('marginal_rate', lambda: self.tax_data.bracket_schedule.marginal_rate(self.agi_calculator.calculate()))
 
-    def calculate(self):
-        taxable_income = self.agi_calculator.calculate()
-        return self._income_tax(taxable_income, self.tax_data.tax_brackets)#, -1, 0)
+    def compute(self):
+        return float(tax_graph.bracket_tax(self.agi_calculator.calculate(), self.tax_data))
 
 ##
 ## Federal Income Tax
 ##
 class FederalIncomeTaxCalculator(FederalCalculator):
     """docstring for IncomeTax"""
-    def __init__(self, family, year, tax_data=None, federal_agi_calculator=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, federal_agi_calculator=None, context=None):
+        super().__init__(family, year, tax_data, context)
         self._federal_agi_calculator = federal_agi_calculator
 
     @property
     def federal_agi_calculator(self):
         if self._federal_agi_calculator is None:
-            self._federal_agi_calculator = FederalAgiCalculator(self.family, self.year, self.tax_data)
+            self._federal_agi_calculator = FederalAgiCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._federal_agi_calculator
 
     @federal_agi_calculator.setter
@@ -188,9 +272,16 @@ class FederalIncomeTaxCalculator(FederalCalculator):
     def standard_deduction(self):
         return self.tax_data.standard_deduction_amount
 
-    def calculate(self):
-        bracket_calculator = TaxBracketCalculator(self.family, self.year, self.tax_data, self.federal_agi_calculator)
-        return bracket_calculator.calculate()
+    @property
+    def bracket_calculator(self):
+        return TaxBracketCalculator(self.family, self.year, self.tax_data, self.federal_agi_calculator, context=self.context)
+
+    @property
+    def marginal_rate(self):
+        return self.bracket_calculator.marginal_rate()
+
+    def compute(self):
+        return self.bracket_calculator.calculate()
 
 
 ##
@@ -198,34 +289,36 @@ class FederalIncomeTaxCalculator(FederalCalculator):
 ##
 class MedicareTaxCalculator(FederalCalculator):
     """docstring for MedicareTaxCalculator"""
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
-    def calculate(self):
-        medicare_tax_rate = self.tax_data.medicare_tax_rate
-        medicare_taxable_income = self.family.gross_income(self.year) - self.family.healthcare_contribution(self.year)
-        return medicare_tax_rate * medicare_taxable_income
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
+    def compute(self):
+        return _compute('medicare_tax',
+                        gross_income=self.context.family_value('gross_income'),
+                        healthcare_contribution=self.context.family_value('healthcare_contribution'),
+                        federal_tax_data=self.tax_data)
 
 class SocialSecurityTaxCalculator(FederalCalculator):
     """docstring for SocialSecurityTaxCalculator"""
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
-    def calculate(self):
-        social_security_tax_wage_base_limit = self.tax_data.social_security_tax_wage_base_limit
-        social_security_tax_rate = self.tax_data.social_security_tax_rate
-        social_security_taxable_income = sum(min(p.gross_income(self.year), social_security_tax_wage_base_limit) for p in self.family.members)
-        return social_security_tax_rate * social_security_taxable_income
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
+    def compute(self):
+        self.context.depends_on('members', 'gross_income')
+        member_gross_incomes = np.array([p.gross_income(self.year) for p in self.family.members], dtype=float)
+        return _compute('social_security_tax',
+                        member_gross_incomes=member_gross_incomes,
+                        federal_tax_data=self.tax_data)
 
 class FicaTaxCalculator(FederalCalculator):
     """docstring for FICATax"""
-    def __init__(self, family, year, tax_data=None, medicare_tax_calculator=None, social_security_tax_calculator=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, medicare_tax_calculator=None, social_security_tax_calculator=None, context=None):
+        super().__init__(family, year, tax_data, context)
         self._medicare_tax_calculator = medicare_tax_calculator
         self._social_security_tax_calculator = social_security_tax_calculator
 
     @property
     def medicare_tax_calculator(self):
         if self._medicare_tax_calculator is None:
-            self._medicare_tax_calculator = MedicareTaxCalculator(self.family, self.year, self.tax_data)
+            self._medicare_tax_calculator = MedicareTaxCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._medicare_tax_calculator
 
     @medicare_tax_calculator.setter
@@ -235,42 +328,44 @@ class FicaTaxCalculator(FederalCalculator):
     @property
     def social_security_tax_calculator(self):
         if self._social_security_tax_calculator is None:
-            self._social_security_tax_calculator = SocialSecurityTaxCalculator(self.family, self.year, self.tax_data)
+            self._social_security_tax_calculator = SocialSecurityTaxCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._social_security_tax_calculator
 
     @social_security_tax_calculator.setter
     def social_security_tax_calculator(self, value):
         self._federal_agi_calculator = value
 
-    def calculate(self):
-        return self.medicare_tax_calculator.calculate() + self.social_security_tax_calculator.calculate()
+    def compute(self):
+        return _compute('fica',
+                        medicare_tax=self.medicare_tax_calculator.calculate(),
+                        social_security_tax=self.social_security_tax_calculator.calculate())
 
 ##
 ## State Income Tax Calculator
 ##
 class StateAgiCalculator(StateCalculator):
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
     
-    def calculate(self):
-        agi = (
-            self.family.gross_income(self.year)
-            - self.family.member_count * self.tax_data.exemption_amount_per_person
-            - max(self.tax_data.standard_deduction_amount, self.family.itemized_deductions(self.year))
-            - self.family.retirement_contribution(self.year)
-        )
-        return max(agi, 0.0)
+    def compute(self):
+        self.context.depends_on('members')
+        return _compute('state_agi',
+                        gross_income=self.context.family_value('gross_income'),
+                        member_count=self.family.member_count,
+                        itemized_deductions=self.context.family_value('itemized_deductions'),
+                        retirement_contribution=self.context.family_value('retirement_contribution'),
+                        state_tax_data=self.tax_data)
 
 class StateIncomeTaxCalculator(StateCalculator):
     """docstring for StateIncomeTaxCalculator"""
-    def __init__(self, family, year, tax_data=None, state_agi_calculator=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, state_agi_calculator=None, context=None):
+        super().__init__(family, year, tax_data, context)
         self._state_agi_calculator = state_agi_calculator
 
     @property
     def state_agi_calculator(self):
         if self._state_agi_calculator is None:
-            self._state_agi_calculator = StateAgiCalculator(self.family, self.year, self.tax_data)
+            self._state_agi_calculator = StateAgiCalculator(self.family, self.year, self.tax_data, context=self.context)
         return self._state_agi_calculator
     @state_agi_calculator.setter
     def state_agi_calculator(self, value):
@@ -280,22 +375,28 @@ class StateIncomeTaxCalculator(StateCalculator):
     def agi(self):
         return self.state_agi_calculator.calculate()
 
-    def calculate(self):
-        bracket_calculator = TaxBracketCalculator(self.family, self.year, self.tax_data, self.state_agi_calculator)
-        return bracket_calculator.calculate()
+    @property
+    def bracket_calculator(self):
+        return TaxBracketCalculator(self.family, self.year, self.tax_data, self.state_agi_calculator, context=self.context)
+
+    @property
+    def marginal_rate(self):
+        return self.bracket_calculator.marginal_rate()
+
+    def compute(self):
+        return self.bracket_calculator.calculate()
 
 class StatePropertyTaxCalculator(PropertyCalculator):
     """docstring for StateIncomeTaxCalculator"""
-    def __init__(self, family, year, tax_data=None):
-        super().__init__(family, year, tax_data)
+    def __init__(self, family, year, tax_data=None, context=None):
+        super().__init__(family, year, tax_data, context)
 
-    def calculate(self):
-        property_tax = 0
-        if self.family.owns_home():
-            fair_market_value = self.family.home_value
-            assessed_value = fair_market_value * self.tax_data.valuation_rate
-            property_tax = assessed_value / 1000.0 * self.tax_data.mill_rate
-        return property_tax
+    def compute(self):
+        self.context.depends_on('home')
+        home_value = self.family.home_value if self.family.owns_home() else 0
+        return _compute('property_tax',
+                        home_value=home_value,
+                        property_tax_data=self.tax_data)
 
 class TaxCalculator(Calculator):
     def __init__(
@@ -305,9 +406,10 @@ class TaxCalculator(Calculator):
             federal_income_tax_calculator=None,
             fica_tax_calculator=None,
             state_income_tax_calculator=None,
-            state_property_tax_calculator=None
+            state_property_tax_calculator=None,
+            context=None
         ):
-        super().__init__(family, year)
+        super().__init__(family, year, context=context)
         self._federal_income_tax_calculator = federal_income_tax_calculator
         self._fica_tax_calculator = fica_tax_calculator
         self._state_income_tax_calculator = state_income_tax_calculator
@@ -316,7 +418,7 @@ class TaxCalculator(Calculator):
     @property
     def state_property_tax_calculator(self):
         if self._state_property_tax_calculator is None:
-            self._state_property_tax_calculator = StatePropertyTaxCalculator(self.family, self.year)
+            self._state_property_tax_calculator = StatePropertyTaxCalculator(self.family, self.year, context=self.context)
         return self._state_property_tax_calculator
     @state_property_tax_calculator.setter
     def state_property_tax_calculator(self, value):
@@ -325,7 +427,7 @@ class TaxCalculator(Calculator):
     @property
     def state_income_tax_calculator(self):
         if self._state_income_tax_calculator is None:
-            self._state_income_tax_calculator = StateIncomeTaxCalculator(self.family, self.year)
+            self._state_income_tax_calculator = StateIncomeTaxCalculator(self.family, self.year, context=self.context)
         return self._state_income_tax_calculator
     @state_income_tax_calculator.setter
     def state_income_tax_calculator(self, value):
@@ -334,7 +436,7 @@ class TaxCalculator(Calculator):
     @property
     def federal_income_tax_calculator(self):
         if self._federal_income_tax_calculator is None:
-            self._federal_income_tax_calculator = FederalIncomeTaxCalculator(self.family, self.year)
+            self._federal_income_tax_calculator = FederalIncomeTaxCalculator(self.family, self.year, context=self.context)
         return self._federal_income_tax_calculator
     @federal_income_tax_calculator.setter
     def federal_income_tax_calculator(self, value):
@@ -343,7 +445,7 @@ class TaxCalculator(Calculator):
     @property
     def fica_tax_calculator(self):
         if self._fica_tax_calculator is None:
-            self._fica_tax_calculator = FicaTaxCalculator(self.family, self.year)
+            self._fica_tax_calculator = FicaTaxCalculator(self.family, self.year, context=self.context)
         return self._fica_tax_calculator
     @fica_tax_calculator.setter
     def fica_tax_calculator(self, value):
@@ -383,35 +485,37 @@ class TaxCalculator(Calculator):
 
     @property
     def total_taxes(self):
-        return sum((self.federal_taxes, self.state_taxes, self.fica_taxes, self.property_taxes))
+        return _compute('total_tax',
+                        fed_tax=self.federal_taxes,
+                        state_tax=self.state_taxes,
+                        fica=self.fica_taxes,
+                        property_tax=self.property_taxes)
 
-    def calculate(self):
+    def compute(self):
         return self.total_taxes
 
 class NetIncomeCalculator(Calculator):
     """docstring for NetIncomeCalculator"""
-    def __init__(self, family, year, tax_calculator=None):
-        super().__init__(family, year)
+    def __init__(self, family, year, tax_calculator=None, context=None):
+        super().__init__(family, year, context=context)
         self._tax_calculator = tax_calculator
 
     @property
     def tax_calculator(self):
         if self._tax_calculator is None:
-            self._tax_calculator = TaxCalculator(self.family, self.year)
+            self._tax_calculator = TaxCalculator(self.family, self.year, context=self.context)
         return self._tax_calculator
 
     @tax_calculator.setter
     def tax_calculator(self, value):
         self._tax_calculator = value
     
-    def calculate(self):
-        gross = self.family.gross_income(self.year)
-        retirement = self.family.retirement_contribution(self.year)
-        healthcare = self.family.healthcare_contribution(self.year)
-
-        taxes = self.tax_calculator.calculate()
-
-        return gross - sum((retirement, healthcare)) - taxes
+    def compute(self):
+        return _compute('net_income',
+                        gross_income=self.context.family_value('gross_income'),
+                        retirement_contribution=self.context.family_value('retirement_contribution'),
+                        healthcare_contribution=self.context.family_value('healthcare_contribution'),
+                        total_tax=self.tax_calculator.calculate())
 
 if __name__ == '__main__':
     pass
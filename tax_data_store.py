@@ -0,0 +1,145 @@
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+
+import data
+
+
+FEDERAL = 'federal'
+STATE = 'state'
+PROPERTY = 'property'
+
+class TaxDataStore(object):
+    """ Tax parameters kept in a local SQLite database, one JSON row per
+    (kind, state, year, filing status) slice. Slices are read only when asked for,
+    and the most recently used `cache_size` parsed slices are kept in memory.
+    """
+    def __init__(self, path, cache_size=64):
+        super().__init__()
+        self.path = path
+        self.cache_size = cache_size
+        self._connection = None
+        self._cache = OrderedDict()
+        self._version = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tax_data ("
+                " kind TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " year INTEGER NOT NULL,"
+                " filing_status TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " PRIMARY KEY (kind, state, year, filing_status))")
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _key(kind, state, year, filing_status):
+        return (kind, state or '', int(year), filing_status or '')
+
+    @staticmethod
+    def _decode(values):
+        if 'tax_brackets' in values:
+            values['tax_brackets'] = [tuple(bracket) for bracket in values['tax_brackets']]
+        return values
+
+    def load(self, kind, state, year, filing_status):
+        """ Returns the parameter dict for one slice; raises KeyError if it is not stored """
+        key = self._key(kind, state, year, filing_status)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        row = self.connection.execute(
+            "SELECT data FROM tax_data WHERE kind = ? AND state = ? AND year = ? AND filing_status = ?",
+            key).fetchone()
+        if row is None:
+            raise KeyError(key)
+        values = self._decode(json.loads(row[0]))
+
+        self._cache[key] = values
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return values
+
+    def save(self, kind, state, year, filing_status, values):
+        key = self._key(kind, state, year, filing_status)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO tax_data (kind, state, year, filing_status, data) VALUES (?, ?, ?, ?, ?)",
+                key + (json.dumps(values),))
+        self._cache.pop(key, None)
+        self._version = None
+
+    def version(self):
+        """ Hex hash of every stored slice; changes whenever any slice does """
+        if self._version is None:
+            digest = hashlib.sha256()
+            rows = self.connection.execute(
+                "SELECT kind, state, year, filing_status, data FROM tax_data"
+                " ORDER BY kind, state, year, filing_status")
+            for row in rows:
+                digest.update(json.dumps(row).encode('utf-8'))
+            self._version = digest.hexdigest()
+        return self._version
+
+    def federal_years(self):
+        """ Returns the sorted years with stored federal data """
+        rows = self.connection.execute("SELECT DISTINCT year FROM tax_data WHERE kind = ? ORDER BY year", (FEDERAL,))
+        return [row[0] for row in rows]
+
+    def save_dicts(self,
+                   federal_tax_data=data.federal_tax_data,
+                   state_tax_data=data.state_tax_data,
+                   property_tax_data=data.property_tax_data):
+        """ Writes nested dicts shaped like the literals in `data.py` to the database """
+        for year, by_status in federal_tax_data.items():
+            for filing_status, values in by_status.items():
+                self.save(FEDERAL, None, year, filing_status, values)
+        for state, by_year in state_tax_data.items():
+            for year, by_status in by_year.items():
+                for filing_status, values in by_status.items():
+                    self.save(STATE, state, year, filing_status, values)
+        for state, by_year in property_tax_data.items():
+            for year, values in by_year.items():
+                self.save(PROPERTY, state, year, None, values)
+
+    # DAO factories, for data.TaxDataRegistry
+    def federal_tax_dao(self, year, filing_status):
+        return StoredFederalTaxDao(year, filing_status, self)
+
+    def state_tax_dao(self, state, year, filing_status):
+        return StoredStateTaxDao(state, year, filing_status, self)
+
+    def property_tax_dao(self, state, year):
+        return StoredPropertyTaxDao(state, year, self)
+
+class StoredFederalTaxDao(data.FederalTaxDao):
+    def __init__(self, year, filing_status, store):
+        super().__init__(year, filing_status)
+        self.store = store
+    def get_data(self):
+        return self.store.load(FEDERAL, None, self.year, self.filing_status)
+
+class StoredStateTaxDao(data.StateTaxDao):
+    def __init__(self, state, year, filing_status, store):
+        super().__init__(state, year, filing_status)
+        self.store = store
+    def get_data(self):
+        return self.store.load(STATE, self.state, self.year, self.filing_status)
+
+class StoredPropertyTaxDao(data.PropertyTaxDao):
+    def __init__(self, state, year, store):
+        super().__init__(state, year)
+        self.store = store
+    def get_data(self):
+        return self.store.load(PROPERTY, self.state, self.year, None)
@@ -0,0 +1,158 @@
+from collections import namedtuple
+
+import numpy as np
+
+import data
+
+
+Quantity = namedtuple('Quantity', ['name', 'inputs', 'formula'])
+Quantity.__doc__ = """ A named quantity computed by `formula(**inputs)` from other quantities or sources """
+
+class TaxGraph(object):
+    """ A DAG of named tax quantities. Names that no quantity defines are sources,
+    supplied by the caller. `evaluate` computes just what the targets need, each
+    quantity once, in topological order. Formulas use numpy operations, so the
+    sources may be scalars for one household or arrays for many.
+
+    These are the only copies of the tax formulas: `tax_calculators` computes
+    each quantity with `compute`, and `household_taxes` with `evaluate`.
+    """
+    def __init__(self, quantities):
+        super().__init__()
+        self.quantities = {quantity.name: quantity for quantity in quantities}
+        self._plans = {}
+
+    def __contains__(self, name):
+        return name in self.quantities
+
+    def plan(self, targets):
+        """ Returns the quantities needed for `targets`, dependencies first """
+        key = tuple(targets)
+        if key not in self._plans:
+            order = []
+            state = {}
+            def visit(name):
+                if name not in self.quantities or state.get(name) == 'done':
+                    return
+                if state.get(name) == 'visiting':
+                    raise ValueError("cycle in tax graph at {}".format(name))
+                state[name] = 'visiting'
+                for input_name in self.quantities[name].inputs:
+                    visit(input_name)
+                state[name] = 'done'
+                order.append(self.quantities[name])
+            for target in key:
+                if target not in self.quantities:
+                    raise KeyError(target)
+                visit(target)
+            self._plans[key] = order
+        return self._plans[key]
+
+    def sources(self, targets):
+        """ Returns the source names `targets` depend on """
+        return sorted({name for quantity in self.plan(targets) for name in quantity.inputs
+                       if name not in self.quantities})
+
+    def compute(self, name, **inputs):
+        """ Returns one quantity from the values of its direct inputs """
+        quantity = self.quantities[name]
+        return quantity.formula(**{input_name: inputs[input_name] for input_name in quantity.inputs})
+
+    def evaluate(self, sources, targets):
+        """ Returns {target: value}. `sources` maps source names to values """
+        values = dict(sources)
+        for quantity in self.plan(targets):
+            if quantity.name not in values:
+                values[quantity.name] = quantity.formula(**{name: values[name] for name in quantity.inputs})
+        return {target: values[target] for target in targets}
+
+##
+## Formulas
+##
+def _magi(gross_income, member_count, itemized_deductions, retirement_contribution, healthcare_contribution, federal_tax_data):
+    return np.maximum(
+        gross_income
+        - member_count * federal_tax_data.exemption_amount_per_person
+        - np.maximum(federal_tax_data.standard_deduction_amount, itemized_deductions)
+        - retirement_contribution
+        - healthcare_contribution,
+        0.0)
+
+def _student_loan_deduction(magi, student_loan_interest, federal_tax_data):
+    """ See http://www.irs.gov/publications/p970/ch04.html """
+    total_interest_paid = np.minimum(student_loan_interest, federal_tax_data.student_loan_max_deduction)
+    phaseout_multiplier = (magi - federal_tax_data.student_loan_phaseout_numerator_reduction) / float(federal_tax_data.student_loan_phaseout_denominator)
+    deduction_due_to_phaseout = np.maximum(total_interest_paid * phaseout_multiplier, 0.0)
+    return np.maximum(total_interest_paid - deduction_due_to_phaseout, 0.0)
+
+def _fed_agi(magi, student_loan_deduction):
+    return magi - student_loan_deduction
+
+def bracket_tax(taxable_income, tax_data):
+    """ Income tax on `taxable_income` under `tax_data`'s brackets """
+    return tax_data.bracket_schedule.income_tax(taxable_income)
+
+def _fed_tax(fed_agi, federal_tax_data):
+    return bracket_tax(fed_agi, federal_tax_data)
+
+def _medicare_tax(gross_income, healthcare_contribution, federal_tax_data):
+    return federal_tax_data.medicare_tax_rate * (gross_income - healthcare_contribution)
+
+def _social_security_tax(member_gross_incomes, federal_tax_data):
+    taxable_income = np.minimum(member_gross_incomes, federal_tax_data.social_security_tax_wage_base_limit).sum(axis=-1)
+    return federal_tax_data.social_security_tax_rate * taxable_income
+
+def _fica(medicare_tax, social_security_tax):
+    return medicare_tax + social_security_tax
+
+def _state_agi(gross_income, member_count, itemized_deductions, retirement_contribution, state_tax_data):
+    return np.maximum(
+        gross_income
+        - member_count * state_tax_data.exemption_amount_per_person
+        - np.maximum(state_tax_data.standard_deduction_amount, itemized_deductions)
+        - retirement_contribution,
+        0.0)
+
+def _state_tax(state_agi, state_tax_data):
+    return bracket_tax(state_agi, state_tax_data)
+
+def _property_tax(home_value, property_tax_data):
+    assessed_value = home_value * property_tax_data.valuation_rate
+    return assessed_value / 1000.0 * property_tax_data.mill_rate
+
+def _total_tax(fed_tax, state_tax, fica, property_tax):
+    return fed_tax + state_tax + fica + property_tax
+
+def _net_income(gross_income, retirement_contribution, healthcare_contribution, total_tax):
+    return gross_income - (retirement_contribution + healthcare_contribution) - total_tax
+
+tax_graph = TaxGraph([
+    Quantity('magi', ('gross_income', 'member_count', 'itemized_deductions', 'retirement_contribution', 'healthcare_contribution', 'federal_tax_data'), _magi),
+    Quantity('student_loan_deduction', ('magi', 'student_loan_interest', 'federal_tax_data'), _student_loan_deduction),
+    Quantity('fed_agi', ('magi', 'student_loan_deduction'), _fed_agi),
+    Quantity('fed_tax', ('fed_agi', 'federal_tax_data'), _fed_tax),
+    Quantity('medicare_tax', ('gross_income', 'healthcare_contribution', 'federal_tax_data'), _medicare_tax),
+    Quantity('social_security_tax', ('member_gross_incomes', 'federal_tax_data'), _social_security_tax),
+    Quantity('fica', ('medicare_tax', 'social_security_tax'), _fica),
+    Quantity('state_agi', ('gross_income', 'member_count', 'itemized_deductions', 'retirement_contribution', 'state_tax_data'), _state_agi),
+    Quantity('state_tax', ('state_agi', 'state_tax_data'), _state_tax),
+    Quantity('property_tax', ('home_value', 'property_tax_data'), _property_tax),
+    Quantity('total_tax', ('fed_tax', 'state_tax', 'fica', 'property_tax'), _total_tax),
+    Quantity('net_income', ('gross_income', 'retirement_contribution', 'healthcare_contribution', 'total_tax'), _net_income),
+])
+
+def family_sources(family, year, registry=data.registry):
+    """ Returns graph sources for one `people.Family` in `year` """
+    return {
+        'gross_income': family.gross_income(year),
+        'member_gross_incomes': np.array([p.gross_income(year) for p in family.members], dtype=float),
+        'member_count': family.member_count,
+        'retirement_contribution': family.retirement_contribution(year),
+        'healthcare_contribution': family.healthcare_contribution(year),
+        'itemized_deductions': family.itemized_deductions(year),
+        'student_loan_interest': family.student_loan_interest_payments(year),
+        'home_value': family.home_value,
+        'federal_tax_data': registry.federal_tax_data(year, family.filing_status),
+        'state_tax_data': registry.state_tax_data(family.state_of_residence, year, family.filing_status),
+        'property_tax_data': registry.property_tax_data(family.state_of_residence, year),
+    }
@@ -1,6 +1,8 @@
 import unittest
 from pprint import pprint
 
+import numpy as np
+
 import amortized_loan
 import month
 
@@ -54,5 +56,316 @@ class TestAmortizedLoan(unittest.TestCase):
 		pprint(loan.calculate_amortization_table())
 
 
+class TestAmortizationEngine(unittest.TestCase):
+	def make_loan(self, compound_type):
+		return amortized_loan.AmortizedLoan(160000, 10, 0.068,
+		                                    start_month=month.Month(2013, 1),
+		                                    compound_type=compound_type)
+
+	def pay_iteratively(self, loan, payment_amount=None):
+		while loan.remaining_balance > 0:
+			loan.make_payment(payment_amount)
+		return loan.payments
+
+	def assertSamePayments(self, expected, actual):
+		self.assertEqual(len(expected), len(actual))
+		for e, a in zip(expected, actual):
+			self.assertEqual(e.month, a.month)
+			self.assertAlmostEqual(e.interest_amount, a.interest_amount, 6)
+			self.assertAlmostEqual(e.principle_amount, a.principle_amount, 6)
+			self.assertAlmostEqual(e.new_balance, a.new_balance, 6)
+
+	def test_monthly_matches_payments(self):
+		cmpd_type = amortized_loan.CompoundType.MONTHLY
+		expected = self.pay_iteratively(self.make_loan(cmpd_type))
+		actual = self.make_loan(cmpd_type).calculate_amortization_table()
+		self.assertSamePayments(expected, actual)
+
+	def test_daily_matches_payments(self):
+		cmpd_type = amortized_loan.CompoundType.DAILY
+		expected = self.pay_iteratively(self.make_loan(cmpd_type))
+		actual = self.make_loan(cmpd_type).calculate_amortization_table()
+		self.assertSamePayments(expected, actual)
+		self.assertEqual(actual[0].interest_amount, 0)
+
+	def test_daily_day_gaps(self):
+		loan = self.make_loan(amortized_loan.CompoundType.DAILY)
+		start = loan.start_month
+		expected = [0] + [start.monthadd(k - 1).datediff(month.DatePart.DAY, start.monthadd(k)) for k in range(1, 120)]
+		self.assertEqual(list(loan.compounder.day_gaps(start, 120)), expected)
+		self.assertEqual(list(loan.compounder.day_gaps(start.monthadd(5), 10, start.monthadd(4))), expected[5:15])
+		self.assertEqual(list(loan.compounder.day_gaps(start.monthadd(5), 200, start.monthadd(2)))[:3],
+		                 [sum(expected[3:6]), expected[6], expected[7]])
+
+	def test_resumes_after_payments(self):
+		cmpd_type = amortized_loan.CompoundType.DAILY
+		expected = self.pay_iteratively(self.make_loan(cmpd_type), 6000)
+		loan = self.make_loan(cmpd_type)
+		loan.make_payment(6000)
+		loan.make_payment(6000)
+		actual = loan.calculate_amortization_table(6000)
+		self.assertSamePayments(expected, actual)
+
+	def test_unpayable_loan(self):
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		with self.assertRaises(ValueError):
+			loan.calculate_amortization_table(100)
+
+
+class TestLoanPortfolio(unittest.TestCase):
+	def setUp(self):
+		self.start_month = month.Month(2014, 1)
+		self.amounts = [200000, 140000, 130000, 160000]
+		self.terms = [30, 15, 10, 10]
+		self.aprs = [0.05, 0.04, 0.065, 0.068]
+		self.types = [amortized_loan.CompoundType.MONTHLY,
+		              amortized_loan.CompoundType.MONTHLY,
+		              amortized_loan.CompoundType.DAILY,
+		              amortized_loan.CompoundType.DAILY]
+		self.portfolio = amortized_loan.LoanPortfolio(self.amounts, self.terms, self.aprs,
+		                                              self.start_month, self.types)
+
+	def single_loans(self):
+		return [amortized_loan.AmortizedLoan(a, t, r, self.start_month, c)
+		        for a, t, r, c in zip(self.amounts, self.terms, self.aprs, self.types)]
+
+	def test_min_pmt(self):
+		expected = [loan.minimum_payment for loan in self.single_loans()]
+		for e, a in zip(expected, self.portfolio.minimum_payment):
+			self.assertAlmostEqual(e, a, 6)
+
+	def test_matches_single_loans(self):
+		schedule = self.portfolio.calculate_amortization_table()
+		self.assertEqual(schedule.interest_amounts.shape, (4, 360))
+		for i, loan in enumerate(self.single_loans()):
+			payments = loan.calculate_amortization_table()
+			count = len(payments)
+			self.assertEqual(schedule.payment_counts[i], count)
+			self.assertEqual(schedule.payoff_months[i], loan.last_payment_month)
+			self.assertAlmostEqual(schedule.total_interest_paid[i], loan.total_interest_paid(), 6)
+			for column in ('interest_amounts', 'principle_amounts', 'new_balances'):
+				for e, a in zip(getattr(payments, column), getattr(schedule, column)[i, :count]):
+					self.assertAlmostEqual(e, a, 6)
+			self.assertFalse(schedule.interest_amounts[i, count:].any())
+
+	def test_regular_payment_amounts(self):
+		schedule = self.portfolio.calculate_amortization_table([2000, 2000, 6000, 6000])
+		loan = self.single_loans()[3]
+		loan.calculate_amortization_table(6000)
+		self.assertEqual(schedule.payoff_months[3], loan.last_payment_month)
+		self.assertAlmostEqual(schedule.total_interest_paid[3], loan.total_interest_paid(), 6)
+
+
+class TestPaymentSweep(unittest.TestCase):
+	def make_loan(self):
+		return amortized_loan.AmortizedLoan(160000, 10, 0.068,
+		                                    start_month=month.Month(2013, 1),
+		                                    compound_type=amortized_loan.CompoundType.DAILY)
+
+	def test_matches_single_tables(self):
+		amounts = [1837.78, 3000, 6000]
+		sweep = self.make_loan().payment_sweep(amounts)
+		years = list(sweep.years)
+		interest_by_year = sweep.interest_by_year()
+		for i, amount in enumerate(amounts):
+			loan = self.make_loan()
+			loan.calculate_amortization_table(amount)
+			self.assertEqual(sweep.payoff_months[i], loan.last_payment_month)
+			self.assertAlmostEqual(sweep.total_interest_paid[i], loan.total_interest_paid(), 6)
+			for year in (2013, 2014, 2016):
+				self.assertAlmostEqual(interest_by_year[i, years.index(year)], loan.total_interest_paid(year), 6)
+
+	def test_extra_payments(self):
+		loan = self.make_loan()
+		sweep = loan.payment_sweep(extra_payment_amounts=[0, 500, 1000])
+		self.assertAlmostEqual(sweep.interest_saved[0], 0, 6)
+		self.assertTrue(sweep.interest_saved[2] > sweep.interest_saved[1] > 0)
+		self.assertTrue(sweep.payment_counts[2] < sweep.payment_counts[1] < sweep.payment_counts[0])
+		self.assertEqual(loan.remaining_balance, 160000)
+
+	def test_resumes_after_payments(self):
+		loan = self.make_loan()
+		loan.make_payment(6000)
+		sweep = loan.payment_sweep(6000)
+		loan.calculate_amortization_table(6000)
+		self.assertEqual(sweep.payoff_months[0], loan.last_payment_month)
+		self.assertAlmostEqual(sweep.total_interest_paid[0] + loan.payments[0].interest_amount,
+		                       loan.total_interest_paid(), 6)
+
+
+class TestPointInTimeQueries(unittest.TestCase):
+	def make_loan(self, compound_type):
+		return amortized_loan.AmortizedLoan(200000, 30, 0.05,
+		                                    start_month=month.Month(2014, 1),
+		                                    compound_type=compound_type)
+
+	def assertMatchesTable(self, loan, table_loan):
+		payments = table_loan.calculate_amortization_table()
+		for i in (0, 11, 59, 200, len(payments) - 1):
+			self.assertAlmostEqual(loan.balance_at(payments[i].month), payments[i].new_balance, 6)
+		self.assertAlmostEqual(loan.balance_at(month.Month(2013, 12)), 200000)
+		self.assertAlmostEqual(loan.balance_at(month.Month(2050, 1)), 0)
+		for year in (2014, 2015, 2030, 2043, 2044):
+			self.assertAlmostEqual(loan.interest_in_year(year), table_loan.total_interest_paid(year), 6)
+		self.assertAlmostEqual(loan.cumulative_interest_between(month.Month(2013, 1), month.Month(2060, 1)),
+		                       table_loan.total_interest_paid(), 6)
+
+	def test_closed_form(self):
+		cmpd_type = amortized_loan.CompoundType.MONTHLY
+		loan = self.make_loan(cmpd_type)
+		self.assertTrue(loan._uses_closed_form())
+		self.assertMatchesTable(loan, self.make_loan(cmpd_type))
+		self.assertAlmostEqual(loan.interest_in_year(2014), 9932.99, 2)
+		self.assertIsNone(loan._projected_schedule)
+
+	def test_daily_uses_schedule(self):
+		cmpd_type = amortized_loan.CompoundType.DAILY
+		loan = self.make_loan(cmpd_type)
+		self.assertFalse(loan._uses_closed_form())
+		self.assertMatchesTable(loan, self.make_loan(cmpd_type))
+
+	def test_extra_payments_use_schedule(self):
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		loan.make_payment(5000)
+		self.assertFalse(loan._uses_closed_form())
+		balance = loan.remaining_balance
+		self.assertAlmostEqual(loan.balance_at(month.Month(2014, 1)), balance)
+		loan.calculate_amortization_table()
+		self.assertAlmostEqual(loan.balance_at(month.Month(2014, 2)), loan.payments[1].new_balance, 6)
+		self.assertAlmostEqual(loan.interest_in_year(2020), loan.total_interest_paid(2020), 6)
+
+
+class TestPayoffTarget(unittest.TestCase):
+	def make_loan(self, compound_type):
+		return amortized_loan.AmortizedLoan(160000, 10, 0.068,
+		                                    start_month=month.Month(2013, 1),
+		                                    compound_type=compound_type)
+
+	def test_term_gives_min_pmt(self):
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		self.assertAlmostEqual(loan.payment_to_pay_off_by(month.Month(2022, 12)), loan.minimum_payment, 6)
+
+	def test_pays_off_in_target_month(self):
+		targets = [month.Month(2015, 6), month.Month(2018, 1), month.Month(2025, 12)]
+		for cmpd_type in (amortized_loan.CompoundType.MONTHLY, amortized_loan.CompoundType.DAILY):
+			loan = self.make_loan(cmpd_type)
+			payments = loan.payment_to_pay_off_by(targets)
+			for target, payment in zip(targets, payments):
+				table_loan = self.make_loan(cmpd_type)
+				table_loan.calculate_amortization_table(payment)
+				self.assertEqual(table_loan.last_payment_month, target)
+				late_loan = self.make_loan(cmpd_type)
+				late_loan.calculate_amortization_table(payment - 0.01)
+				self.assertEqual(late_loan.last_payment_month, target.monthadd(1))
+
+	def test_after_payments(self):
+		loan = self.make_loan(amortized_loan.CompoundType.DAILY)
+		loan.make_payment(3000)
+		payment = loan.payment_to_pay_off_by(month.Month(2016, 12))
+		loan.calculate_amortization_table(payment)
+		self.assertEqual(loan.last_payment_month, month.Month(2016, 12))
+
+	def test_target_in_past(self):
+		loan = self.make_loan(amortized_loan.CompoundType.DAILY)
+		with self.assertRaises(ValueError):
+			loan.payment_to_pay_off_by(month.Month(2012, 12))
+
+	def test_portfolio(self):
+		portfolio = amortized_loan.LoanPortfolio([160000, 100000], 10, [0.068, 0.05], month.Month(2013, 1),
+		                                         [amortized_loan.CompoundType.DAILY, amortized_loan.CompoundType.MONTHLY])
+		targets = [month.Month(2016, 12), month.Month(2020, 6)]
+		payments = portfolio.payment_to_pay_off_by(targets)
+		self.assertEqual(payments.shape, (2, 2))
+		self.assertAlmostEqual(payments[0, 1], self.make_loan(amortized_loan.CompoundType.DAILY).payment_to_pay_off_by(targets[1]), 6)
+
+
+class TestRatePath(unittest.TestCase):
+	def setUp(self):
+		self.start_month = month.Month(2014, 1)
+		# 5/1 ARM: 4% for five years, then yearly resets
+		self.rate_path = amortized_loan.RatePath([(self.start_month, 0.04),
+		                                          (month.Month(2019, 1), 0.06),
+		                                          (month.Month(2020, 1), 0.07),
+		                                          (month.Month(2021, 1), 0.05)])
+
+	def make_loan(self, compound_type, rate_path=None):
+		return amortized_loan.AmortizedLoan(200000, 30, None, self.start_month, compound_type,
+		                                    rate_path or self.rate_path)
+
+	def pay_iteratively(self, loan, payment_amount=None):
+		while loan.remaining_balance > 0:
+			loan.make_payment(payment_amount)
+		return loan.payments
+
+	def test_apr_at(self):
+		self.assertEqual(self.rate_path.apr_at(month.Month(2013, 6)), 0.04)
+		self.assertEqual(self.rate_path.apr_at(month.Month(2018, 12)), 0.04)
+		self.assertEqual(self.rate_path.apr_at(month.Month(2019, 1)), 0.06)
+		self.assertEqual(self.rate_path.apr_at(month.Month(2040, 1)), 0.05)
+
+	def test_from_monthly_aprs(self):
+		rate_path = amortized_loan.RatePath.from_monthly_aprs(self.start_month, [0.04] * 60 + [0.06] * 12 + [0.07] * 12 + [0.05])
+		self.assertEqual(list(rate_path.start_ordinals), list(self.rate_path.start_ordinals))
+		self.assertEqual(list(rate_path.aprs), list(self.rate_path.aprs))
+
+	def test_recast_at_reset(self):
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		payments = loan.calculate_amortization_table()
+		self.assertEqual(len(payments), 360)
+		self.assertAlmostEqual(payments[59].payment_amount, 954.83, 2)
+		balance = payments[59].new_balance
+		self.assertAlmostEqual(payments[60].payment_amount, -np.pmt(0.06 / 12, 300, balance), 6)
+		self.assertAlmostEqual(payments[60].interest_amount, 0.06 / 12 * balance, 6)
+		self.assertEqual(loan.apr, 0.05)
+
+	def test_matches_payments(self):
+		for cmpd_type in (amortized_loan.CompoundType.MONTHLY, amortized_loan.CompoundType.DAILY):
+			expected = self.pay_iteratively(self.make_loan(cmpd_type))
+			actual = self.make_loan(cmpd_type).calculate_amortization_table()
+			self.assertEqual(len(expected), len(actual))
+			for column in ('payment_amounts', 'interest_amounts', 'principle_amounts', 'new_balances'):
+				for e, a in zip(getattr(expected, column), getattr(actual, column)):
+					self.assertAlmostEqual(e, a, 6)
+
+	def test_fixed_payment(self):
+		expected = self.pay_iteratively(self.make_loan(amortized_loan.CompoundType.DAILY), 2000)
+		actual = self.make_loan(amortized_loan.CompoundType.DAILY).calculate_amortization_table(2000)
+		self.assertEqual(len(expected), len(actual))
+		self.assertAlmostEqual(expected.totals().interest_amount, actual.totals().interest_amount, 6)
+
+	def test_apr_must_match_path(self):
+		self.assertEqual(self.make_loan(amortized_loan.CompoundType.MONTHLY).apr, 0.04)
+		loan = amortized_loan.AmortizedLoan(200000, 30, 0.04, self.start_month,
+		                                    amortized_loan.CompoundType.MONTHLY, self.rate_path)
+		self.assertEqual(loan.apr, 0.04)
+		with self.assertRaises(ValueError):
+			amortized_loan.AmortizedLoan(200000, 30, 0.09, self.start_month,
+			                             amortized_loan.CompoundType.MONTHLY, self.rate_path)
+		with self.assertRaises(ValueError):
+			amortized_loan.AmortizedLoan(200000, 30, None, self.start_month,
+			                             amortized_loan.CompoundType.MONTHLY)
+
+	def test_constant_path_matches_fixed_rate(self):
+		rate_path = amortized_loan.RatePath([(self.start_month, 0.05)])
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY, rate_path)
+		loan.calculate_amortization_table()
+		self.assertAlmostEqual(loan.total_interest_paid(), 186511.57, 2)
+
+
+	def test_payment_sweep_against_recast_schedule(self):
+		loan = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		with self.assertRaises(ValueError):
+			loan.payment_sweep()
+		sweep = loan.payment_sweep([1500, 2000])
+		self.assertEqual(len(sweep), 2)
+
+		recast = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		recast.calculate_amortization_table()
+		self.assertAlmostEqual(sweep.minimum_payment_total_interest, recast.total_interest_paid(), 6)
+		fixed = self.make_loan(amortized_loan.CompoundType.MONTHLY)
+		fixed.calculate_amortization_table(2000)
+		self.assertAlmostEqual(sweep.interest_saved[1], recast.total_interest_paid() - fixed.total_interest_paid(), 6)
+		self.assertEqual(loan.remaining_balance, 200000)
+
 if __name__ == '__main__':
 	unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+import data
+import people
+import tax_calculators
+
+class TestTaxDataRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = data.TaxDataRegistry()
+
+    def tearDown(self):
+        pass
+
+    def test_shared_instances(self):
+        federal = self.registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertIs(federal, self.registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT))
+        self.assertIsNot(federal, self.registry.federal_tax_data(2014, data.FilingStatus.MARRIED_JOINT))
+
+        state = self.registry.state_tax_data('GA', 2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertIs(state, self.registry.state_tax_data('GA', 2013, data.FilingStatus.MARRIED_JOINT))
+
+        property_ = self.registry.property_tax_data('GA', 2013)
+        self.assertIs(property_, self.registry.property_tax_data('GA', 2013))
+
+    def test_matches_dao(self):
+        federal = self.registry.federal_tax_data(2014, data.FilingStatus.MARRIED_JOINT)
+        expected = data.FederalTaxData(2014, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(federal.tax_brackets, expected.tax_brackets)
+        self.assertEqual(federal.standard_deduction_amount, expected.standard_deduction_amount)
+        self.assertEqual(federal.bracket_schedule.income_tax(100000), expected.bracket_schedule.income_tax(100000))
+
+    def test_bracket_arrays_read_only(self):
+        schedule = self.registry.state_tax_data('GA', 2013, data.FilingStatus.MARRIED_JOINT).bracket_schedule
+        with self.assertRaises(ValueError):
+            schedule.rates[0] = 0.5
+
+    def test_instances_read_only(self):
+        federal = self.registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT)
+        with self.assertRaises(AttributeError):
+            federal.standard_deduction_amount = 1
+        with self.assertRaises(AttributeError):
+            federal.standard_deduction = 1
+        with self.assertRaises(AttributeError):
+            del federal.tax_brackets
+        with self.assertRaises(AttributeError):
+            self.registry.state_tax_data('GA', 2013, data.FilingStatus.MARRIED_JOINT).exemption_amount_per_person = 0
+        with self.assertRaises(AttributeError):
+            self.registry.property_tax_data('GA', 2013).mill_rate = 0
+        self.assertEqual(self.registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT).standard_deduction_amount, 12200)
+
+    def test_parameter_by_year(self):
+        years = np.array([2014, 2013, 2013, 2014])
+        std_deductions = self.registry.federal_parameter('standard_deduction_amount', years, data.FilingStatus.MARRIED_JOINT)
+        np.testing.assert_array_equal(std_deductions, [12400, 12200, 12200, 12400])
+
+        mill_rates = self.registry.property_parameter('mill_rate', 'GA', [[2013], [2014]])
+        self.assertEqual(mill_rates.shape, (2, 1))
+
+        exemptions = self.registry.state_parameter('exemption_amount_per_person', 'GA', [2013], data.FilingStatus.MARRIED_JOINT)
+        np.testing.assert_array_equal(exemptions, [2700])
+
+    def test_latest_tax_years(self):
+        np.testing.assert_array_equal(self.registry.latest_tax_years([2013, 2014, 2015, 2040]), [2013, 2014, 2014, 2014])
+        with self.assertRaises(ValueError):
+            self.registry.latest_tax_years([2012, 2013])
+
+    def test_calculators_share_tax_data(self):
+        person = people.Person('p')
+        person.set_gross_income(2013, 80000)
+        family = people.Family((person,), data.FilingStatus.MARRIED_JOINT, 'GA')
+        first = tax_calculators.FederalIncomeTaxCalculator(family, 2013)
+        second = tax_calculators.MedicareTaxCalculator(family, 2013)
+        self.assertIs(first.tax_data, second.tax_data)
+        self.assertIs(first.tax_data, data.registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT))
+
+if __name__ == '__main__':
+    unittest.main()
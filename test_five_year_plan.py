@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import tax_calculators
+import five_year_plan
+import data
+from month import Month
+
+class TestPlanProjection(unittest.TestCase):
+    def setUp(self):
+        self.p1 = people.Person('p1')
+        self.p2 = people.Person('p2')
+        for year, (income1, income2) in zip((2013, 2014), ((80000, 100000), (84000, 103000))):
+            self.p1.set_gross_income(year, income1)
+            self.p1.set_retirement_contribution_rate(year, 0.05)
+            self.p1.set_healthcare_contribution(year, 1090)
+            self.p2.set_gross_income(year, income2)
+            self.p2.set_retirement_contribution_rate(year, 0.06)
+        self.family = people.Family((self.p1, self.p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+
+        self.home = home.Home(Month(2013, 1), 300000, 0.10, 0.045, 30, 0.005)
+        self.home.calculate_amortization_table()
+        self.family.home = self.home
+        self.student_loan = common_loans.StudentLoan(Month(2013, 1), 40000, 0.068)
+        self.student_loan.calculate_amortization_table()
+        self.family.student_loan = self.student_loan
+
+    def tearDown(self):
+        pass
+
+    def test_matches_tax_calculator(self):
+        projection = five_year_plan.PlanProjection(self.family, [2013, 2014])
+        values = projection.calculate()
+        self.assertEqual(values.shape, (2, len(projection.metrics)))
+        for row, year in enumerate((2013, 2014)):
+            tax_calculator = tax_calculators.TaxCalculator(self.family, year)
+            self.assertAlmostEqual(projection.metric('federal_agi')[row], tax_calculator.federal_agi)
+            self.assertAlmostEqual(projection.metric('federal_taxes')[row], tax_calculator.federal_taxes)
+            self.assertAlmostEqual(projection.metric('state_taxes')[row], tax_calculator.state_taxes)
+            self.assertAlmostEqual(projection.metric('fica_taxes')[row], tax_calculator.fica_taxes)
+            self.assertAlmostEqual(projection.metric('property_taxes')[row], tax_calculator.property_taxes)
+            self.assertAlmostEqual(projection.metric('total_taxes')[row], tax_calculator.total_taxes)
+            self.assertAlmostEqual(projection.metric('net_income')[row], tax_calculators.NetIncomeCalculator(self.family, year).calculate())
+
+    def test_loans_sliced_by_year(self):
+        years = np.arange(2013, 2053)
+        projection = five_year_plan.PlanProjection(self.family, years)
+        np.testing.assert_array_equal(projection.tax_years, np.minimum(years, 2014))
+        projection.calculate()
+        mortgage_interest = projection.metric('mortgage_interest')
+        for row, year in enumerate(years):
+            self.assertAlmostEqual(mortgage_interest[row], self.home.total_interest_paid(int(year)))
+            self.assertAlmostEqual(projection.metric('pmi')[row], self.home.pmi_paid(int(year)))
+
+        mortgage_balance = projection.metric('mortgage_balance')
+        self.assertTrue((np.diff(mortgage_balance) <= 0).all())
+        self.assertAlmostEqual(mortgage_balance[-1], 0)
+        self.assertAlmostEqual(mortgage_balance[0], self.home.payments[11].new_balance)
+        self.assertAlmostEqual(projection.metric('student_loan_balance')[10], 0)
+
+        # no income set past 2014
+        self.assertEqual(projection.metric('gross_income')[5], 0)
+
+    def test_years_before_tax_data(self):
+        with self.assertRaisesRegex(ValueError, '2010'):
+            five_year_plan.PlanProjection(self.family, np.arange(2010, 2015))
+
+    def test_no_loans(self):
+        self.family.home = None
+        self.family.student_loan = None
+        projection = five_year_plan.PlanProjection(self.family, [2013])
+        self.assertEqual(projection.metric('mortgage_balance')[0], 0)
+        self.assertEqual(projection.metric('property_taxes')[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
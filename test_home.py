@@ -52,6 +52,32 @@ class TestMortgageZeroDown(unittest.TestCase):
         self.assertAlmostEqual(payments[0].interest_amount, 833.33, 2)
         self.assertAlmostEqual(payments[0].principle_amount, 240.31, 2)
         self.assertAlmostEqual(payments[0].pmi_amount, 166.67, 2)
+        self.assertAlmostEqual(payments[0].total_payment_amount, 1240.31, 2)
+
+    def test_pmi_cancellation(self):
+        cancellation_month = self.loan.pmi_cancellation_month
+        payments = self.loan.calculate_amortization_table()
+        first_without_pmi = [p.month for p in payments if p.pmi_amount == 0][0]
+        self.assertEqual(cancellation_month, first_without_pmi)
+        self.assertTrue(payments[cancellation_month.ordinal - self.purchase_month.ordinal - 1].pmi_amount > 0)
+        self.assertAlmostEqual(self.loan.pmi_paid(2014), 12 * 166.67, 1)
+        self.assertAlmostEqual(self.loan.pmi_paid(2043), 0, 2)
+
+    def test_matches_monthly_payments(self):
+        expected = home.Home(self.purchase_month, self.amt, self.down_payment_percent, self.apr, self.term, self.pmi_rate)
+        while expected.remaining_balance > 0:
+            expected.make_monthly_payment()
+        payments = self.loan.calculate_amortization_table()
+        self.assertEqual(len(expected.payments), len(payments))
+        for e, a in zip(expected.payments.pmi_amounts, payments.pmi_amounts):
+            self.assertAlmostEqual(e, a, 6)
+        for year in (2014, 2020, 2025):
+            self.assertAlmostEqual(expected.pmi_paid(year), self.loan.pmi_paid(year), 6)
+
+    def test_shared_schedule(self):
+        payments = self.loan.calculate_amortization_table()
+        self.assertIs(payments, self.loan.mortgage.payments)
+        self.assertIs(payments, self.loan.mortgage.mortgage_loan.payments)
 
     def test_last_payment(self):
         payments = self.loan.calculate_amortization_table()
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import tax_calculators
+import household_taxes
+import data
+from month import Month
+
+class TestHouseholdTaxEngine(unittest.TestCase):
+    def setUp(self):
+        self.year = 2013
+        self.families = []
+        incomes = ((0, 0), (20000, 15000), (60000, 45000), (150000, 90000), (400000, 120000))
+        for i, (income1, income2) in enumerate(incomes):
+            p1 = people.Person('p1')
+            p1.set_gross_income(self.year, income1)
+            p1.set_retirement_contribution_rate(self.year, 0.05)
+            p1.set_healthcare_contribution(self.year, 1090)
+            p2 = people.Person('p2')
+            p2.set_gross_income(self.year, income2)
+            p2.set_retirement_contribution_rate(self.year, 0.06)
+            self.families.append(people.Family((p1, p2), data.FilingStatus.MARRIED_JOINT, 'GA'))
+
+        single = people.Person('single')
+        single.set_gross_income(self.year, 70000)
+        self.families.append(people.Family((single,), data.FilingStatus.MARRIED_JOINT, 'GA'))
+
+        house = home.Home(Month(self.year, 1), 250000, 0.10, 0.045, 30, 0.005)
+        house.calculate_amortization_table()
+        self.families[3].home = house
+        self.families[3].add_deduction(self.year, people.Deduction('charity', 4000))
+
+        student_loan = common_loans.StudentLoan(Month(self.year, 1), 40000, 0.068)
+        student_loan.calculate_amortization_table()
+        self.families[2].student_loan = student_loan
+        self.families[4].student_loan = student_loan
+
+    def tearDown(self):
+        pass
+
+    def test_matches_tax_calculator(self):
+        table = household_taxes.HouseholdTable.from_families(self.families, self.year)
+        taxes = household_taxes.HouseholdTaxEngine(self.year).calculate(table)
+        for row, family in enumerate(self.families):
+            tax_calculator = tax_calculators.TaxCalculator(family, self.year)
+            self.assertAlmostEqual(taxes.federal_agi[row], tax_calculator.federal_agi)
+            self.assertAlmostEqual(taxes.state_agi[row], tax_calculator.state_agi)
+            self.assertAlmostEqual(taxes.student_loan_interest_deduction[row], tax_calculator.student_loan_interest_deduction)
+            self.assertAlmostEqual(taxes.federal[row], tax_calculator.federal_taxes)
+            self.assertAlmostEqual(taxes.fica[row], tax_calculator.fica_taxes)
+            self.assertAlmostEqual(taxes.state[row], tax_calculator.state_taxes)
+            self.assertAlmostEqual(taxes.property[row], tax_calculator.property_taxes)
+            self.assertAlmostEqual(taxes.total[row], tax_calculator.total_taxes)
+
+    def test_padded_members(self):
+        table = household_taxes.HouseholdTable.from_families(self.families, self.year)
+        self.assertEqual(table.gross_incomes.shape, (len(self.families), 2))
+        np.testing.assert_array_equal(table.member_counts, [2, 2, 2, 2, 2, 1])
+        self.assertEqual(table.gross_income[-1], 70000)
+
+    def test_broadcast_columns(self):
+        table = household_taxes.HouseholdTable(
+            [[50000, 40000], [120000, 0]],
+            data.FilingStatus.MARRIED_JOINT,
+            'GA',
+            retirement_contribution_rates=0.05,
+            member_counts=[2, 1])
+        taxes = household_taxes.HouseholdTaxEngine(self.year).calculate(table)
+        self.assertEqual(taxes.total.shape, (2,))
+        np.testing.assert_array_equal(taxes.property, [0, 0])
+        self.assertAlmostEqual(table.retirement_contribution[0], 4500)
+
+    def test_empty_table(self):
+        table = household_taxes.HouseholdTable.from_families([], self.year)
+        taxes = household_taxes.HouseholdTaxEngine(self.year).calculate(table)
+        self.assertEqual(len(taxes.total), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import tax_calculators
+import household_taxes
+import income_solver
+import data
+from month import Month
+
+class TestIncomeSolver(unittest.TestCase):
+    def setUp(self):
+        self.year = 2013
+        self.p1 = people.Person('p1')
+        self.p1.set_gross_income(self.year, 90000)
+        self.p1.set_retirement_contribution_rate(self.year, 0.05)
+        self.p1.set_healthcare_contribution(self.year, 1090)
+        self.p2 = people.Person('p2')
+        self.p2.set_gross_income(self.year, 60000)
+        self.p2.set_retirement_contribution_rate(self.year, 0.06)
+        self.family = people.Family((self.p1, self.p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+        self.solver = income_solver.IncomeSolver(self.year)
+
+    def tearDown(self):
+        pass
+
+    def net_income(self, family):
+        return tax_calculators.NetIncomeCalculator(family, self.year).calculate()
+
+    def scale_incomes(self, scale):
+        for p in self.family.members:
+            p.set_gross_income(self.year, p.gross_income(self.year) * scale)
+
+    def test_current_income_is_fixed_point(self):
+        net_income = self.net_income(self.family)
+        self.assertAlmostEqual(self.solver.family_income_scale(self.family, net_income), 1.0)
+
+    def test_raise_for_big_house(self):
+        net_income = self.net_income(self.family)
+        house = home.Home(Month(self.year, 1), 600000, 0.10, 0.045, 30, 0.005)
+        house.calculate_amortization_table()
+        self.family.home = house
+        self.assertLess(self.net_income(self.family), net_income)
+
+        scale = self.solver.family_income_scale(self.family, net_income)
+        self.assertGreater(scale, 1.0)
+        gross_income = self.solver.family_gross_income(self.family, net_income)
+        self.assertAlmostEqual(gross_income, 150000 * scale)
+
+        self.scale_incomes(scale)
+        self.assertAlmostEqual(self.net_income(self.family), net_income, 4)
+
+    def test_student_loan_phaseout(self):
+        student_loan = common_loans.StudentLoan(Month(self.year, 1), 60000, 0.068)
+        student_loan.calculate_amortization_table()
+        self.family.student_loan = student_loan
+        for target in (40000, 100000, 130000, 250000):
+            scale = self.solver.family_income_scale(self.family, target)
+            table = household_taxes.HouseholdTable.from_families([self.family], self.year)
+            self.assertAlmostEqual(self.solver.net_incomes(table, [scale])[0], target, 4)
+
+    def test_batch(self):
+        rng = np.random.RandomState(0)
+        gross_incomes = rng.uniform(10000, 200000, (500, 2))
+        table = household_taxes.HouseholdTable(gross_incomes, data.FilingStatus.MARRIED_JOINT, 'GA',
+                                               retirement_contribution_rates=0.05,
+                                               healthcare_contributions=1000,
+                                               mortgage_interest=rng.uniform(0, 20000, 500))
+        targets = rng.uniform(20000, 300000, 500)
+        scales = self.solver.income_scales(table, targets)
+        self.assertFalse(np.isnan(scales).any())
+        np.testing.assert_allclose(self.solver.net_incomes(table, scales), targets, atol=1e-4)
+
+    def test_unreachable_targets(self):
+        table = household_taxes.HouseholdTable([[0, 0], [50000, 0]], data.FilingStatus.MARRIED_JOINT, 'GA',
+                                               healthcare_contributions=[[0, 0], [1000, 0]])
+        scales = self.solver.income_scales(table, [10000, -5000])
+        self.assertTrue(np.isnan(scales[0]))
+        self.assertEqual(scales[1], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import amortized_loan
+import five_year_plan
+import monte_carlo
+import data
+from month import Month
+
+class TestMonteCarloModel(unittest.TestCase):
+    def setUp(self):
+        self.years = np.arange(2013, 2018)
+        self.p1 = people.Person('p1')
+        self.p2 = people.Person('p2')
+        for year in self.years.tolist():
+            self.p1.set_gross_income(year, 80000)
+            self.p1.set_retirement_contribution_rate(year, 0.05)
+            self.p1.set_healthcare_contribution(year, 1090)
+            self.p2.set_gross_income(year, 100000)
+            self.p2.set_retirement_contribution_rate(year, 0.06)
+        self.family = people.Family((self.p1, self.p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+
+        self.home = home.Home(Month(2013, 1), 300000, 0.10, 0.045, 30, 0.005)
+        self.home.calculate_amortization_table()
+        self.family.home = self.home
+        self.student_loan = common_loans.StudentLoan(Month(2013, 1), 40000, 0.068)
+        self.student_loan.calculate_amortization_table()
+        self.family.student_loan = self.student_loan
+        self.tax_years = np.minimum(self.years, 2014)
+
+    def tearDown(self):
+        pass
+
+    def make_model(self, **kwargs):
+        return monte_carlo.MonteCarloModel(self.family, self.years, tax_years=self.tax_years, **kwargs)
+
+    def assert_no_spread_matches_projection(self):
+        model = self.make_model(path_count=3, seed=0, income_growth_mean=0, income_growth_sd=0,
+                                apr_sd=0, appreciation_mean=0, appreciation_sd=0)
+        results = model.run()
+        projection = five_year_plan.PlanProjection(self.family, self.years, tax_years=self.tax_years)
+        projection.calculate()
+        purchase_amount = self.family.home.purchase_amount
+        for path in range(3):
+            np.testing.assert_allclose(results['net_income'][path], projection.metric('net_income'))
+            np.testing.assert_allclose(results['total_taxes'][path], projection.metric('total_taxes'))
+            np.testing.assert_allclose(results['mortgage_interest'][path], projection.metric('mortgage_interest'), atol=1e-6)
+            np.testing.assert_allclose(results['pmi'][path], projection.metric('pmi'))
+            np.testing.assert_allclose(results['mortgage_balance'][path], projection.metric('mortgage_balance'), atol=1e-6)
+            np.testing.assert_allclose(results['equity'][path], purchase_amount - projection.metric('mortgage_balance'), atol=1e-6)
+
+    def replace_home(self, home_):
+        home_.calculate_amortization_table()
+        self.family.home = home_
+
+    def test_no_spread_matches_projection(self):
+        self.assert_no_spread_matches_projection()
+
+    def test_purchase_after_first_year(self):
+        self.replace_home(home.Home(Month(2015, 7), 300000, 0.10, 0.045, 30, 0.005))
+        self.assert_no_spread_matches_projection()
+
+    def test_rate_path(self):
+        rate_path = amortized_loan.RatePath([(Month(2013, 1), 0.04),
+                                             (Month(2015, 1), 0.06),
+                                             (Month(2016, 1), 0.05)])
+        self.replace_home(home.Home(Month(2013, 1), 300000, 0.10, 0.04, 30, 0.005, rate_path))
+        self.assert_no_spread_matches_projection()
+
+        # drawn aprs move the whole path
+        results = self.make_model(path_count=200, seed=3).run()
+        interest = results['mortgage_interest']
+        self.assertTrue((interest[:, 2] > interest[:, 1]).all())
+
+    def test_seeded(self):
+        first = self.make_model(path_count=50, seed=7).run()
+        second = self.make_model(path_count=50, seed=7).run()
+        other = self.make_model(path_count=50, seed=8).run()
+        np.testing.assert_array_equal(first['net_income'], second['net_income'])
+        self.assertFalse(np.array_equal(first['net_income'], other['net_income']))
+
+    def test_bands(self):
+        results = self.make_model(path_count=400, seed=1).run()
+        self.assertEqual(len(results), 400)
+        bands = results.bands()
+        self.assertEqual(list(bands), list(monte_carlo.BAND_METRICS))
+        for band in bands.values():
+            self.assertEqual(band.shape, (len(monte_carlo.DEFAULT_PERCENTILES), len(self.years)))
+            self.assertTrue((np.diff(band, axis=0) >= 0).all())
+        # incomes all start from the same first year
+        self.assertAlmostEqual(np.ptp(results['gross_income'][:, 0]), 0)
+        self.assertGreater(np.ptp(results['gross_income'][:, -1]), 0)
+        # a higher apr means more interest in the first year
+        interest = results['mortgage_interest'][:, 0]
+        self.assertGreater(interest.max(), self.home.total_interest_paid(2013))
+        self.assertLess(interest.min(), self.home.total_interest_paid(2013))
+
+    def test_no_home(self):
+        self.family.home = None
+        results = self.make_model(path_count=10, seed=0).run()
+        for metric in ('equity', 'pmi', 'mortgage_interest', 'home_value'):
+            self.assertTrue((results[metric] == 0).all())
+
+if __name__ == '__main__':
+    unittest.main()
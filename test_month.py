@@ -64,9 +64,36 @@ class TestMonth(unittest.TestCase):
         diff = self.m2.datediff(part, self.m1)
         self.assertEqual(diff, -424)
 
+    def test_datediff_day_leap_year(self):
+        part = month.DatePart.DAY
+        self.assertEqual(month.Month(2016, 2).datediff(part, month.Month(2016, 3)), 29)
+        self.assertEqual(month.Month(2100, 2).datediff(part, month.Month(2100, 3)), 28)
+        self.assertEqual(month.Month(2000, 2).datediff(part, month.Month(2000, 3)), 29)
+        self.assertEqual(month.Month(2015, 12).datediff(part, month.Month(2016, 1)), 31)
+
+    def test_datediff_year_partial(self):
+        part = month.DatePart.YEAR
+        self.assertEqual(month.Month(2014, 6).datediff(part, month.Month(2015, 5)), 0)
+        self.assertEqual(month.Month(2015, 5).datediff(part, month.Month(2014, 6)), 0)
+
+    def test_hash(self):
+        self.assertEqual(hash(self.m1), hash(month.Month(2014, 1)))
+        self.assertEqual(len({self.m1, month.Month(2014, 1), self.m2}), 2)
+
+    def test_invalid_month(self):
+        with self.assertRaises(ValueError):
+            month.Month(2014, 13)
+
     def test_monthadd(self):
         self.assertEqual(self.m1.monthadd(14), self.m2)
         self.assertEqual(self.m2.monthadd(-14), self.m1)
+        self.assertEqual(month.Month(2014, 12).monthadd(1), month.Month(2015, 1))
+        self.assertEqual(month.Month(2015, 1).monthadd(-1), month.Month(2014, 12))
+
+    def test_ordinal(self):
+        self.assertEqual(self.m2.ordinal - self.m1.ordinal, 14)
+        self.assertEqual(month.Month.fromordinal(self.m1.ordinal), self.m1)
+        self.assertEqual(month.Month.fromordinal(month.Month(2014, 12).ordinal), month.Month(2014, 12))
 
     def test_cmp(self):
         self.assertTrue(self.m1 != self.m2)
@@ -78,5 +105,48 @@ class TestMonth(unittest.TestCase):
         self.assertFalse(self.m1 > self.m2)
 
 
+class TestMonthRange(unittest.TestCase):
+    def setUp(self):
+        self.first = month.Month(2015, 11)
+        self.months = month.MonthRange(self.first, 16)
+
+    def tearDown(self):
+        pass
+
+    def test_conversion(self):
+        self.assertEqual(len(self.months), 16)
+        self.assertEqual(self.months[0], self.first)
+        self.assertEqual(self.months[-1], month.Month(2017, 2))
+        self.assertEqual(self.months.to_months(), [self.first.monthadd(k) for k in range(16)])
+        self.assertEqual(month.MonthArray.from_months(self.months.to_months()), self.months)
+        self.assertEqual(list(self.months.ordinals), [self.first.ordinal + k for k in range(16)])
+        self.assertEqual(month.Month.fromdatetime64(self.first.as_datetime64()), self.first)
+
+    def test_between(self):
+        months = month.MonthRange.between(month.Month(2014, 1), month.Month(2015, 3))
+        self.assertEqual(len(months), 15)
+        self.assertEqual(months[-1], month.Month(2015, 3))
+
+    def test_slicing(self):
+        self.assertEqual(self.months[2:4].to_months(), [month.Month(2016, 1), month.Month(2016, 2)])
+        self.assertEqual(self.months[::12].to_months(), [self.first, month.Month(2016, 11)])
+
+    def test_years(self):
+        years, starts = self.months.year_starts()
+        self.assertEqual(list(years), [2015, 2016, 2017])
+        self.assertEqual(list(starts), [0, 2, 14])
+        self.assertEqual(self.months.year_groups(),
+                         [(2015, slice(0, 2)), (2016, slice(2, 14)), (2017, slice(14, 16))])
+
+    def test_day_gaps(self):
+        part = month.DatePart.DAY
+        gaps = self.months.day_gaps()
+        self.assertEqual(gaps[0], 0)
+        for k in range(1, 16):
+            self.assertEqual(gaps[k], self.months[k - 1].datediff(part, self.months[k]))
+        gaps = self.months.day_gaps(month.Month(2015, 9))
+        self.assertEqual(gaps[0], 61)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
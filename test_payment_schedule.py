@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+import payment_schedule
+import month
+
+class TestPaymentSchedule(unittest.TestCase):
+    def setUp(self):
+        self.schedule = payment_schedule.PaymentSchedule()
+        self.schedule.append(month.Month(2014, 1), 100, 1000, 10, 90, 910)
+        self.schedule.append(month.Month(2014, 2), 100, 910, 9.1, 90.9, 819.1, 5)
+
+    def tearDown(self):
+        pass
+
+    def test_len(self):
+        self.assertEqual(len(self.schedule), 2)
+        self.assertFalse(payment_schedule.PaymentSchedule())
+
+    def test_row_view(self):
+        payment = self.schedule[-1]
+        self.assertEqual(payment.month, month.Month(2014, 2))
+        self.assertAlmostEqual(payment.interest_amount, 9.1)
+        self.assertAlmostEqual(payment.principle_amount, 90.9)
+        self.assertAlmostEqual(payment.new_balance, 819.1)
+        self.assertAlmostEqual(payment.pmi_amount, 5)
+        self.assertAlmostEqual(payment.total_payment_amount, 105)
+        with self.assertRaises(IndexError):
+            self.schedule[2]
+
+    def test_columns(self):
+        np.testing.assert_allclose(self.schedule.interest_amounts, [10, 9.1])
+        np.testing.assert_array_equal(self.schedule.years, [2014, 2014])
+        self.assertEqual(self.schedule.months, [month.Month(2014, 1), month.Month(2014, 2)])
+
+    def test_extend_grows(self):
+        count = 100
+        self.schedule.extend(month.Month(2014, 3).ordinal + np.arange(count),
+                             np.full(count, 100.0),
+                             np.zeros(count),
+                             np.zeros(count),
+                             np.zeros(count),
+                             np.zeros(count))
+        self.assertEqual(len(self.schedule), count + 2)
+        self.assertEqual(self.schedule[-1].month, month.Month(2022, 6))
+        self.assertAlmostEqual(self.schedule.pmi_amounts.sum(), 5)
+
+    def test_totals(self):
+        totals = self.schedule.totals(2014)
+        self.assertAlmostEqual(totals.interest_amount, 19.1)
+        self.assertAlmostEqual(totals.principle_amount, 180.9)
+        self.assertAlmostEqual(totals.payment_amount, 200)
+        self.assertEqual(self.schedule.totals(2015), (0, 0, 0, 0))
+
+    def test_totals_after_extend(self):
+        count = 24
+        self.schedule.extend(month.Month(2014, 3).ordinal + np.arange(count),
+                             np.full(count, 100.0),
+                             np.zeros(count),
+                             np.full(count, 1.0),
+                             np.full(count, 99.0),
+                             np.zeros(count))
+        self.assertAlmostEqual(self.schedule.totals(2014).interest_amount, 29.1)
+        self.assertAlmostEqual(self.schedule.totals(2015).interest_amount, 12)
+        self.assertAlmostEqual(self.schedule.totals(2016).principle_amount, 2 * 99)
+        self.assertAlmostEqual(self.schedule.totals().interest_amount, 19.1 + count)
+
+    def test_set_pmi_amount(self):
+        self.schedule.set_pmi_amount(0, 7)
+        self.assertAlmostEqual(self.schedule[0].pmi_amount, 7)
+        self.assertAlmostEqual(self.schedule.totals(2014).pmi_amount, 12)
+        self.schedule.set_pmi_amount(-1, 0)
+        self.assertAlmostEqual(self.schedule.totals().pmi_amount, 7)
+
+    def test_set_pmi_amounts(self):
+        self.schedule.set_pmi_amounts(slice(0, None), 3)
+        self.assertAlmostEqual(self.schedule.totals(2014).pmi_amount, 6)
+
+    def test_slice(self):
+        tail = self.schedule[1:]
+        self.assertEqual(len(tail), 1)
+        self.assertEqual(tail[0].month, month.Month(2014, 2))
+
+    def test_year_end_balances(self):
+        self.schedule.append(month.Month(2015, 3), 100, 819.1, 8.2, 91.8, 727.3)
+        balances = self.schedule.year_end_balances([2013, 2014, 2015, 2016])
+        np.testing.assert_array_almost_equal(balances, [1000, 819.1, 727.3, 727.3])
+        self.assertTrue(np.isnan(payment_schedule.PaymentSchedule().year_end_balances([2014])).all())
+
+    def test_version(self):
+        version_2014 = self.schedule.version(2014)
+        version_2015 = self.schedule.version(2015)
+        self.schedule.append(month.Month(2015, 1), 100, 819.1, 8.2, 91.8, 727.3)
+        self.assertEqual(self.schedule.version(2014), version_2014)
+        self.assertGreater(self.schedule.version(2015), version_2015)
+        self.assertEqual(self.schedule.version(), self.schedule.version(2015))
+        self.schedule.set_pmi_amount(0, 4)
+        self.assertGreater(self.schedule.version(2014), version_2014)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -112,5 +112,38 @@ class TestFamily(unittest.TestCase):
         self.assertEqual(self.family_noIncome.itemized_deductions(2011), 100)
         self.assertEqual(self.family_noIncome.itemized_deductions(2012), 0)
 
+class TestVersions(unittest.TestCase):
+    def setUp(self):
+        self.p1 = people.Person("p1")
+        self.p2 = people.Person("p2")
+        self.family = people.Family((self.p1, self.p2), FilingStatus.MARRIED_JOINT, 'GA')
+
+    def tearDown(self):
+        pass
+
+    def test_person_version(self):
+        self.assertEqual(self.p1.version('gross_income', 2010), 0)
+        self.p1.set_gross_income(2010, 1000)
+        version = self.p1.version('gross_income', 2010)
+        self.assertGreater(version, 0)
+        self.p1.set_gross_income(2011, 1000)
+        self.p1.set_healthcare_contribution(2010, 100)
+        self.assertEqual(self.p1.version('gross_income', 2010), version)
+
+    def test_family_version(self):
+        version = self.family.version('gross_income', 2010)
+        self.p2.set_gross_income(2010, 1000)
+        self.assertGreater(self.family.version('gross_income', 2010), version)
+
+        version = self.family.version('deductions', 2010)
+        self.family.add_deduction(2011, people.Deduction('d', 10))
+        self.assertEqual(self.family.version('deductions', 2010), version)
+        self.family.add_deduction(2010, people.Deduction('d', 10))
+        self.assertGreater(self.family.version('deductions', 2010), version)
+
+        version = self.family.version('home', 2010)
+        self.family.home = None
+        self.assertGreater(self.family.version('home', 2010), version)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+import people
+import common_loans
+import tax_calculators
+import retirement_optimizer
+import data
+from month import Month
+
+class TestRetirementOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.year = 2013
+        self.p1 = people.Person('p1')
+        self.p1.set_gross_income(self.year, 70000)
+        self.p1.set_healthcare_contribution(self.year, 1090)
+        self.p2 = people.Person('p2')
+        self.p2.set_gross_income(self.year, 50000)
+        self.family = people.Family((self.p1, self.p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+        self.rates = np.linspace(0, 0.20, 11)
+
+    def tearDown(self):
+        pass
+
+    def value_with_rates(self, rates, retirement_value):
+        for p, rate in zip(self.family.members, rates):
+            p.set_retirement_contribution_rate(self.year, rate)
+        net_income = tax_calculators.NetIncomeCalculator(self.family, self.year).calculate()
+        return net_income + retirement_value * self.family.retirement_contribution(self.year)
+
+    def test_grid(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=[0, 0.1, 0.2])
+        grid = optimizer.rate_grid(2)
+        self.assertEqual(grid.shape, (9, 2))
+        self.assertEqual(len(set(map(tuple, grid))), 9)
+
+    def test_objective_matches_tax_calculator(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=self.rates, retirement_value=0.7)
+        result = optimizer.evaluate(self.family)
+        for index in (0, 7, 40, len(result.objective) - 1):
+            rates = optimizer.rate_grid(2)[index]
+            self.assertAlmostEqual(result.objective[index], self.value_with_rates(rates, 0.7), 6)
+
+    def test_full_value_contributes_the_most(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=self.rates)
+        np.testing.assert_array_almost_equal(optimizer.optimize(self.family), [0.20, 0.20])
+
+    def test_discounted_value_stops_at_bracket(self):
+        # contributions save 25% federal + 6% state; worth it only while the dollar is valued above 69 cents
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=np.linspace(0, 0.40, 81), retirement_value=0.72)
+        result = optimizer.evaluate(self.family)
+        best = result.best_index
+        self.assertGreater(result.taxes.federal_agi[best], 72500 - 0.005 * 70000)
+        self.assertLess(result.taxes.federal_agi[best], 72500 + 0.005 * 70000)
+
+    def test_marginal_benefit(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=self.rates)
+        result = optimizer.evaluate(self.family)
+        midpoints, benefit = result.marginal_benefit(0, fixed_rates=[0, 0])
+        self.assertEqual(len(midpoints), len(self.rates) - 1)
+        # the first step stays in the 25% federal bracket and top state bracket
+        self.assertAlmostEqual(benefit[0], 0.25 + 0.06)
+        self.assertTrue((benefit > 0).all())
+
+    def test_breakpoints(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=np.linspace(0, 0.5, 11))
+        result = optimizer.evaluate(self.family)
+        breakpoints = result.breakpoints(0, fixed_rates=[0, 0])
+        federal = [b for b in breakpoints if b.kind == retirement_optimizer.FEDERAL_BRACKET]
+        self.assertEqual([b.level for b in federal], [72500])
+        self.p1.set_retirement_contribution_rate(self.year, federal[0].rate)
+        self.assertAlmostEqual(tax_calculators.FederalAgiCalculator(self.family, self.year).calculate(), 72500, 6)
+
+    def test_student_loan_phaseout_breakpoints(self):
+        self.p1.set_gross_income(self.year, 150000)
+        student_loan = common_loans.StudentLoan(Month(self.year, 1), 40000, 0.068)
+        student_loan.calculate_amortization_table()
+        self.family.student_loan = student_loan
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=np.linspace(0, 0.5, 11))
+        breakpoints = optimizer.evaluate(self.family).breakpoints(0, fixed_rates=[0, 0])
+        phaseout = [b for b in breakpoints if b.kind == retirement_optimizer.STUDENT_LOAN_PHASEOUT]
+        # raising the rate lowers MAGI, so the top of the phaseout is crossed first
+        self.assertEqual([b.level for b in phaseout], [155000, 125000])
+
+    def test_unsorted_rates(self):
+        unsorted = retirement_optimizer.RetirementOptimizer(self.year, rates=[0.5, 0, 0.25, 0.1])
+        np.testing.assert_array_equal(unsorted.rates, [0, 0.1, 0.25, 0.5])
+        breakpoints = unsorted.evaluate(self.family).breakpoints(0, fixed_rates=[0, 0])
+        expected = retirement_optimizer.RetirementOptimizer(self.year, rates=[0, 0.1, 0.25, 0.5])
+        self.assertEqual(breakpoints, expected.evaluate(self.family).breakpoints(0, fixed_rates=[0, 0]))
+
+        result = expected.evaluate(self.family)
+        with self.assertRaises(ValueError):
+            retirement_optimizer.RetirementGrid(result.rates[::-1], 2, result.gross_incomes, result.taxes,
+                                                result.retirement_contributions, result.objective,
+                                                result.federal_tax_data, result.state_tax_data, False)
+
+    def test_contribution_limit(self):
+        optimizer = retirement_optimizer.RetirementOptimizer(self.year, rates=self.rates, contribution_limit=10000)
+        best_rates = optimizer.optimize(self.family)
+        self.assertLessEqual(best_rates[0] * 70000, 10000)
+        self.assertAlmostEqual(best_rates[1], 0.20)
+
+if __name__ == '__main__':
+    unittest.main()
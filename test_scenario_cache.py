@@ -0,0 +1,149 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import data
+import scenarios
+import scenario_cache
+import tax_data_store
+from month import Month
+
+YEAR = 2013
+STUDENT_LOAN_AMOUNT = 60000
+
+# (home_price, apr) of every family built in this process
+built = []
+
+def build_family(home_price, apr):
+    built.append((home_price, apr))
+    p1 = people.Person('p1')
+    p1.set_gross_income(YEAR, 80000)
+    p1.set_retirement_contribution_rate(YEAR, 0.05)
+    p2 = people.Person('p2')
+    p2.set_gross_income(YEAR, 100000)
+    family = people.Family((p1, p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+
+    student_loan = common_loans.StudentLoan(Month(YEAR, 1), STUDENT_LOAN_AMOUNT, 0.068)
+    student_loan.calculate_amortization_table()
+    family.student_loan = student_loan
+
+    if home_price is not None:
+        house = home.Home(Month(YEAR, 1), home_price, 0.10, apr, 30, 0.005)
+        house.calculate_amortization_table()
+        family.home = house
+    return family
+
+def edited_build_family(home_price, apr):
+    family = build_family(home_price, apr)
+    family.members[1].set_gross_income(YEAR, 120000)
+    return family
+edited_build_family.__name__ = edited_build_family.__qualname__ = 'build_family'
+
+class TestScenarioCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'scenarios.sqlite')
+        self.cache = scenario_cache.ScenarioCache(self.path, max_entries=3)
+        self.grid = scenarios.ScenarioGrid([
+            ('home_price', [None, 200000, 400000]),
+            ('apr', [0.04, 0.05]),
+        ])
+        del built[:]
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_canonical_hash(self):
+        key = scenario_cache.canonical_hash({'month': Month(YEAR, 1), 'apr': np.float64(0.04), 'b': [1, 2]})
+        self.assertEqual(key, scenario_cache.canonical_hash({'b': [1, 2], 'apr': 0.04, 'month': Month(YEAR, 1)}))
+        self.assertNotEqual(key, scenario_cache.canonical_hash({'b': [1, 2], 'apr': 0.04, 'month': Month(YEAR, 2)}))
+
+    def test_key_follows_tax_data(self):
+        store = tax_data_store.TaxDataStore(os.path.join(self.directory, 'tax_data.sqlite'))
+        store.save_dicts()
+        key = scenario_cache.ScenarioCache(self.path, registry=data.TaxDataRegistry(store)).key('inputs')
+        values = dict(data.property_tax_data['GA'][2013], mill_rate=0)
+        store.save(tax_data_store.PROPERTY, 'GA', 2013, None, values)
+        self.assertNotEqual(key, scenario_cache.ScenarioCache(self.path, registry=data.TaxDataRegistry(store)).key('inputs'))
+        store.close()
+
+    def test_persists(self):
+        self.cache.put('a', [1.0, 2.5])
+        self.cache.close()
+        cache = scenario_cache.ScenarioCache(self.path)
+        self.assertEqual(cache.get('a'), [1.0, 2.5])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_lru_eviction(self):
+        for key in 'abc':
+            self.cache.put(key, key)
+        self.cache.get('a')
+        self.cache.put('d', 'd')
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn('b', self.cache)
+        for key in 'acd':
+            self.assertIn(key, self.cache)
+
+    def test_hits_skip_building(self):
+        self.cache.max_entries = 100
+        uncached = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1).run(self.grid)
+        del built[:]
+
+        first = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache).run(self.grid)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 6))
+        self.assertEqual(len(built), 6)
+        second = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache).run(self.grid)
+        self.assertEqual((self.cache.hits, self.cache.misses), (6, 6))
+        self.assertEqual(len(built), 6)
+        for name in scenarios.SUMMARY_METRICS:
+            np.testing.assert_array_equal(uncached[name], first[name])
+            np.testing.assert_array_equal(uncached[name], second[name])
+
+    def test_edited_builder_misses(self):
+        global STUDENT_LOAN_AMOUNT
+        self.cache.max_entries = 100
+        runner = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache)
+        runner.run(self.grid)
+        self.assertEqual(runner.cache_key({'home_price': None, 'apr': 0.04}),
+                         scenarios.ScenarioRunner(build_family, YEAR, cache=self.cache).cache_key({'home_price': None, 'apr': 0.04}))
+
+        # same module and name, new body
+        edited = scenarios.ScenarioRunner(edited_build_family, YEAR, max_workers=1, cache=self.cache).run(self.grid)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 12))
+        self.assertGreater(edited['gross_income'][0], runner.run(self.grid)['gross_income'][0])
+
+        # a module constant the builder reads
+        STUDENT_LOAN_AMOUNT = 50000
+        try:
+            scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache).run(self.grid)
+        finally:
+            STUDENT_LOAN_AMOUNT = 60000
+        self.assertEqual(self.cache.misses, 18)
+
+        scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache, version=2).run(self.grid)
+        self.assertEqual(self.cache.misses, 24)
+
+    def test_overlapping_grid(self):
+        self.cache.max_entries = 100
+        scenarios.ScenarioRunner(build_family, YEAR, max_workers=1, cache=self.cache).run(self.grid)
+        del built[:]
+        wider = scenarios.ScenarioGrid([('home_price', [200000, 300000]), ('apr', [0.04, 0.05])])
+        # only the new scenarios are built, here or in the pool
+        results = scenarios.ScenarioRunner(build_family, YEAR, max_workers=2, chunk_size=1, cache=self.cache).run(wider)
+        self.assertEqual(self.cache.misses, 6 + 2)
+        self.assertEqual(len(self.cache), 8)
+        uncached = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1).run(wider)
+        for name in scenarios.SUMMARY_METRICS:
+            np.testing.assert_array_equal(uncached[name], results[name])
+
+if __name__ == '__main__':
+    unittest.main()
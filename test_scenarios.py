@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+
+import people
+import home
+import common_loans
+import five_year_plan
+import scenarios
+import data
+from month import Month
+
+YEAR = 2013
+
+def build_family(home_price, apr, loan_strategy):
+    p1 = people.Person('p1')
+    p1.set_gross_income(YEAR, 80000)
+    p1.set_retirement_contribution_rate(YEAR, 0.05)
+    p1.set_healthcare_contribution(YEAR, 1090)
+    p2 = people.Person('p2')
+    p2.set_gross_income(YEAR, 100000)
+    p2.set_retirement_contribution_rate(YEAR, 0.06)
+    family = people.Family((p1, p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+
+    student_loan = common_loans.StudentLoan(Month(YEAR, 1), 60000, 0.068)
+    student_loan.calculate_amortization_table(1500 if loan_strategy == 'max' else None)
+    family.student_loan = student_loan
+
+    if home_price is not None:
+        house = home.Home(Month(YEAR, 1), home_price, 0.10, apr, 30, 0.005)
+        house.calculate_amortization_table()
+        family.home = house
+    return family
+
+class TestScenarioGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = scenarios.ScenarioGrid([
+            ('home_price', [None, 200000, 400000]),
+            ('apr', [0.04, 0.05]),
+            ('loan_strategy', ['min', 'max']),
+        ])
+
+    def tearDown(self):
+        pass
+
+    def test_order(self):
+        self.assertEqual(len(self.grid), 12)
+        self.assertEqual(self.grid.shape, (3, 2, 2))
+        combinations = list(self.grid)
+        self.assertEqual(dict(combinations[0]), {'home_price': None, 'apr': 0.04, 'loan_strategy': 'min'})
+        self.assertEqual(dict(combinations[1]), {'home_price': None, 'apr': 0.04, 'loan_strategy': 'max'})
+        for i, combination in enumerate(combinations):
+            self.assertEqual(self.grid[i], combination)
+
+    def test_matches_year_summary(self):
+        results = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1).run(self.grid)
+        self.assertEqual(len(results), 12)
+        for i in (0, 5, 11):
+            summary = five_year_plan.YearSummary(build_family(**self.grid[i]), YEAR)
+            summary.calculate_summary()
+            self.assertAlmostEqual(results['net_income'][i], summary.net_income)
+            self.assertAlmostEqual(results['property'][i], summary.property)
+            self.assertEqual(results.row(i)['loan_strategy'], self.grid[i]['loan_strategy'])
+
+    def test_process_pool_is_deterministic(self):
+        serial = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1).run(self.grid)
+        pooled = scenarios.ScenarioRunner(build_family, YEAR, max_workers=2, chunk_size=5).run(self.grid)
+        self.assertEqual(serial.names, pooled.names)
+        for name in scenarios.SUMMARY_METRICS:
+            np.testing.assert_array_equal(serial[name], pooled[name])
+
+    def test_chunks(self):
+        runner = scenarios.ScenarioRunner(build_family, YEAR, max_workers=2, chunk_size=5)
+        self.assertEqual([len(chunk) for chunk in runner.chunks(self.grid)], [5, 5, 2])
+
+    def test_best(self):
+        results = scenarios.ScenarioRunner(build_family, YEAR, max_workers=1).run(self.grid)
+        best = results.best('net_income')
+        self.assertEqual(best['net_income'], results['net_income'].max())
+
+if __name__ == '__main__':
+    unittest.main()
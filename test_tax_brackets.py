@@ -0,0 +1,62 @@
+import unittest
+import random
+
+import numpy as np
+
+import tax_brackets
+
+def recursive_income_tax(income, brackets, bracket_index=-1, taxes_so_far=0):
+    """ The original recursive bracket walk, kept as a reference """
+    if income > 0:
+        income_level, rate = brackets[bracket_index]
+        taxes_so_far += (
+                 rate * max(income - income_level, 0) +
+                 recursive_income_tax(min(income, income_level), brackets, bracket_index - 1, taxes_so_far)
+                )
+    return taxes_so_far
+
+class TestTaxBracketSchedule(unittest.TestCase):
+    def setUp(self):
+        self.brackets = [
+            (      0, 0.10  ),
+            (  17850, 0.15  ),
+            (  72500, 0.25  ),
+            ( 146400, 0.28  ),
+            ( 223050, 0.33  ),
+            ( 398350, 0.35  ),
+            ( 450000, 0.396 )
+        ]
+        self.schedule = tax_brackets.TaxBracketSchedule(self.brackets)
+
+    def tearDown(self):
+        pass
+
+    def test_matches_recursive(self):
+        random.seed(0)
+        incomes = [0, -100, 17850, 72500, 450000, 1e6] + [random.uniform(0, 600000) for _ in range(200)]
+        for income in incomes:
+            self.assertAlmostEqual(self.schedule.income_tax(income), recursive_income_tax(income, self.brackets), 6)
+
+    def test_array(self):
+        incomes = np.array([0, 10000, 100000, 500000])
+        taxes = self.schedule.income_tax(incomes)
+        self.assertEqual(taxes.shape, (4,))
+        for income, tax in zip(incomes, taxes):
+            self.assertAlmostEqual(tax, recursive_income_tax(income, self.brackets), 6)
+
+    def test_evaluate(self):
+        tax, rate, index = self.schedule.evaluate(np.array([10000, 72500, 100000, 500000]))
+        self.assertEqual(list(index), [0, 2, 2, 6])
+        self.assertEqual(list(rate), [0.10, 0.25, 0.25, 0.396])
+        self.assertAlmostEqual(tax[1], 1785 + 0.15 * (72500 - 17850), 6)
+
+    def test_first_level_above_zero(self):
+        brackets = [(1000, 0.05), (5000, 0.10)]
+        schedule = tax_brackets.TaxBracketSchedule(brackets)
+        self.assertAlmostEqual(schedule.income_tax(500), 0)
+        self.assertAlmostEqual(schedule.income_tax(3000), 100)
+        self.assertAlmostEqual(schedule.income_tax(8000), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
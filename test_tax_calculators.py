@@ -3,7 +3,9 @@ import unittest
 import people
 import tax_calculators
 import common_loans
+import home
 import data
+from month import Month
 
 class MockFederalTaxDao(data.FederalTaxDao):
     def __init__(self, year, filing_status):
@@ -567,5 +569,120 @@ class TestStatePropertyTax(unittest.TestCase):
         calc = tax_calculators.StatePropertyTaxCalculator(self.fam_without_home, self.year, tax_data)
         self.assertAlmostEqual(calc.calculate(), 0)
 
+class TestEvaluationContext(unittest.TestCase):
+    def setUp(self):
+        self.year = 2013
+        self.p1 = people.Person('p1')
+        self.p1.set_gross_income(self.year, 100000)
+        self.p1.set_retirement_contribution_rate(self.year, 0.05)
+        self.p2 = people.Person('p2')
+        self.p2.set_gross_income(self.year, 60000)
+        self.family = people.Family((self.p1, self.p2), data.FilingStatus.MARRIED_JOINT, 'GA')
+
+        self.itemized_deduction_calls = 0
+        itemized_deductions = self.family.itemized_deductions
+        def counting_itemized_deductions(year):
+            self.itemized_deduction_calls += 1
+            return itemized_deductions(year)
+        self.family.itemized_deductions = counting_itemized_deductions
+
+    def tearDown(self):
+        pass
+
+    def test_quantities_computed_once(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        total_taxes = tax_calculator.total_taxes
+        tax_calculator.federal_taxes
+        tax_calculator.federal_agi
+        tax_calculator.student_loan_interest_deduction
+        tax_calculator.state_agi
+        self.assertAlmostEqual(tax_calculator.calculate(), total_taxes)
+        # shared by the federal MAGI and the state AGI
+        self.assertEqual(self.itemized_deduction_calls, 1)
+
+    def test_shared_context(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        federal = tax_calculator.federal_income_tax_calculator
+        self.assertIs(federal.context, tax_calculator.context)
+        self.assertIs(federal.federal_agi_calculator.magi_calculator.context, tax_calculator.context)
+        self.assertIs(
+            federal.federal_agi_calculator.magi_calculator,
+            federal.federal_agi_calculator.student_loan_interest_deduction_calculator.magi_calculator)
+
+    def test_standalone_calculators_match(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        federal = tax_calculators.FederalIncomeTaxCalculator(self.family, self.year)
+        state = tax_calculators.StateIncomeTaxCalculator(self.family, self.year)
+        self.assertAlmostEqual(tax_calculator.federal_taxes, federal.calculate())
+        self.assertAlmostEqual(tax_calculator.state_taxes, state.calculate())
+
+    def test_invalidate(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        federal_agi = tax_calculator.federal_agi
+        tax_calculator.invalidate()
+        self.assertAlmostEqual(tax_calculator.federal_agi, federal_agi)
+        self.assertEqual(self.itemized_deduction_calls, 2)
+
+    def test_input_change_recomputes_dependents(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        federal_agi = tax_calculator.federal_agi
+        tax_calculator.total_taxes
+        self.p2.set_gross_income(self.year, 70000)
+        self.assertAlmostEqual(tax_calculator.federal_agi, federal_agi + 10000)
+        tax_calculator.total_taxes
+        # itemized deductions do not read gross income
+        self.assertEqual(self.itemized_deduction_calls, 1)
+
+        self.family.add_deduction(self.year, people.Deduction('charity', 20000))
+        self.assertAlmostEqual(tax_calculator.federal_agi, federal_agi + 10000 - (20000 - 12200))
+        self.assertEqual(self.itemized_deduction_calls, 2)
+        self.assert_matches_fresh_calculator(tax_calculator)
+
+    def assert_matches_fresh_calculator(self, tax_calculator):
+        fresh = tax_calculators.TaxCalculator(self.family, self.year)
+        self.assertAlmostEqual(tax_calculator.federal_taxes, fresh.federal_taxes)
+        self.assertAlmostEqual(tax_calculator.fica_taxes, fresh.fica_taxes)
+        self.assertAlmostEqual(tax_calculator.state_taxes, fresh.state_taxes)
+        self.assertAlmostEqual(tax_calculator.property_taxes, fresh.property_taxes)
+        self.assertAlmostEqual(tax_calculator.total_taxes, fresh.total_taxes)
+
+    def test_members_change(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        tax_calculator.total_taxes
+        with self.assertRaises(AttributeError):
+            self.family.members.append(people.Person('p3'))
+        p3 = people.Person('p3')
+        p3.set_gross_income(self.year, 30000)
+        self.family.members = self.family.members + (p3,)
+        self.assert_matches_fresh_calculator(tax_calculator)
+
+    def test_other_year_change_keeps_cache(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        total_taxes = tax_calculator.total_taxes
+        context_values = dict(tax_calculator.context._values)
+        self.p2.set_gross_income(self.year + 1, 70000)
+        self.family.add_deduction(self.year + 1, people.Deduction('charity', 20000))
+        for key in context_values:
+            self.assertIn(key, tax_calculator.context)
+        self.assertAlmostEqual(tax_calculator.total_taxes, total_taxes)
+        self.assertEqual(self.itemized_deduction_calls, 1)
+
+    def test_home_change(self):
+        tax_calculator = tax_calculators.TaxCalculator(self.family, self.year)
+        self.assertEqual(tax_calculator.property_taxes, 0)
+        house = home.Home(Month(self.year, 1), 250000, 0.10, 0.045, 30, 0.005)
+        self.family.home = house
+        self.assertAlmostEqual(tax_calculator.property_taxes, 250000 * 0.40 / 1000.0 * 30)
+
+        deductions = tax_calculator.context.family_value('itemized_deductions')
+        house.make_monthly_payment()
+        self.assertGreater(tax_calculator.context.family_value('itemized_deductions'), deductions)
+
+        # payments in later years leave this year's values alone
+        calls = self.itemized_deduction_calls
+        house.make_monthly_payment(Month(self.year + 1, 1))
+        tax_calculator.context.family_value('itemized_deductions')
+        self.assertEqual(self.itemized_deduction_calls, calls)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import data
+import tax_data_store
+
+class TestTaxDataStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tax_data.sqlite')
+        self.store = tax_data_store.TaxDataStore(self.path, cache_size=2)
+        self.store.save_dicts()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        stored = self.store.load(tax_data_store.FEDERAL, None, 2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(stored, data.federal_tax_data[2013][data.FilingStatus.MARRIED_JOINT])
+
+        stored = self.store.load(tax_data_store.STATE, 'GA', 2014, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(stored, data.state_tax_data['GA'][2014][data.FilingStatus.MARRIED_JOINT])
+
+        stored = self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None)
+        self.assertEqual(stored, data.property_tax_data['GA'][2013])
+
+    def test_missing_slice(self):
+        with self.assertRaises(KeyError):
+            self.store.load(tax_data_store.STATE, 'NY', 2013, data.FilingStatus.MARRIED_JOINT)
+
+    def test_lru_cache(self):
+        first = self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None)
+        self.assertIs(first, self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None))
+        self.store.load(tax_data_store.PROPERTY, 'GA', 2014, None)
+        self.store.load(tax_data_store.FEDERAL, None, 2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(len(self.store._cache), 2)
+        # evicted, so parsed again
+        self.assertIsNot(first, self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None))
+
+    def test_save_replaces_cached_slice(self):
+        self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None)
+        self.store.save(tax_data_store.PROPERTY, 'GA', 2013, None, {'mill_rate': 25, 'valuation_rate': 0.40})
+        self.assertEqual(self.store.load(tax_data_store.PROPERTY, 'GA', 2013, None)['mill_rate'], 25)
+
+    def test_registry_with_store(self):
+        registry = data.TaxDataRegistry(self.store)
+        federal = registry.federal_tax_data(2014, data.FilingStatus.MARRIED_JOINT)
+        self.assertIsInstance(federal.tax_dao, tax_data_store.StoredFederalTaxDao)
+        expected = data.FederalTaxData(2014, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(federal.tax_brackets, expected.tax_brackets)
+        self.assertEqual(federal.social_security_tax_wage_base_limit, expected.social_security_tax_wage_base_limit)
+
+        state = registry.state_tax_data('GA', 2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertAlmostEqual(state.bracket_schedule.income_tax(50000), expected_state_tax(50000))
+
+        property_ = registry.property_tax_data('GA', 2014)
+        self.assertEqual(property_.mill_rate, 30)
+        self.assertEqual(registry.federal_years(), [2013, 2014])
+        np.testing.assert_array_equal(registry.latest_tax_years([2020]), [2014])
+
+    def test_registry_bounded_by_store(self):
+        registry = data.TaxDataRegistry(self.store)
+        self.assertEqual(registry.cache_size, 2)
+        first = registry.property_tax_data('GA', 2013)
+        self.assertIs(first, registry.property_tax_data('GA', 2013))
+        registry.property_tax_data('GA', 2014)
+        registry.federal_tax_data(2013, data.FilingStatus.MARRIED_JOINT)
+        self.assertEqual(len(registry._compiled), 2)
+        # evicted, so compiled again
+        self.assertIsNot(first, registry.property_tax_data('GA', 2013))
+
+    def test_version(self):
+        version = self.store.version()
+        self.assertEqual(version, data.TaxDataRegistry(self.store).version())
+        self.assertNotEqual(version, data.TaxDataRegistry().version())
+        self.store.save(tax_data_store.PROPERTY, 'GA', 2013, None, {'mill_rate': 25, 'valuation_rate': 0.40})
+        self.assertNotEqual(version, self.store.version())
+
+    def test_reopen(self):
+        self.store.close()
+        store = tax_data_store.TaxDataStore(self.path)
+        self.assertEqual(store.load(tax_data_store.PROPERTY, 'GA', 2014, None)['valuation_rate'], 0.40)
+        store.close()
+
+def expected_state_tax(taxable_income):
+    return data.StateTaxData('GA', 2013, data.FilingStatus.MARRIED_JOINT).bracket_schedule.income_tax(taxable_income)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+
+import people
+import common_loans
+import tax_calculators
+import tax_graph
+import data
+from month import Month
+
+class TestTaxGraph(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        def counted(name, formula):
+            def wrapped(**inputs):
+                self.calls.append(name)
+                return formula(**inputs)
+            return wrapped
+        self.graph = tax_graph.TaxGraph([
+            tax_graph.Quantity('c', ('a', 'b'), counted('c', lambda a, b: a + b)),
+            tax_graph.Quantity('d', ('c',), counted('d', lambda c: 2 * c)),
+            tax_graph.Quantity('e', ('c', 'd'), counted('e', lambda c, d: c * d)),
+            tax_graph.Quantity('f', ('a',), counted('f', lambda a: -a)),
+        ])
+
+    def tearDown(self):
+        pass
+
+    def test_plan_order(self):
+        names = [quantity.name for quantity in self.graph.plan(['e'])]
+        self.assertEqual(names, ['c', 'd', 'e'])
+        self.assertEqual(self.graph.sources(['e']), ['a', 'b'])
+
+    def test_shared_nodes_evaluated_once(self):
+        values = self.graph.evaluate({'a': 1, 'b': 2}, ['e', 'd'])
+        self.assertEqual(values, {'e': 18, 'd': 6})
+        self.assertEqual(sorted(self.calls), ['c', 'd', 'e'])
+
+    def test_compute_one_quantity(self):
+        self.assertEqual(self.graph.compute('e', c=3, d=4, a=100), 12)
+        self.assertEqual(self.calls, ['e'])
+
+    def test_batched_sources(self):
+        values = self.graph.evaluate({'a': np.array([1, 2]), 'b': 2}, ['e'])
+        np.testing.assert_array_equal(values['e'], [18, 32])
+
+    def test_missing_source(self):
+        with self.assertRaises(KeyError):
+            self.graph.evaluate({'a': 1}, ['c'])
+
+    def test_unknown_target(self):
+        with self.assertRaises(KeyError):
+            self.graph.plan(['z'])
+
+    def test_cycle(self):
+        graph = tax_graph.TaxGraph([
+            tax_graph.Quantity('x', ('y',), lambda y: y),
+            tax_graph.Quantity('y', ('x',), lambda x: x),
+        ])
+        with self.assertRaises(ValueError):
+            graph.plan(['x'])
+
+class TestTaxGraphMatchesCalculators(unittest.TestCase):
+    def setUp(self):
+        self.year = 2013
+        self.families = []
+        for income1, income2 in ((0, 0), (30000, 20000), (90000, 70000), (250000, 180000)):
+            p1 = people.Person('p1')
+            p1.set_gross_income(self.year, income1)
+            p1.set_retirement_contribution_rate(self.year, 0.05)
+            p1.set_healthcare_contribution(self.year, 1090)
+            p2 = people.Person('p2')
+            p2.set_gross_income(self.year, income2)
+            self.families.append(people.Family((p1, p2), data.FilingStatus.MARRIED_JOINT, 'GA'))
+
+        student_loan = common_loans.StudentLoan(Month(self.year, 1), 40000, 0.068)
+        student_loan.calculate_amortization_table()
+        self.families[1].student_loan = student_loan
+        self.families[2].student_loan = student_loan
+
+    def tearDown(self):
+        pass
+
+    def test_scalar_matches_tax_calculator(self):
+        for family in self.families:
+            values = tax_graph.tax_graph.evaluate(
+                tax_graph.family_sources(family, self.year),
+                ['fed_agi', 'fed_tax', 'fica', 'state_agi', 'state_tax', 'property_tax', 'total_tax', 'net_income'])
+            tax_calculator = tax_calculators.TaxCalculator(family, self.year)
+            self.assertAlmostEqual(values['fed_agi'], tax_calculator.federal_agi)
+            self.assertAlmostEqual(values['fed_tax'], tax_calculator.federal_taxes)
+            self.assertAlmostEqual(values['fica'], tax_calculator.fica_taxes)
+            self.assertAlmostEqual(values['state_agi'], tax_calculator.state_agi)
+            self.assertAlmostEqual(values['state_tax'], tax_calculator.state_taxes)
+            self.assertAlmostEqual(values['property_tax'], tax_calculator.property_taxes)
+            self.assertAlmostEqual(values['total_tax'], tax_calculator.total_taxes)
+            self.assertAlmostEqual(values['net_income'], tax_calculators.NetIncomeCalculator(family, self.year).calculate())
+
+    def test_requested_sources_only(self):
+        sources = {'gross_income': 50000.0, 'healthcare_contribution': 1000.0,
+                   'federal_tax_data': data.registry.federal_tax_data(self.year, data.FilingStatus.MARRIED_JOINT)}
+        values = tax_graph.tax_graph.evaluate(sources, ['medicare_tax'])
+        self.assertAlmostEqual(values['medicare_tax'], 0.0145 * 49000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,14 @@
+_latest_version = 0
+
+def next_version():
+    """ Returns a new version stamp, larger than every stamp handed out before.
+    Inputs record a stamp when they change, so the largest stamp over a set of
+    inputs changes whenever any one of them does.
+    """
+    global _latest_version
+    _latest_version += 1
+    return _latest_version
+
+def latest_version():
+    """ The last stamp handed out; if it has not moved, nothing has changed """
+    return _latest_version